@@ -1,40 +1,11 @@
-from PIL import Image
+from logo_tools import process_file, HEADER_BG
 
 def apply_header_bg(input_path, output_path):
     try:
-        img = Image.open(input_path).convert("RGBA")
-        datas = img.getdata()
-
-        newData = []
-        
         # Header color: rgba(255, 255, 255, 0.8) -> (255, 255, 255, 204)
-        header_bg = (255, 255, 255, 204)
-        
-        # We'll target anything that looks like background (white, grey, or transparent)
-        # and replace it with the header color.
-        
-        for item in datas:
-            # item is (R, G, B, A)
-            r, g, b, a = item
-            
-            # Is it transparent?
-            if a < 255: 
-                # If it's fully or partially transparent, force it to header_bg
-                # But wait, if it's the edge of the text, we might want to blend?
-                # For now, let's just fill the background.
-                if a == 0:
-                    newData.append(header_bg)
-                    continue
-
-            # Is it white or light grey (checkerboard)?
-            # Targets: White (255,255,255), Grey (204,204,204 to 240,240,240)
-            if (r > 200 and g > 200 and b > 200):
-                 newData.append(header_bg)
-            else:
-                 newData.append(item)
-
-        img.putdata(newData)
-        img.save(output_path, "PNG")
+        # Fully transparent pixels and white / light grey (checkerboard) pixels
+        # are replaced with the header color.
+        process_file('header-bg', input_path, output_path, 'PNG', color=HEADER_BG, threshold=200)
         print(f"Saved logo with header background to {output_path}")
 
     except Exception as e:
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Benchmarks
+Times the core function of each Python tool on generated corpora and fails
+when a result regresses past a threshold against the stored baseline:
+
+  convert-*     optimize_images.encode_webp on synthetic photos
+  flood-*       logo_tools.flood_fill on synthetic logos
+  checker-*     logo_tools.remove_checkerboard on synthetic logos
+  links-*       link_checker_v2.check_site on a synthetic site
+  links-incr-*  link_checker_v2.check_site_incremental, warm graph, one page edited
+  rewrite-*     html_rewrite.rewrite_pages (webp-references + img-attributes)
+  css-*         critical_css.page_css with the real style.css
+
+Each case runs in its own worker process so peak memory is per case: the
+tracemalloc peak (Python allocations) and the growth of the RSS high-water
+mark during one cold run in a separate fresh process (includes Pillow/NumPy
+buffers, which tracemalloc does not see). Times are the median and
+minimum of --repeat runs; the gate compares minimums, which are far less
+sensitive to a busy machine. Corpora are generated before timing starts.
+
+Usage:
+  python3 benchmark.py                      # compare against the baseline
+  python3 benchmark.py --save-baseline      # record a new baseline
+  python3 benchmark.py --quick -k links     # small corpora, matching cases only
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import multiprocessing
+import statistics
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(PROJECT_ROOT, '.benchmark_baseline.json')
+
+# A case fails when it is this much slower / uses this much more memory than
+# its baseline. Differences below the floors are treated as noise.
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.25
+TIME_FLOOR_MS = 10
+MEMORY_FLOOR_MB = 2
+DEFAULT_REPEAT = 5
+
+# Corpus sizes: (full, --quick)
+PHOTO_SIZES = {'small': ((1280, 960), (640, 480)),
+               'large': ((4000, 3000), (1600, 1200)),
+               'huge': ((8000, 6000), (2400, 1800))}
+LOGO_SIZES = {'512': (512, 256), '2048': (2048, 512), '4000': (4000, 1024)}
+SITE_SIZES = {'small': ((50, 20), (20, 10)), 'large': ((400, 60), (80, 20))}
+
+
+# ─── Corpus generators ───
+
+def make_photo(path, width, height, seed=0):
+    """A JPEG with smooth gradients plus sensor-like noise (compresses like a photo)."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([
+        128 + 100 * np.sin(x / width * 6.0 + seed),
+        128 + 100 * np.cos(y / height * 4.0),
+        128 + 80 * np.sin((x + y) / (width + height) * 9.0),
+    ], axis=-1)
+    noise = rng.normal(0, 12, size=(height, width, 3)).astype(np.float32)
+    pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+    Image.fromarray(pixels, 'RGB').save(path, 'JPEG', quality=90)
+
+
+def make_logo(path, size, checkerboard=False):
+    """A logo on a white (or light checkerboard) background."""
+    img = Image.new('RGBA', (size, size), (255, 255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    if checkerboard:
+        square = max(8, size // 64)
+        for top in range(0, size, square):
+            for left in range((top // square) % 2 * square, size, square * 2):
+                draw.rectangle([left, top, left + square - 1, top + square - 1], fill=(204, 204, 204, 255))
+    margin = size // 6
+    draw.ellipse([margin, margin, size - margin, size - margin], fill=(24, 84, 140, 255))
+    draw.rectangle([size // 3, size // 3, size * 2 // 3, size * 2 // 3], fill=(240, 180, 40, 255))
+    img.save(path, 'PNG')
+
+
+def make_site(directory, pages, refs):
+    """
+    pages HTML pages with refs references each: links to other pages, images,
+    anchors and ~5% broken targets, plus a stylesheet with url() references.
+    """
+    images_dir = os.path.join(directory, 'assets', 'images')
+    os.makedirs(images_dir, exist_ok=True)
+    image_count = max(1, pages // 2)
+    for i in range(image_count):
+        with open(os.path.join(images_dir, f'photo{i}.jpg'), 'wb') as f:
+            f.write(b'\xff\xd8\xff')
+    with open(os.path.join(directory, 'style.css'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(f'.bg{i} {{ background: url("assets/images/photo{i}.jpg"); }}'
+                          for i in range(image_count)))
+    for page in range(pages):
+        body = []
+        for ref in range(refs):
+            n = page * refs + ref
+            if n % 20 == 0:
+                body.append(f'<a href="missing{n}.html">broken</a>')
+            elif n % 3 == 0:
+                body.append(f'<img src="assets/images/photo{n % image_count}.jpg" alt="">')
+            elif n % 7 == 0:
+                body.append(f'<a href="page{(n * 7) % pages}.html#section{ref}">anchor</a>')
+            else:
+                body.append(f'<a href="page{n % pages}.html">link</a>')
+        with open(os.path.join(directory, f'page{page}.html'), 'w', encoding='utf-8') as f:
+            f.write('<!DOCTYPE html><html><head><title>Page</title>'
+                    '<meta name="description" content="Synthetic page">'
+                    '<link rel="stylesheet" href="style.css"></head><body><header></header><main>'
+                    + '<section>' + '\n'.join(body) + '</section></main></body></html>')
+
+
+# ─── Cases ───
+# Each case is setup(workdir, quick) -> state, run(state) -> None. setup is not timed.
+
+def photo_setup(size_name):
+    def setup(workdir, quick):
+        width, height = PHOTO_SIZES[size_name][1 if quick else 0]
+        path = os.path.join(workdir, 'photo.jpg')
+        make_photo(path, width, height)
+        return path, os.path.join(workdir, 'photo.webp')
+    return setup
+
+
+def run_convert(state):
+    from optimize_images import MAX_WIDTH, encode_webp
+    encode_webp(state[0], state[1], MAX_WIDTH)
+
+
+def logo_setup(size_name, checkerboard=False):
+    def setup(workdir, quick):
+        from logo_tools import load_rgba
+        size = LOGO_SIZES[size_name][1 if quick else 0]
+        path = os.path.join(workdir, 'logo.png')
+        make_logo(path, size, checkerboard)
+        return load_rgba(path)[0]
+    return setup
+
+
+def run_flood(rgba):
+    from logo_tools import flood_fill
+    flood_fill(rgba)
+
+
+def run_checkerboard(rgba):
+    from logo_tools import remove_checkerboard
+    remove_checkerboard(rgba)
+
+
+def site_setup(size_name):
+    def setup(workdir, quick):
+        pages, refs = SITE_SIZES[size_name][1 if quick else 0]
+        make_site(workdir, pages, refs)
+        return workdir
+    return setup
+
+
+def run_links(directory):
+    from link_checker_v2 import check_site
+    check_site(directory, jobs=1)
+
+
+def incremental_setup(size_name):
+    def setup(workdir, quick):
+        from link_checker_v2 import check_site_incremental, load_graph
+        directory = site_setup(size_name)(workdir, quick)
+        graph = load_graph(os.path.join(workdir, 'missing-graph.json'))
+        check_site_incremental(directory, graph, jobs=1)
+        return directory, graph
+    return setup
+
+
+def run_links_incremental(state):
+    from link_checker_v2 import check_site_incremental
+    directory, graph = state
+    # Touch one page so every run has real (but small) work to do
+    page = os.path.join(directory, 'page0.html')
+    with open(page, 'a', encoding='utf-8') as f:
+        f.write(' ')
+    check_site_incremental(directory, graph, jobs=1)
+
+
+def rewrite_setup(size_name):
+    def setup(workdir, quick):
+        from html_rewrite import find_pages
+        directory = site_setup(size_name)(workdir, quick)
+        dimensions = {f'assets/images/photo{i}.jpg': [1920, 1440] for i in range(1000)}
+        chain = [('webp-references', {'skip_files': [], 'srcset_index': {}}),
+                 ('img-attributes', {'dimensions': dimensions})]
+        originals = {}
+        for path in find_pages(directory):
+            with open(path, 'r', encoding='utf-8') as f:
+                originals[path] = f.read()
+        return originals, chain
+    return setup
+
+
+def run_rewrite(state):
+    from html_rewrite import rewrite_pages
+    originals, chain = state
+    # Restore the pages first so every run rewrites the same content
+    for path, content in originals.items():
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    rewrite_pages(list(originals), chain, jobs=1)
+
+
+def css_setup(page_name):
+    def setup(workdir, quick):
+        from critical_css import Stylesheet, load_script_names
+        with open(os.path.join(PROJECT_ROOT, 'style.css'), 'r', encoding='utf-8') as f:
+            sheet = Stylesheet(f.read())
+        with open(os.path.join(PROJECT_ROOT, page_name), 'r', encoding='utf-8') as f:
+            html = f.read()
+        return sheet, html, load_script_names(PROJECT_ROOT)
+    return setup
+
+
+def run_css(state):
+    from critical_css import page_css
+    page_css(*state)
+
+
+CASES = {
+    'convert-small': (photo_setup('small'), run_convert),
+    'convert-large': (photo_setup('large'), run_convert),
+    'convert-huge': (photo_setup('huge'), run_convert),
+    'flood-512': (logo_setup('512'), run_flood),
+    'flood-4000': (logo_setup('4000'), run_flood),
+    'checker-2048': (logo_setup('2048', checkerboard=True), run_checkerboard),
+    'links-small': (site_setup('small'), run_links),
+    'links-large': (site_setup('large'), run_links),
+    'links-incr-large': (incremental_setup('large'), run_links_incremental),
+    'rewrite-large': (rewrite_setup('large'), run_rewrite),
+    'css-index': (css_setup('index.html'), run_css),
+}
+
+
+# ─── Runner ───
+
+# Imported before the RSS measurement so module code does not count as growth
+TOOL_MODULES = ('optimize_images', 'logo_tools', 'link_checker_v2', 'html_rewrite', 'critical_css')
+
+def _rss_mb():
+    """
+    Process RSS high-water mark in MB. On Linux this is VmHWM, which belongs
+    to the address space; ru_maxrss (KB on Linux, bytes on macOS) is the
+    fallback, but Linux carries it over from the parent across fork and exec.
+    """
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_rss(name, state):
+    """
+    Worker: RSS high-water mark growth of a single run, in a process that has
+    done nothing else yet. The state is unpickled before this is called, so
+    only what the run itself allocates counts.
+    """
+    for module in TOOL_MODULES:
+        __import__(module)
+    rss_before = _rss_mb()
+    CASES[name][1](state)
+    return max(0.0, _rss_mb() - rss_before)
+
+
+def run_case(name, repeat, quick):
+    """Worker: set up and time one case; returns its result dict."""
+    setup, run = CASES[name]
+    workdir = tempfile.mkdtemp(prefix=f'bench-{name}-')
+    try:
+        state = setup(workdir, quick)
+        # Setup and the warm-up leave the RSS high-water mark behind, so the
+        # RSS figure comes from a cold run in a fresh process of its own
+        # (spawned: a forked child shares this address space and its high-water mark)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            rss_growth = executor.submit(measure_rss, name, state).result()
+        run(state)  # warm-up: imports, caches, page cache
+        tracemalloc.start()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(state)
+            times.append((time.perf_counter() - start) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            'median_ms': round(statistics.median(times), 2),
+            'min_ms': round(min(times), 2),
+            'tracemalloc_peak_mb': round(peak / (1024 * 1024), 2),
+            'rss_growth_mb': round(rss_growth, 2),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_cases(names, repeat, quick):
+    results = {}
+    for name in names:
+        # A fresh process per case keeps the RSS high-water mark per case
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[name] = executor.submit(run_case, name, repeat, quick).result()
+    return results
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results, quick, path=BASELINE_PATH):
+    """Write the baseline atomically, merged with cases that were not rerun."""
+    baseline = load_baseline(path) or {}
+    key = 'quick' if quick else 'full'
+    runs = baseline.setdefault(key, {'machine': None, 'cases': {}})
+    runs['machine'] = f"{platform.node()} {platform.machine()} Python {platform.python_version()}"
+    runs['cases'].update(results)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def regressions(result, base, time_threshold, memory_threshold):
+    """Reasons this result regressed against base (empty when it didn't)."""
+    reasons = []
+    slower = result['min_ms'] - base['min_ms']
+    if slower > TIME_FLOOR_MS and slower > base['min_ms'] * time_threshold:
+        reasons.append(f"time +{slower / base['min_ms'] * 100:.0f}%")
+    for field in ('tracemalloc_peak_mb', 'rss_growth_mb'):
+        grown = result[field] - base[field]
+        if grown > MEMORY_FLOOR_MB and grown > base[field] * memory_threshold:
+            reasons.append(f"{field.split('_')[0]} +{grown:.1f} MB")
+    return reasons
+
+
+def report(results, baseline_cases, time_threshold, memory_threshold):
+    """Print the results table; returns the number of regressed cases."""
+    print(f"  {'Case':<18} {'Median':>10} {'Min':>10} {'Py peak':>9} {'RSS +':>9}  vs baseline")
+    failed = 0
+    for name, result in results.items():
+        base = (baseline_cases or {}).get(name)
+        if base is None:
+            status = "(no baseline)"
+        else:
+            change = (result['min_ms'] / base['min_ms'] - 1) * 100 if base['min_ms'] else 0
+            reasons = regressions(result, base, time_threshold, memory_threshold)
+            failed += bool(reasons)
+            status = f"{change:+.0f}%" + (f"  ✗ {', '.join(reasons)}" if reasons else "  ✓")
+        print(f"  {name:<18} {result['median_ms']:>8.1f}ms {result['min_ms']:>8.1f}ms "
+              f"{result['tracemalloc_peak_mb']:>7.1f}MB {result['rss_growth_mb']:>7.1f}MB  {status}")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the image and HTML tooling.")
+    parser.add_argument('-k', '--filter', action='append', default=[],
+                        help="Only run cases whose name contains this (repeatable)")
+    parser.add_argument('--quick', action='store_true', help="Smaller corpora (separate baseline)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument('--time-threshold', type=float, default=TIME_THRESHOLD,
+                        help=f"Allowed slowdown as a fraction (default: {TIME_THRESHOLD})")
+    parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD,
+                        help=f"Allowed memory growth as a fraction (default: {MEMORY_THRESHOLD})")
+    parser.add_argument('--json', metavar='FILE', help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if not args.filter or any(f in name for f in args.filter)]
+    if not names:
+        parser.error("no cases match the filter")
+
+    print(f"Running {len(names)} benchmark cases ({'quick' if args.quick else 'full'}, "
+          f"median of {args.repeat})...\n")
+    results = run_cases(names, args.repeat, args.quick)
+
+    baseline = load_baseline(args.baseline) or {}
+    runs = baseline.get('quick' if args.quick else 'full') or {}
+    failed = report(results, runs.get('cases'), args.time_threshold, args.memory_threshold)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        save_baseline(results, args.quick, args.baseline)
+        print(f"\n  Baseline saved to {os.path.relpath(args.baseline, PROJECT_ROOT)}.")
+        return 0
+    if failed:
+        print(f"\n  {failed} case(s) regressed past the threshold.")
+        return 1
+    print("\n  No regressions." if runs else "\n  No baseline yet (run with --save-baseline).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
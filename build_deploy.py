@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Deploy Builder
+Builds the Hostinger bundle: copies only the files a visitor can actually
+reach, swaps in the minified dist/ CSS/JS, renames static assets to
+content-hashed filenames, and zips the result.
+
+Reachability starts at the public pages (index.html plus every page listed in
+sitemap.xml, plus robots.txt/sitemap.xml themselves) and follows:
+  - HTML references (href/src/srcset/poster, inline CSS url())
+  - CSS url() references
+  - string literals in JS files and inline <script> blocks that name a local
+    file ('/data/blogs.json', 'assets/images/x.webp', 'blog.html', ...)
+  - local file paths anywhere in fetched data/*.json (image fields, links)
+
+Everything else that rsync used to ship (.bak files, HEIC/PNG originals kept
+next to their .webp, logo export/debug pages) is reported as unreachable.
+
+Fingerprinting renames CSS, JS, images, fonts and media to name.<hash>.ext,
+rewrites every reference to them in the HTML, CSS, JS and data/*.json of the
+bundle and writes asset-manifest.json (logical name -> hashed name). HTML
+pages and data/*.json keep their names.
+
+Every <img> in the bundle is given width/height from the image dimension
+index, decoding="async", loading="lazy" below the fold and fetchpriority on
+the hero image (see image_dimensions.py), and photos get their blurred
+placeholder as a background, in the <img> tags and as placeholder fields in
+data/blogs.json and data/experiences.json (see placeholders.py).
+
+The @font-face fonts of style.css are subset to the characters the bundle
+uses, and faces sharing a font file share one subset (see font_subset.py).
+
+Pages that link style.css get its critical above-the-fold subset inlined and
+load the full sheet without blocking rendering (see critical_css.py); with
+--prune-css they load a per-page sheet without the rules they never use.
+
+The public read routes of server.js (/api/blogs, /api/experiences and their
+pages and items) are pre-rendered into api/ and mapped by .htaccess, so the
+static host serves them without Node (see static_api.py).
+
+A sharded client-side search index over the blogs, experiences and
+experience pages is written to data/search/ (see search_index.py).
+
+Finally every compressible file gets .br/.gz siblings (see precompress.py) and
+an .htaccess is written that serves those siblings, caches hashed files as
+immutable and makes HTML/JSON revalidate.
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import zipfile
+import argparse
+import posixpath
+from collections import deque
+from urllib.parse import urlsplit, unquote
+import xml.etree.ElementTree as ET
+
+from link_checker_v2 import build_site_index, parse_file, resolve_reference
+from html_rewrite import rewrite_pages
+from image_dimensions import build_dimension_index
+from placeholders import build_placeholders, embed_placeholders
+from search_index import write_index as write_search_index
+from static_api import COLLECTIONS as API_COLLECTIONS, HTACCESS_RULES as STATIC_API_RULES, export_api, write_etags
+from font_subset import subset_stylesheet
+from critical_css import STYLESHEET, print_report as print_css_report, process_bundle as inline_css
+from precompress import HTACCESS_RULES as PRECOMPRESS_RULES, precompress_dir, print_stats
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEPLOY_DIR = os.path.join(PROJECT_ROOT, 'deploy_build')
+DIST_DIR = os.path.join(PROJECT_ROOT, 'dist')
+
+# Data files whose items get placeholder fields for their 'image'
+PLACEHOLDER_DATA_FILES = ['data/blogs.json', 'data/experiences.json']
+
+# Minified builds from `npm run build` that replace their sources in the bundle
+DIST_FILES = ['style.css', 'script.js']
+
+# Always shipped, whether or not anything links to them (the data files behind
+# the pre-rendered API are fetched through /api/..., which is not a file path)
+ROOT_FILES = ['index.html', 'robots.txt', 'sitemap.xml'] + [f for f, _ in API_COLLECTIONS.values()]
+
+# Never part of the bundle (dev tooling, sources of dist/, server code)
+EXCLUDED_DIRS = {'.git', 'node_modules', 'deploy_build', 'dist', 'admin', 'data_export',
+                 '.vscode', '.idea', '__pycache__'}
+# Output of the site tools themselves; like dot-directories (.git, caches such
+# as .precompress_cache/) these are not site files left out of the bundle
+GENERATED_DIRS = {'data/search'}
+
+# File types whose contents are scanned for further references
+HTML_EXTENSIONS = {'.html'}
+CSS_EXTENSIONS = {'.css'}
+JS_EXTENSIONS = {'.js'}
+JSON_EXTENSIONS = {'.json'}
+
+# Extensions a JS/JSON string must end with to count as a file reference
+ASSET_EXTENSIONS = ('html', 'css', 'js', 'json', 'webp', 'avif', 'png', 'jpg', 'jpeg', 'gif',
+                    'svg', 'ico', 'mp4', 'webm', 'mov', 'woff2', 'woff', 'pdf', 'txt', 'xml')
+# Assets renamed to name.<hash>.ext
+FINGERPRINT_EXTENSIONS = {'.css', '.js', '.webp', '.avif', '.png', '.jpg', '.jpeg', '.gif', '.svg',
+                          '.ico', '.mp4', '.webm', '.mov', '.woff2', '.woff', '.pdf'}
+# Text files whose references are rewritten, in dependency order: CSS and JS
+# are hashed after their own references are rewritten, HTML/JSON last.
+REWRITE_ORDER = ['.css', '.js', '.json', '.html']
+HASH_LENGTH = 8
+MANIFEST_NAME = 'asset-manifest.json'
+
+# Served by Apache on Hostinger: pages always revalidate, hashed files never
+# change (later blocks win, so hashed JSON such as search shards is immutable)
+HTACCESS = """<IfModule mod_headers.c>
+    <FilesMatch "\\.(html|json)(\\.br|\\.gz)?$">
+        Header set Cache-Control "no-cache"
+    </FilesMatch>
+    <FilesMatch "\\.[0-9a-f]{%d}\\.[A-Za-z0-9]+(\\.br|\\.gz)?$">
+        Header set Cache-Control "public, max-age=31536000, immutable"
+    </FilesMatch>
+</IfModule>
+""" % HASH_LENGTH
+
+JS_STRING_PATTERN = re.compile(
+    r'''(['"`])((?:\.{0,2}/)?[\w\-./ %@]+?\.(?:''' + '|'.join(ASSET_EXTENSIONS) +
+    r'''))(?:[?#][^'"`]*)?\1''', re.IGNORECASE)
+
+
+def sitemap_pages(root):
+    """Site-relative paths of the pages listed in sitemap.xml."""
+    path = os.path.join(root, 'sitemap.xml')
+    if not os.path.exists(path):
+        return []
+    pages = []
+    for element in ET.parse(path).iter():
+        if element.tag.endswith('loc') and element.text:
+            page = unquote(urlsplit(element.text.strip()).path).lstrip('/')
+            pages.append(page if page and not page.endswith('/') else page + 'index.html')
+    return pages
+
+
+def string_references(text):
+    """Local-looking file paths in JS/HTML string literals."""
+    return [match.group(2) for match in JS_STRING_PATTERN.finditer(text)
+            if '://' not in match.group(2)]
+
+
+def json_references(value):
+    """Local-looking file paths anywhere inside a parsed JSON value."""
+    if isinstance(value, str):
+        return string_references(json.dumps(value))
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [ref for item in value for ref in json_references(item)]
+    return []
+
+
+def file_references(root, rel_path):
+    """
+    Root-relative targets referenced by one file. HTML/CSS references resolve
+    against the file's directory; JS and JSON strings are used by pages at
+    the site root, so they resolve against the root.
+    """
+    path = os.path.join(root, rel_path)
+    ext = os.path.splitext(rel_path)[1].lower()
+    targets = []
+    if ext in HTML_EXTENSIONS or ext in CSS_EXTENSIONS:
+        page_dir = posixpath.dirname(rel_path)
+        targets.extend(resolve_reference(url, page_dir) for _, url in parse_file(path)['references'])
+    if ext in HTML_EXTENSIONS or ext in JS_EXTENSIONS:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        targets.extend(resolve_reference(url, '') for url in string_references(text))
+    if ext in JSON_EXTENSIONS:
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except ValueError:
+                data = None
+        targets.extend(resolve_reference(url, '') for url in json_references(data))
+    return {target for target in targets if target is not None}
+
+
+def reachable_files(root, roots=None):
+    """Every file reachable from the root pages, as root-relative posix paths."""
+    index = build_site_index(root)
+    if roots is None:
+        roots = ROOT_FILES + sitemap_pages(root)
+
+    def existing(target):
+        for candidate in (target, unquote(target)):
+            if candidate in index:
+                if os.path.isdir(os.path.join(root, candidate)):
+                    candidate = posixpath.join(candidate, 'index.html')
+                    if candidate not in index:
+                        return None
+                return candidate
+        return None
+
+    seen = set()
+    queue = deque(filter(None, (existing(r) for r in roots)))
+    while queue:
+        rel_path = queue.popleft()
+        if rel_path in seen or rel_path.split('/')[0] in EXCLUDED_DIRS:
+            continue
+        seen.add(rel_path)
+        for target in file_references(root, rel_path):
+            found = existing(target)
+            if found and found not in seen:
+                queue.append(found)
+    return seen
+
+
+def candidate_files(root):
+    """
+    Every site file the old rsync-based bundle could have shipped: no dot
+    files or directories, tool caches or generated output.
+    """
+    files = []
+    for dirpath, dirs, names in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        rel_dir = '' if rel_dir == '.' else rel_dir
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS and not d.startswith('.')
+                   and posixpath.join(rel_dir, d) not in GENERATED_DIRS]
+        files.extend(posixpath.join(rel_dir, name) for name in names if not name.startswith('.'))
+    return files
+
+
+def copy_bundle(root, files, out_dir):
+    """Copy files (root-relative) into out_dir, recreating directories."""
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    for rel_path in sorted(files):
+        target = os.path.join(out_dir, rel_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(root, rel_path), target)
+
+
+def overlay_dist(out_dir, files):
+    """Replace CSS/JS sources in the bundle with their minified dist/ builds."""
+    replaced = []
+    for name in DIST_FILES:
+        source = os.path.join(DIST_DIR, name)
+        if name in files and os.path.exists(source):
+            shutil.copy2(source, os.path.join(out_dir, name))
+            replaced.append(name)
+    return replaced
+
+
+def hashed_name(rel_path, content):
+    """assets/x.webp -> assets/x.<hash>.webp"""
+    name, ext = posixpath.splitext(rel_path)
+    return f"{name}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def rewrite_references(text, rel_path, out_dir, manifest):
+    """
+    Point every reference in text at the hashed names in manifest. Only the
+    last path segment of a reference changes, so relative, root-relative and
+    %-encoded forms (and any ?query/#fragment) are preserved.
+    """
+    ext = posixpath.splitext(rel_path)[1].lower()
+    urls = set()
+    if ext in HTML_EXTENSIONS or ext in CSS_EXTENSIONS:
+        page_dir = posixpath.dirname(rel_path)
+        for _, url in parse_file(os.path.join(out_dir, rel_path))['references']:
+            urls.add((url, page_dir))
+    if ext in HTML_EXTENSIONS or ext in JS_EXTENSIONS or ext in JSON_EXTENSIONS:
+        # JSON text is scanned like JS: escaped slashes aside, paths are plain strings
+        urls.update((url, '') for url in string_references(text))
+
+    replacements = {}
+    for url, base_dir in urls:
+        target = resolve_reference(url, base_dir)
+        if target is None:
+            continue
+        hashed = manifest.get(target) or manifest.get(unquote(target))
+        if not hashed:
+            continue
+        path = url.split('?')[0].split('#')[0]
+        head, _, segment = path.rpartition('/')
+        stem, dot, suffix = segment.rpartition('.')
+        new_segment = f"{stem}.{posixpath.basename(hashed).rsplit('.', 2)[1]}.{suffix}"
+        replacements[path] = (head + '/' if head or path.startswith('/') else '') + new_segment
+
+    for old in sorted(replacements, key=len, reverse=True):
+        text = re.sub(r'(?<![\w./%-])' + re.escape(old) + r'(?=[?#"\'`)\s,]|$)',
+                      lambda m, new=replacements[old]: new, text)
+    return text
+
+
+def fingerprint_bundle(out_dir, files):
+    """
+    Rename static assets in out_dir to content-hashed names and rewrite all
+    references. Returns the manifest {logical path: hashed path}.
+    """
+    manifest = {}
+    assets = [f for f in files if posixpath.splitext(f)[1].lower() in FINGERPRINT_EXTENSIONS]
+    text_files = sorted(
+        (f for f in files if posixpath.splitext(f)[1].lower() in REWRITE_ORDER),
+        key=lambda f: REWRITE_ORDER.index(posixpath.splitext(f)[1].lower()))
+
+    # Binary assets first: their hashes don't depend on anything else
+    for rel_path in assets:
+        if rel_path in text_files:
+            continue
+        with open(os.path.join(out_dir, rel_path), 'rb') as f:
+            manifest[rel_path] = hashed_name(rel_path, f.read())
+
+    # Then CSS, JS, JSON and HTML: rewrite, then hash what gets renamed
+    for rel_path in text_files:
+        path = os.path.join(out_dir, rel_path)
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        rewritten = rewrite_references(text, rel_path, out_dir, manifest)
+        if rewritten != text:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(rewritten)
+        if rel_path in assets:
+            manifest[rel_path] = hashed_name(rel_path, rewritten.encode('utf-8'))
+
+    for rel_path, hashed in manifest.items():
+        os.replace(os.path.join(out_dir, rel_path), os.path.join(out_dir, hashed))
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def embed_data_placeholders(out_dir, files, placeholders):
+    """Add placeholder fields to the bundle's data files; returns how many items got one."""
+    count = 0
+    for rel_path in PLACEHOLDER_DATA_FILES:
+        if rel_path not in files:
+            continue
+        path = os.path.join(out_dir, rel_path)
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        items = embed_placeholders(items, placeholders)
+        count += sum(1 for item in items if 'placeholder' in item)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, indent=2, ensure_ascii=False)
+    return count
+
+
+def write_htaccess(out_dir, precompressed, static_api=False):
+    """
+    Caching rules, plus the static API routes and the .br/.gz serving rules
+    when those exist (API rewrites first, so their targets get siblings too).
+    """
+    path = os.path.join(out_dir, '.htaccess')
+    if os.path.exists(path):
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(HTACCESS)
+        if static_api:
+            f.write(STATIC_API_RULES)
+        if precompressed:
+            f.write(PRECOMPRESS_RULES)
+
+
+def write_zip(out_dir, zip_path):
+    """Zip the bundle directory (contents at the archive root)."""
+    if os.path.exists(zip_path):
+        os.remove(zip_path)
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for dirpath, dirs, names in os.walk(out_dir):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(dirpath, name)
+                archive.write(path, os.path.relpath(path, out_dir))
+
+
+def format_size(size):
+    return f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the deploy bundle from the reachable files.")
+    parser.add_argument('--out', default=DEPLOY_DIR, help="Deploy directory (default: deploy_build)")
+    parser.add_argument('--zip', metavar='FILE', help="Also write the bundle to this zip file")
+    parser.add_argument('--no-fingerprint', action='store_true',
+                        help="Keep original asset filenames")
+    parser.add_argument('--no-img-attributes', action='store_true',
+                        help="Don't add width/height/loading/fetchpriority to <img> tags")
+    parser.add_argument('--no-placeholders', action='store_true',
+                        help="Don't embed blurred image placeholders")
+    parser.add_argument('--no-critical-css', action='store_true',
+                        help="Keep render-blocking style.css links as they are")
+    parser.add_argument('--prune-css', action='store_true',
+                        help="Load a per-page style.css without the rules the page never uses")
+    parser.add_argument('--no-static-api', action='store_true',
+                        help="Don't pre-render /api/blogs and /api/experiences into api/")
+    parser.add_argument('--no-font-subset', action='store_true',
+                        help="Ship the @font-face fonts in full")
+    parser.add_argument('--no-search-index', action='store_true',
+                        help="Don't build the client-side search index (data/search/)")
+    parser.add_argument('--no-precompress', action='store_true',
+                        help="Don't write .br/.gz siblings")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Worker processes for page rewrites and precompression (default: all CPUs)")
+    parser.add_argument('--report-only', action='store_true', help="Only print the reachability report")
+    parser.add_argument('--list-unreachable', action='store_true',
+                        help="List every unreachable file, not just the largest")
+    args = parser.parse_args(argv)
+
+    print("=" * 50)
+    print("YOLO Living - Deploy Builder")
+    print("=" * 50)
+
+    reachable = reachable_files(PROJECT_ROOT)
+    candidates = candidate_files(PROJECT_ROOT)
+    sizes = {path: os.path.getsize(os.path.join(PROJECT_ROOT, path)) for path in candidates}
+    unreachable = sorted((p for p in candidates if p not in reachable),
+                         key=lambda p: sizes[p], reverse=True)
+    shipped = sum(sizes[p] for p in reachable if p in sizes)
+    saved = sum(sizes[p] for p in unreachable)
+
+    print(f"\n  Reachable:   {len(reachable)} files, {format_size(shipped)}")
+    print(f"  Unreachable: {len(unreachable)} files, {format_size(saved)} left out of the bundle")
+    shown = unreachable if args.list_unreachable else unreachable[:20]
+    for path in shown:
+        print(f"    - {path} ({format_size(sizes[path])})")
+    if len(shown) < len(unreachable):
+        print(f"    ... and {len(unreachable) - len(shown)} more (--list-unreachable)")
+
+    if args.report_only:
+        return 0
+
+    copy_bundle(PROJECT_ROOT, reachable, args.out)
+    print(f"\n  Copied {len(reachable)} files to {os.path.relpath(args.out, PROJECT_ROOT)}/")
+    replaced = overlay_dist(args.out, reachable)
+    if replaced:
+        print(f"  Using minified dist/ builds: {', '.join(replaced)}")
+    elif any(name in reachable for name in DIST_FILES):
+        print("  ! dist/ not found, shipping unminified CSS/JS (run npm run build)")
+
+    pages = sorted(f for f in reachable if os.path.splitext(f)[1].lower() in HTML_EXTENSIONS)
+    chain = []
+    if not args.no_img_attributes:
+        dimensions, _ = build_dimension_index(PROJECT_ROOT)
+        chain.append(('img-attributes', {'dimensions': dimensions}))
+    if not args.no_placeholders:
+        placeholders, _ = build_placeholders(PROJECT_ROOT)
+        chain.append(('lqip', {'placeholders': {p: e['lqip'] for p, e in placeholders.items()}}))
+        items = embed_data_placeholders(args.out, reachable, placeholders)
+        print(f"  Embedded placeholders in {items} data items")
+    api_files = []
+    if not args.no_static_api:
+        api_files = export_api(args.out, PROJECT_ROOT, {} if args.no_placeholders else placeholders)
+        reachable |= set(api_files)
+        print(f"  Pre-rendered {len(api_files)} static API files")
+    if chain:
+        results = rewrite_pages([os.path.join(args.out, p) for p in pages], chain,
+                                jobs=args.jobs or os.cpu_count() or 1)
+        print(f"  Stamped <img> attributes in {sum(r['changed'] for r in results)} pages")
+
+    if not args.no_search_index:
+        search_dir = os.path.join(args.out, 'data', 'search')
+        sizes = write_search_index(search_dir, PROJECT_ROOT, precompress=False)
+        reachable |= {f'data/search/{name}' for name in sizes}
+        print(f"  Built search index: {len(sizes) - 1} shards, {format_size(sum(sizes.values()))}")
+
+    if not args.no_font_subset and STYLESHEET in reachable:
+        font_rows, removed_fonts = subset_stylesheet(args.out)
+        if font_rows is None:
+            print("  ! fontTools not installed, fonts shipped in full (pip install fonttools brotli)")
+        else:
+            reachable -= set(removed_fonts)
+            original = sum(row['original'] for row in font_rows)
+            shipped = sum(row['subset'] for row in font_rows)
+            print(f"  Subset fonts: {format_size(original)} -> {format_size(shipped)}, "
+                  f"{len(removed_fonts)} files dropped or shared")
+
+    if not args.no_critical_css and STYLESHEET in reachable:
+        rows, pruned_sheets = inline_css(args.out, pages, prune=args.prune_css)
+        reachable |= set(pruned_sheets)
+        print(f"  Inlined critical CSS in {len(rows)} pages"
+              + (f", wrote {len(pruned_sheets)} pruned stylesheets" if pruned_sheets else ""))
+        if args.prune_css:
+            print_css_report(rows)
+
+    if not args.no_fingerprint:
+        manifest = fingerprint_bundle(args.out, reachable)
+        print(f"  Fingerprinted {len(manifest)} assets (see {MANIFEST_NAME})")
+    if api_files:
+        write_etags(args.out, api_files)
+
+    if not args.no_precompress:
+        print_stats(precompress_dir(args.out, workers=args.jobs or None))
+    write_htaccess(args.out, not args.no_precompress, bool(api_files))
+
+    if args.zip:
+        write_zip(args.out, args.zip)
+        print(f"  Wrote {args.zip} ({format_size(os.path.getsize(args.zip))})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
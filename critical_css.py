@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Critical CSS
+Matches the selectors of style.css against the DOM of each page to find:
+  - the rules that can apply to the page at all (everything else is unused
+    on that page and can be pruned), and
+  - the critical subset that styles the content above the fold (everything
+    before the second <section>), which is inlined in the page while the
+    full stylesheet loads without blocking rendering.
+
+Matching is conservative. Pseudo-classes and pseudo-elements are ignored (so
+a:hover counts as a), anything the selector parser does not understand is
+kept, and for pruning any class, id or attribute named in a JS string (or an
+inline <script>) is assumed to be present, since script.js toggles state
+classes like .active and .scrolled and builds cards from templates.
+
+Standard library only.
+
+Usage:
+  python3 critical_css.py                 # report bytes per page, write nothing
+  python3 build_deploy.py                 # inlines critical CSS in the bundle
+  python3 build_deploy.py --prune-css     # ...and links per-page pruned sheets
+"""
+
+import os
+import re
+import sys
+import glob
+import argparse
+from html.parser import HTMLParser
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+STYLESHEET = 'style.css'
+SCRIPT_FILES = ['script.js', 'property-page.js', 'config.js', 'site-search.js']
+
+# The fold: everything in document order before this many <section>s have
+# started counts as above it (pages without sections use FOLD_MAX_ELEMENTS).
+FOLD_SECTIONS = 1
+FOLD_MAX_ELEMENTS = 300
+
+# Rule blocks whose children are selected individually; other at-rules
+# (@font-face, @keyframes, @import, ...) are kept or dropped as a whole.
+GROUPING_AT_RULES = {'media', 'supports', 'layer', 'container', 'document'}
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                 'param', 'source', 'track', 'wbr'}
+
+STYLESHEET_LINK_PATTERN = re.compile(
+    r'<link\b(?=[^>]*\brel=["\']stylesheet["\'])[^>]*\bhref=["\']([^"\']+)["\'][^>]*>',
+    re.IGNORECASE)
+# String literals (groups 1-2); comments match too, with group 2 None, so an
+# apostrophe in a comment cannot throw the string scan out of step
+JS_STRING_PATTERN = re.compile(r'''//[^\n]*|/\*.*?\*/|(['"`])((?:\\.|(?!\1).)*)\1''', re.DOTALL)
+NAME_PATTERN = re.compile(r'[A-Za-z_][\w-]*')
+KEYFRAMES_NAME_PATTERN = re.compile(r'@(?:-\w+-)?keyframes\s+([\w-]+)', re.IGNORECASE)
+
+
+# ─── CSS parsing ───
+
+def _skip_string(text, i):
+    """Index just past the string literal starting at text[i]."""
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == '\\' else 1
+    return i + 1
+
+
+def _strip_comments(text):
+    out, i = [], 0
+    while i < len(text):
+        if text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end == -1 else end + 2
+        elif text[i] in '"\'':
+            end = _skip_string(text, i)
+            out.append(text[i:end])
+            i = end
+        else:
+            out.append(text[i])
+            i += 1
+    return ''.join(out)
+
+
+def _block_end(text, i):
+    """Index of the '}' closing the block whose '{' is at text[i]."""
+    depth = 0
+    while i < len(text):
+        char = text[i]
+        if char in '"\'':
+            i = _skip_string(text, i)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(text)
+
+
+def parse_css(text, _comments_stripped=False):
+    """
+    Parse a stylesheet into nodes:
+      {'type': 'rule', 'selectors': [...], 'text': 'sel{decls}'}
+      {'type': 'group', 'prelude': '@media ...', 'children': [nodes]}
+      {'type': 'at', 'prelude': '@font-face', 'text': '@font-face{...}'}
+    """
+    if not _comments_stripped:
+        text = _strip_comments(text)
+    nodes, i, start = [], 0, 0
+    while i < len(text):
+        char = text[i]
+        if char in '"\'':
+            i = _skip_string(text, i)
+        elif char == ';' and text[start:i].strip().startswith('@'):
+            # Statement at-rule: @import, @charset, @layer a, b;
+            prelude = text[start:i].strip()
+            nodes.append({'type': 'at', 'prelude': prelude, 'text': prelude + ';'})
+            i += 1
+            start = i
+        elif char == '{':
+            end = _block_end(text, i)
+            prelude = ' '.join(text[start:i].split())
+            body = text[i + 1:end]
+            if prelude.startswith('@'):
+                name = prelude[1:].split(None, 1)[0].split('(')[0].lower()
+                if name in GROUPING_AT_RULES:
+                    nodes.append({'type': 'group', 'prelude': prelude,
+                                  'children': parse_css(body, True)})
+                else:
+                    nodes.append({'type': 'at', 'prelude': prelude,
+                                  'text': f"{prelude}{{{_compact(body)}}}"})
+            elif prelude:
+                nodes.append({'type': 'rule', 'selectors': split_selectors(prelude),
+                              'text': f"{prelude}{{{_compact(body)}}}"})
+            i = end + 1
+            start = i
+        elif char == '}':
+            # Stray closing brace: skip it
+            i += 1
+            start = i
+        else:
+            i += 1
+    return nodes
+
+
+def _compact(body):
+    """Declarations with insignificant whitespace collapsed."""
+    return ' '.join(body.split()).strip().rstrip(';')
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas."""
+    parts, depth, current = [], 0, []
+    for char in prelude:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
+
+
+def serialize(nodes):
+    out = []
+    for node in nodes:
+        if node['type'] == 'group':
+            inner = serialize(node['children'])
+            if inner:
+                out.append(f"{node['prelude']}{{{inner}}}")
+        else:
+            out.append(node['text'])
+    return '\n'.join(out)
+
+
+# ─── Selectors ───
+
+COMPOUND_TOKEN = re.compile(r'''
+    (?P<universal>\*)
+  | (?P<tag>-?[A-Za-z_][\w-]*)
+  | \#(?P<id>-?[A-Za-z_\\][\w\\:-]*)
+  | \.(?P<cls>-?[A-Za-z_\\][\w\\:/.-]*?)(?=[\s>+~.#\[:,)]|$)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]+)\s*(?:[is]\s*)?)?\]
+  | (?P<pseudo>::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?)
+''', re.VERBOSE)
+
+
+def _unescape(name):
+    return re.sub(r'\\(.)', r'\1', name)
+
+
+def parse_selector(selector):
+    """
+    'nav > .menu a:hover' -> ([compound, ...], [combinator, ...]) where a
+    compound is {'tag', 'ids', 'classes', 'attrs'} and combinators are
+    ' ', '>', '+' or '~'. Raises ValueError on syntax it doesn't support.
+    """
+    compounds, combinators = [], []
+    i, text = 0, selector.strip()
+    pending = None
+    while i < len(text):
+        if text[i].isspace() or text[i] in '>+~':
+            combinator = ' '
+            while i < len(text) and (text[i].isspace() or text[i] in '>+~'):
+                if text[i] in '>+~':
+                    combinator = text[i]
+                i += 1
+            pending = combinator
+            continue
+        compound = {'tag': None, 'ids': [], 'classes': [], 'attrs': []}
+        matched = False
+        while i < len(text) and not text[i].isspace() and text[i] not in '>+~':
+            match = COMPOUND_TOKEN.match(text, i)
+            if not match or match.end() == i:
+                raise ValueError(f"unsupported selector: {selector}")
+            matched = True
+            if match.group('tag'):
+                compound['tag'] = match.group('tag').lower()
+            elif match.group('id'):
+                compound['ids'].append(_unescape(match.group('id')))
+            elif match.group('cls'):
+                compound['classes'].append(_unescape(match.group('cls')))
+            elif match.group('attr'):
+                value = match.group('value')
+                if value and value[0] in '"\'':
+                    value = value[1:-1]
+                compound['attrs'].append((match.group('attr').lower(), match.group('op'), value))
+            elif match.group('pseudo') and match.group('pseudo').lower() == ':root':
+                compound['tag'] = 'html'
+            i = match.end()
+        if not matched:
+            raise ValueError(f"unsupported selector: {selector}")
+        if compounds:
+            combinators.append(pending or ' ')
+        compounds.append(compound)
+        pending = None
+    if not compounds:
+        raise ValueError(f"empty selector: {selector!r}")
+    return compounds, combinators
+
+
+# ─── DOM ───
+
+class Element:
+    __slots__ = ('tag', 'attrs', 'ids', 'classes', 'parent', 'children', 'position')
+
+    def __init__(self, tag, attrs, parent, position):
+        self.tag = tag
+        self.attrs = attrs
+        self.ids = {attrs['id']} if attrs.get('id') else set()
+        self.classes = set((attrs.get('class') or '').split())
+        self.parent = parent
+        self.children = []
+        self.position = position
+
+
+class DomBuilder(HTMLParser):
+    """Builds a light element tree plus the text of inline <script> blocks."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {}, None, -1)
+        self.elements = []
+        self.scripts = []
+        self.section_positions = []
+        self._stack = [self.root]
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        parent = self._stack[-1]
+        element = Element(tag, {name.lower(): value or '' for name, value in attrs},
+                          parent, len(self.elements))
+        parent.children.append(element)
+        self.elements.append(element)
+        if tag == 'section':
+            self.section_positions.append(element.position)
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(element)
+        self._in_script = tag == 'script'
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        self._in_script = False
+        # Pop to the matching element; stray end tags are ignored
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                return
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.scripts.append(data)
+
+
+class PageDom:
+    """Element tree of one page, indexed for selector matching."""
+
+    def __init__(self, html):
+        builder = DomBuilder()
+        builder.feed(html)
+        builder.close()
+        self.elements = builder.elements
+        self.scripts = builder.scripts
+        sections = builder.section_positions
+        self.fold = (sections[FOLD_SECTIONS] if len(sections) > FOLD_SECTIONS
+                     else min(len(self.elements), FOLD_MAX_ELEMENTS))
+        self.by_tag, self.by_class, self.by_id = {}, {}, {}
+        for element in self.elements:
+            self.by_tag.setdefault(element.tag, []).append(element)
+            for name in element.classes:
+                self.by_class.setdefault(name, []).append(element)
+            for name in element.ids:
+                self.by_id.setdefault(name, []).append(element)
+
+
+def script_names(texts):
+    """Every identifier-like word inside a string literal of the given JS sources."""
+    names = set()
+    for text in texts:
+        for match in JS_STRING_PATTERN.finditer(text):
+            if match.group(2) is not None:
+                names.update(NAME_PATTERN.findall(match.group(2)))
+    return names
+
+
+def _compound_matches(element, compound, dynamic):
+    if compound['tag'] and compound['tag'] != element.tag:
+        return False
+    for name in compound['ids']:
+        if name not in element.ids and name not in dynamic:
+            return False
+    for name in compound['classes']:
+        if name not in element.classes and name not in dynamic:
+            return False
+    for name, op, value in compound['attrs']:
+        if name not in element.attrs:
+            if name in dynamic:
+                continue
+            return False
+        if op is None or name in dynamic:
+            continue
+        actual = element.attrs[name]
+        if not ((op == '=' and actual == value) or
+                (op == '~=' and value in actual.split()) or
+                (op == '|=' and (actual == value or actual.startswith(value + '-'))) or
+                (op == '^=' and actual.startswith(value)) or
+                (op == '$=' and actual.endswith(value)) or
+                (op == '*=' and value in actual)):
+            return False
+    return True
+
+
+def _matches_at(element, compounds, combinators, index, dynamic):
+    if not _compound_matches(element, compounds[index], dynamic):
+        return False
+    if index == 0:
+        return True
+    combinator = combinators[index - 1]
+    if combinator in ' >':
+        parent = element.parent
+        while parent is not None and parent.position >= 0:
+            if _matches_at(parent, compounds, combinators, index - 1, dynamic):
+                return True
+            if combinator == '>':
+                return False
+            parent = parent.parent
+        return False
+    siblings = element.parent.children
+    before = siblings[:siblings.index(element)]
+    if combinator == '+':
+        before = before[-1:]
+    return any(_matches_at(s, compounds, combinators, index - 1, dynamic) for s in before)
+
+
+def _candidates(dom, compound, dynamic):
+    """Elements that could match the rightmost compound, from the page indexes."""
+    for name in compound['ids']:
+        if name not in dynamic:
+            return dom.by_id.get(name, [])
+    for name in compound['classes']:
+        if name not in dynamic:
+            return dom.by_class.get(name, [])
+    if compound['tag']:
+        return dom.by_tag.get(compound['tag'], [])
+    return dom.elements
+
+
+def selector_matches(dom, parsed, dynamic=frozenset(), fold=None):
+    """True if parsed selector matches any element of dom (before fold, if given)."""
+    compounds, combinators = parsed
+    for element in _candidates(dom, compounds[-1], dynamic):
+        if fold is not None and element.position >= fold:
+            continue
+        if _matches_at(element, compounds, combinators, len(compounds) - 1, dynamic):
+            return True
+    return False
+
+
+# ─── Selection ───
+
+class Stylesheet:
+    """A parsed stylesheet with each selector parsed once, shared across pages."""
+
+    def __init__(self, text):
+        self.text = text
+        self.nodes = parse_css(text)
+        self.size = len(serialize(self.nodes).encode('utf-8'))
+        self._parsed = {}
+
+    def parsed(self, selector):
+        if selector not in self._parsed:
+            try:
+                self._parsed[selector] = parse_selector(selector)
+            except ValueError:
+                self._parsed[selector] = None
+        return self._parsed[selector]
+
+
+def _rule_used(sheet, node, dom, dynamic, fold):
+    for selector in node['selectors']:
+        parsed = sheet.parsed(selector)
+        # Unparseable selectors are kept; so are @page-style margin boxes
+        if parsed is None or selector_matches(dom, parsed, dynamic, fold):
+            return True
+    return False
+
+
+def _select(sheet, nodes, dom, dynamic, fold):
+    kept = []
+    for node in nodes:
+        if node['type'] == 'rule':
+            if _rule_used(sheet, node, dom, dynamic, fold):
+                kept.append(node)
+        elif node['type'] == 'group':
+            children = _select(sheet, node['children'], dom, dynamic, fold)
+            if children:
+                kept.append(dict(node, children=children))
+        else:
+            kept.append(node)
+    return kept
+
+
+def _drop_unused_keyframes(nodes, dynamic):
+    """Drop @keyframes that no kept rule (or script) refers to."""
+    text = serialize([n for n in nodes if n['type'] != 'at'])
+    kept = []
+    for node in nodes:
+        keyframes = KEYFRAMES_NAME_PATTERN.match(node['prelude']) if node['type'] == 'at' else None
+        if keyframes and not (re.search(r'(?<![\w-])' + re.escape(keyframes.group(1)) +
+                                         r'(?![\w-])', text) or keyframes.group(1) in dynamic):
+            continue
+        kept.append(node)
+    return kept
+
+
+def page_css(sheet, html, dynamic_base=frozenset()):
+    """
+    (critical, pruned) CSS text for one page. critical matches the static DOM
+    above the fold; pruned keeps every rule that may apply anywhere on the page.
+    """
+    dom = PageDom(html)
+    dynamic = set(dynamic_base) | script_names(dom.scripts)
+    pruned = _drop_unused_keyframes(_select(sheet, sheet.nodes, dom, dynamic, None), dynamic)
+    critical = _drop_unused_keyframes(_select(sheet, sheet.nodes, dom, frozenset(), dom.fold),
+                                      frozenset())
+    return serialize(critical), serialize(pruned)
+
+
+def load_script_names(root, names=SCRIPT_FILES):
+    texts = []
+    for name in names:
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+    return script_names(texts)
+
+
+# ─── Page rewriting ───
+
+def stylesheet_links(html, stylesheet=STYLESHEET):
+    """<link rel=stylesheet> matches in html that load stylesheet (any ?query)."""
+    return [m for m in STYLESHEET_LINK_PATTERN.finditer(html)
+            if m.group(1).split('?')[0].split('#')[0].lstrip('./') == stylesheet]
+
+
+def inline_critical(html, link, critical, href=None):
+    """
+    Replace one stylesheet <link> with the inlined critical CSS plus a
+    non-blocking load of the full sheet (href, default: the original one).
+    """
+    href = href or link.group(1)
+    replacement = (
+        f'<style>{critical}</style>\n'
+        f'    <link rel="preload" href="{href}" as="style" '
+        f'onload="this.onload=null;this.rel=\'stylesheet\'" />\n'
+        f'    <noscript><link rel="stylesheet" href="{href}" /></noscript>')
+    return html[:link.start()] + replacement + html[link.end():]
+
+
+def pruned_name(page, stylesheet=STYLESHEET):
+    """about.html -> style.about.css"""
+    stem, ext = os.path.splitext(stylesheet)
+    return f"{stem}.{os.path.splitext(os.path.basename(page))[0]}{ext}"
+
+
+def process_bundle(out_dir, pages, prune=False, stylesheet=STYLESHEET):
+    """
+    Inline critical CSS into every page of a built bundle that links
+    stylesheet; with prune, also write style.<page>.css per page and load
+    that instead of the full sheet. Returns (report rows, new files).
+    """
+    sheet_path = os.path.join(out_dir, stylesheet)
+    with open(sheet_path, 'r', encoding='utf-8') as f:
+        sheet = Stylesheet(f.read())
+    full_size = sheet.size
+    dynamic = load_script_names(out_dir)
+
+    rows, new_files = [], []
+    for page in pages:
+        # url()s in the sheet are relative to its own directory, so the CSS can
+        # only be inlined into pages that live next to it
+        if os.path.dirname(page) != os.path.dirname(stylesheet):
+            continue
+        path = os.path.join(out_dir, page)
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            html = f.read()
+        links = stylesheet_links(html, stylesheet)
+        if not links:
+            continue
+        critical, pruned = page_css(sheet, html, dynamic)
+        href = None
+        if prune:
+            name = pruned_name(page, stylesheet)
+            with open(os.path.join(out_dir, name), 'w', encoding='utf-8') as f:
+                f.write(pruned)
+            new_files.append(name)
+            href = os.path.basename(name)
+        html = inline_critical(html, links[0], critical, href)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(html)
+        rows.append({'page': page, 'full': full_size,
+                     'critical': len(critical.encode('utf-8')),
+                     'pruned': len(pruned.encode('utf-8'))})
+    return rows, new_files
+
+
+def print_report(rows):
+    print(f"  {'Page':<34} {'Full':>8} {'Used':>8} {'Removed':>8} {'Critical':>9}")
+    for row in rows:
+        removed = row['full'] - row['pruned']
+        print(f"  {row['page']:<34} {row['full'] / 1024:>6.0f}KB {row['pruned'] / 1024:>6.0f}KB "
+              f"{removed / 1024:>6.0f}KB {row['critical'] / 1024:>7.1f}KB")
+    if rows:
+        average = sum(row['full'] - row['pruned'] for row in rows) / len(rows)
+        print(f"\n  {len(rows)} pages, {average / 1024:.0f} KB of unused CSS per page on average.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Report per-page critical and unused CSS for style.css (writes nothing).")
+    parser.add_argument('pages', nargs='*', help="Pages to analyse (default: every *.html)")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(PROJECT_ROOT, STYLESHEET), 'r', encoding='utf-8') as f:
+        sheet = Stylesheet(f.read())
+    full_size = sheet.size
+    dynamic = load_script_names(PROJECT_ROOT)
+    pages = args.pages or sorted(os.path.basename(p) for p in glob.glob(os.path.join(PROJECT_ROOT, '*.html')))
+
+    rows = []
+    for page in pages:
+        with open(os.path.join(PROJECT_ROOT, page), 'r', encoding='utf-8') as f:
+            html = f.read()
+        if not stylesheet_links(html):
+            continue
+        critical, pruned = page_css(sheet, html, dynamic)
+        rows.append({'page': page, 'full': full_size, 'critical': len(critical.encode('utf-8')),
+                     'pruned': len(pruned.encode('utf-8'))})
+    print_report(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
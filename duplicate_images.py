@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Duplicate Image Finder
+The same shot tends to live in assets/ several times over: HEIC original, JPG
+export, .webp conversion, a .bak copy, and admin re-uploads that multer
+renamed to name-<timestamp>.ext. This tool hashes every image perceptually
+and reports clusters of near-duplicates with the copy to keep and the bytes
+the others take up.
+
+Each image gets a 64-bit dHash (gradient of a 9x8 greyscale thumbnail) and a
+64-bit pHash (low frequencies of a 32x32 DCT). Near-duplicate candidates are
+looked up by dHash Hamming distance in a BK-tree, then confirmed by pHash, so
+a re-encode or resize matches while a different photo of the same scene
+usually does not. Hashes are kept in .image_hashes.json by file size and
+mtime, so reruns only decode new or changed images.
+
+The canonical copy of a cluster is the one the site references (see
+build_deploy.reachable_files), then the one with the cleanest name (no .bak,
+no upload timestamp), the web format, and the most pixels. Sources of a kept
+.webp/.avif (same folder and name) are listed but not counted as
+reclaimable: optimize_images.py needs them.
+
+Usage:
+  python3 duplicate_images.py                 # report duplicate clusters
+  python3 duplicate_images.py --threshold 10  # looser matching
+  python3 duplicate_images.py --json dupes.json -j 4
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image, ImageOps
+
+from optimize_images import HEIC_EXTENSIONS, HEIC_SUPPORTED, file_digest, stat_key
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(PROJECT_ROOT, 'assets')
+INDEX_PATH = os.path.join(PROJECT_ROOT, '.image_hashes.json')
+INDEX_VERSION = 1
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.avif', '.gif'}
+BACKUP_SUFFIXES = ('.bak', '.orig', '.old')
+# Formats in order of preference for the copy that is kept
+FORMAT_RANK = {'.webp': 0, '.avif': 1, '.jpg': 2, '.jpeg': 2, '.png': 2, '.gif': 3,
+               '.heic': 4, '.heif': 4}
+DERIVED_EXTENSIONS = {'.webp', '.avif'}
+
+# multer's filename callback: <name>-<Date.now()>.<ext> (older uploads used '_')
+UPLOAD_TIMESTAMP_PATTERN = re.compile(r'[-_]\d{13}$')
+# Responsive widths written next to a conversion by optimize_images.variant_path
+VARIANT_PATTERN = re.compile(r'-\d+w\.(webp|avif)$', re.IGNORECASE)
+
+# Hamming distances (out of 64 bits) that still count as the same image
+DHASH_THRESHOLD = 6
+PHASH_THRESHOLD = 10
+PHASH_SIZE = 32
+PHASH_LOW = 8
+ORIENTATION_TAG = 0x0112
+
+
+# ─── Hashing ───
+
+def dhash(gray):
+    """64-bit difference hash of a greyscale image."""
+    pixels = np.asarray(gray.resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int(''.join('1' if b else '0' for b in bits), 2)
+
+
+def _dct_matrix(n):
+    k = np.arange(n)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    matrix[0] /= np.sqrt(2)
+    return matrix * np.sqrt(2 / n)
+
+
+DCT = _dct_matrix(PHASH_SIZE)
+
+
+def phash(gray):
+    """64-bit DCT hash: low-frequency coefficients above/below their median."""
+    pixels = np.asarray(gray.resize((PHASH_SIZE, PHASH_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (DCT @ pixels @ DCT.T)[:PHASH_LOW, :PHASH_LOW].flatten()
+    bits = low > np.median(low[1:])  # the DC term would skew the median
+    return int(''.join('1' if b else '0' for b in bits), 2)
+
+
+def hash_image(path):
+    """{'dhash', 'phash', 'width', 'height'} of one image file (hashes as hex)."""
+    with Image.open(path) as img:
+        width, height = img.size
+        if img.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):
+            width, height = height, width
+        img.draft('L', (PHASH_SIZE * 2, PHASH_SIZE * 2))  # JPEG: decode at a reduced scale
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ('RGBA', 'LA', 'PA', 'P'):
+            # Hash transparent images as if on white, as the page shows them
+            rgba = img.convert('RGBA')
+            img = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+            img.alpha_composite(rgba)
+        gray = img.convert('L')
+    return {'dhash': f'{dhash(gray):016x}', 'phash': f'{phash(gray):016x}',
+            'width': width, 'height': height}
+
+
+def hash_job(job):
+    """Worker: (rel_path, path) -> (rel_path, entry or None, error)."""
+    rel_path, path = job
+    try:
+        entry = hash_image(path)
+        entry['sha256'] = file_digest(path)
+        return rel_path, entry, None
+    except Exception as e:
+        return rel_path, None, f"{type(e).__name__}: {e}"
+
+
+# ─── Index ───
+
+def image_kind(name):
+    """Extension that decides how a file is read ('.jpg' for photo.jpg.bak), or None."""
+    base, ext = os.path.splitext(name.lower())
+    if ext in BACKUP_SUFFIXES:
+        ext = os.path.splitext(base)[1]
+    if ext in IMAGE_EXTENSIONS or (ext in HEIC_EXTENSIONS and HEIC_SUPPORTED):
+        return ext
+    return None
+
+
+def find_images(directory=ASSETS_DIR, root=PROJECT_ROOT):
+    """
+    Root-relative posix paths of every image (and image backup) under
+    directory, leaving out the -<width>w variants of a conversion.
+    """
+    paths = []
+    for dirpath, dirs, names in os.walk(directory):
+        dirs.sort()
+        for name in sorted(names):
+            if image_kind(name) and not VARIANT_PATTERN.search(name):
+                paths.append(os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, '/'))
+    return paths
+
+
+def load_index(path=INDEX_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index.get('images', {}) if index.get('version') == INDEX_VERSION else {}
+
+
+def save_index(images, path=INDEX_PATH):
+    """Write the hash index atomically."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'images': images}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def update_index(paths, root=PROJECT_ROOT, index_path=INDEX_PATH, workers=1):
+    """
+    Hash entries for paths, rehashing only files whose size/mtime changed.
+    Returns ({rel_path: entry} for paths, {rel_path: error}, number hashed).
+    Cached entries outside paths (an earlier scan of more of assets/) are kept
+    in the saved index unless their file is gone.
+    """
+    cached = load_index(index_path)
+    images = {}
+    jobs = []
+    for rel_path in paths:
+        path = os.path.join(root, rel_path)
+        entry = cached.get(rel_path)
+        if entry is not None and entry['stat'] == stat_key(path):
+            images[rel_path] = entry
+        else:
+            jobs.append((rel_path, path))
+
+    errors = {}
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(hash_job, jobs))
+    else:
+        results = [hash_job(job) for job in jobs]
+    for rel_path, entry, error in results:
+        if error:
+            errors[rel_path] = error
+            continue
+        entry['stat'] = stat_key(os.path.join(root, rel_path))
+        images[rel_path] = entry
+
+    kept = {rel_path: entry for rel_path, entry in cached.items()
+            if rel_path not in images and rel_path not in errors
+            and os.path.exists(os.path.join(root, rel_path))}
+    save_index({**kept, **images}, index_path)
+    return images, errors, len(jobs)
+
+
+# ─── Near-duplicate search ───
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes with Hamming distance."""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value, radius):
+        """Items whose hash is within radius of value."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                found.extend(items)
+            # Triangle inequality: only these subtrees can hold matches
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def find_clusters(images, dhash_threshold=DHASH_THRESHOLD, phash_threshold=PHASH_THRESHOLD):
+    """Groups (sorted lists of paths) of two or more near-identical images."""
+    paths = sorted(images)
+    tree = BKTree()
+    for path in paths:
+        tree.add(int(images[path]['dhash'], 16), path)
+
+    parent = {path: path for path in paths}
+
+    def find(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    for path in paths:
+        entry = images[path]
+        for other in tree.search(int(entry['dhash'], 16), dhash_threshold):
+            if other == path:
+                continue
+            same_bytes = images[other]['sha256'] == entry['sha256']
+            if same_bytes or hamming(int(images[other]['phash'], 16),
+                                     int(entry['phash'], 16)) <= phash_threshold:
+                parent[find(other)] = find(path)
+
+    groups = {}
+    for path in paths:
+        groups.setdefault(find(path), []).append(path)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+# ─── Report ───
+
+def name_flags(path):
+    """Reasons a file name looks like a copy rather than the original."""
+    name = os.path.basename(path)
+    flags = []
+    if os.path.splitext(name)[1].lower() in BACKUP_SUFFIXES:
+        flags.append('backup')
+        name = os.path.splitext(name)[0]
+    if UPLOAD_TIMESTAMP_PATTERN.search(os.path.splitext(name)[0]):
+        flags.append('upload copy')
+    return flags
+
+
+def choose_canonical(group, images, referenced):
+    def rank(path):
+        entry = images[path]
+        return (path not in referenced, len(name_flags(path)),
+                FORMAT_RANK.get(image_kind(os.path.basename(path)), 9),
+                -entry['width'] * entry['height'], len(path), path)
+    return min(group, key=rank)
+
+
+def describe_cluster(group, images, referenced, root=PROJECT_ROOT):
+    """
+    {'canonical', 'members': [{'path', 'bytes', 'role'}], 'reclaimable'} where
+    role is canonical / referenced / source / duplicate; only duplicates count
+    toward reclaimable bytes.
+    """
+    canonical = choose_canonical(group, images, referenced)
+    kept = {canonical} | (set(group) & referenced)
+    # Same folder and stem as a kept .webp/.avif: the file optimize_images converts from
+    kept_stems = {os.path.splitext(p)[0] for p in kept
+                  if os.path.splitext(p)[1].lower() in DERIVED_EXTENSIONS}
+    members = []
+    for path in group:
+        if path == canonical:
+            role = 'canonical'
+        elif path in referenced:
+            role = 'referenced'
+        elif (os.path.splitext(path)[0] in kept_stems and not name_flags(path)
+              and os.path.splitext(path)[1].lower() not in DERIVED_EXTENSIONS):
+            role = 'source'
+        else:
+            role = 'duplicate'
+        members.append({'path': path, 'bytes': os.path.getsize(os.path.join(root, path)),
+                        'role': role, 'flags': name_flags(path),
+                        'size': [images[path]['width'], images[path]['height']]})
+    return {'canonical': canonical, 'members': members,
+            'reclaimable': sum(m['bytes'] for m in members if m['role'] == 'duplicate')}
+
+
+def format_size(size):
+    return f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+
+def print_clusters(clusters):
+    for number, cluster in enumerate(clusters, 1):
+        print(f"\n  Cluster {number}: {len(cluster['members'])} files, "
+              f"{format_size(cluster['reclaimable'])} reclaimable")
+        for member in cluster['members']:
+            mark = '★' if member['role'] == 'canonical' else ' '
+            notes = [member['role']] + member['flags']
+            print(f"    {mark} {member['path']} ({member['size'][0]}x{member['size'][1]}, "
+                  f"{format_size(member['bytes'])}; {', '.join(notes)})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find near-duplicate images in assets/.")
+    parser.add_argument('directory', nargs='?', default=ASSETS_DIR, help="Folder to scan (default: assets)")
+    parser.add_argument('--threshold', type=int, default=DHASH_THRESHOLD,
+                        help=f"Max dHash distance in bits (default: {DHASH_THRESHOLD})")
+    parser.add_argument('--phash-threshold', type=int, default=PHASH_THRESHOLD,
+                        help=f"Max pHash distance in bits (default: {PHASH_THRESHOLD})")
+    parser.add_argument('--json', metavar='FILE', help="Also write the clusters as JSON")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Worker processes for hashing (0 = one per CPU core). Default: 1")
+    args = parser.parse_args(argv)
+
+    # Imported here: the reachability walk is only needed for the report
+    from build_deploy import reachable_files
+
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    paths = find_images(args.directory)
+    images, errors, hashed = update_index(paths, workers=workers)
+    print(f"Indexed {len(images)} images ({hashed} hashed, {len(images) - hashed + len(errors)} cached).")
+    for path, error in sorted(errors.items()):
+        print(f"  ✗ {path}: {error}")
+
+    referenced = reachable_files(PROJECT_ROOT)
+    clusters = [describe_cluster(group, images, referenced)
+                for group in find_clusters(images, args.threshold, args.phash_threshold)]
+    clusters.sort(key=lambda c: (-c['reclaimable'], c['canonical']))
+    print_clusters(clusters)
+
+    total = sum(c['reclaimable'] for c in clusters)
+    print(f"\n  {len(clusters)} duplicate clusters, {format_size(total)} reclaimable.")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(clusters, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - External Link Checker
+Verifies http/https links found in the HTML pages and in data/*.json with
+asyncio: keep-alive connections are pooled per host, concurrency is capped
+per host and overall, HEAD is tried first with a GET fallback, and results
+are kept in an on-disk cache with TTLs so repeat runs only re-probe entries
+that have gone stale.
+
+Standard library only (asyncio streams + a minimal HTTP/1.1 client).
+
+Usage:
+  python3 external_links.py                 # pages + data/*.json in the project
+  python3 external_links.py --refresh       # ignore the cache
+  python3 link_checker_v2.py --external     # as part of the full link check
+"""
+
+import os
+import ssl
+import sys
+import json
+import time
+import asyncio
+import argparse
+from urllib.parse import urlsplit, urljoin, quote
+
+from link_checker_v2 import find_pages, parse_file
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(PROJECT_ROOT, '.external_links_cache.json')
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+# Cache lifetimes: working links are re-probed weekly, failures daily
+TTL_OK = 7 * 24 * 3600
+TTL_BROKEN = 24 * 3600
+
+PER_HOST_CONCURRENCY = 4
+TOTAL_CONCURRENCY = 32
+REQUEST_TIMEOUT = 15
+MAX_REDIRECTS = 5
+USER_AGENT = 'YOLO-Link-Checker/1.0 (+https://theyolocollective.com)'
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Statuses that say "try again later" rather than "broken"; never cached
+RETRY_LATER_STATUSES = {429, 503}
+
+
+class HostPool:
+    """
+    Pooled keep-alive HTTP/1.1 connections, one pool and one semaphore per
+    (scheme, host, port).
+    """
+
+    def __init__(self, per_host=PER_HOST_CONCURRENCY, total=TOTAL_CONCURRENCY,
+                 timeout=REQUEST_TIMEOUT, ssl_context=None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._total = asyncio.Semaphore(total)
+        self._host_limits = {}
+        self._idle = {}
+
+    def _limit(self, key):
+        if key not in self._host_limits:
+            self._host_limits[key] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[key]
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        if scheme == 'https':
+            return await asyncio.open_connection(host, port, ssl=self.ssl_context,
+                                                 server_hostname=host)
+        return await asyncio.open_connection(host, port)
+
+    @staticmethod
+    async def _read_head(reader):
+        """Status code and lower-cased headers of one response."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before response")
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise ConnectionError(f"malformed status line: {status_line[:80]!r}")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return int(parts[1]), headers
+
+    async def request(self, method, url):
+        """
+        Send one request and return (status, headers). Only the response head
+        is read: HEAD connections go back to the pool, GET connections are
+        closed instead of downloading the body.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        # The request line must be ASCII: percent-encode spaces and non-ASCII
+        # characters, leaving existing escapes and URL delimiters alone
+        target = quote((parts.path or '/') + (f'?{parts.query}' if parts.query else ''),
+                       safe="/%?=&:;@+,!$'()*~")
+        hostname = parts.hostname.encode('idna').decode('ascii')
+        host_header = hostname if parts.port is None else f'{hostname}:{port}'
+        payload = (f'{method} {target} HTTP/1.1\r\n'
+                   f'Host: {host_header}\r\n'
+                   f'User-Agent: {USER_AGENT}\r\n'
+                   'Accept: */*\r\n'
+                   'Connection: keep-alive\r\n\r\n').encode('latin-1')
+
+        async with self._limit(key), self._total:
+            idle = self._idle.setdefault(key, [])
+            # A pooled connection may have been closed by the server; retry
+            # once on a fresh one before giving up.
+            for reused in ([True, False] if idle else [False]):
+                reader, writer = idle.pop() if reused and idle else await asyncio.wait_for(
+                    self._connect(key), self.timeout)
+                try:
+                    writer.write(payload)
+                    await writer.drain()
+                    status, headers = await asyncio.wait_for(self._read_head(reader), self.timeout)
+                except (OSError, ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        continue
+                    raise
+                keep = (method == 'HEAD' and headers.get('connection', '').lower() != 'close')
+                if keep:
+                    idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, headers
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def probe(pool, url):
+    """
+    Check one URL: HEAD first, GET if HEAD fails or is refused, following
+    redirects. Returns a cache entry dict.
+    """
+    entry = {'url': url, 'status': None, 'ok': False, 'error': None, 'final_url': url}
+    for method in ('HEAD', 'GET'):
+        current = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, headers = await pool.request(method, current)
+                if status in REDIRECT_STATUSES and headers.get('location'):
+                    current = urljoin(current, headers['location'])
+                    continue
+                break
+            else:
+                entry.update(status=status, error='too many redirects', final_url=current)
+                continue
+        except (OSError, ConnectionError, asyncio.TimeoutError,
+                asyncio.IncompleteReadError, ValueError) as e:
+            entry.update(status=None, error=f"{type(e).__name__}: {e}".rstrip(': '))
+            continue
+        entry.update(status=status, ok=status < 400, error=None, final_url=current)
+        if entry['ok']:
+            break
+    entry['checked'] = time.time()
+    return entry
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_PATH):
+    """Write the cache atomically."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_fresh(entry, now):
+    ttl = TTL_OK if entry.get('ok') else TTL_BROKEN
+    return now - entry.get('checked', 0) < ttl
+
+
+async def check_urls_async(urls, cache, refresh=False, per_host=PER_HOST_CONCURRENCY,
+                           total=TOTAL_CONCURRENCY, timeout=REQUEST_TIMEOUT, ssl_context=None):
+    """Probe every URL whose cache entry is missing or stale; updates cache in place."""
+    now = time.time()
+    stale = sorted({url for url in urls if refresh or url not in cache or not is_fresh(cache[url], now)})
+    pool = HostPool(per_host, total, timeout, ssl_context)
+    try:
+        entries = await asyncio.gather(*(probe(pool, url) for url in stale))
+    finally:
+        await pool.close()
+    for entry in entries:
+        if entry['status'] in RETRY_LATER_STATUSES:
+            cache.pop(entry['url'], None)
+        else:
+            cache[entry['url']] = entry
+    return {url: cache.get(url) for url in urls}, len(stale)
+
+
+def check_urls(urls, cache_path=CACHE_PATH, refresh=False, **options):
+    """
+    Synchronous entry point: returns ({url: entry or None}, probed_count).
+    An entry is None when the host asked us to retry later (429/503).
+    URLs no longer in urls (removed from the site) are dropped from the cache.
+    """
+    cache = load_cache(cache_path)
+    results, probed = asyncio.run(check_urls_async(urls, cache, refresh, **options))
+    wanted = set(urls)
+    save_cache({url: entry for url, entry in cache.items() if url in wanted}, cache_path)
+    return results, probed
+
+
+def json_urls(value):
+    """Every http(s) string anywhere inside a parsed JSON value."""
+    if isinstance(value, str):
+        return [value] if value.startswith(('http://', 'https://')) else []
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [url for item in value for url in json_urls(item)]
+    return []
+
+
+def collect_external_urls(directory, recursive=False):
+    """{url: [where it is used]} from the HTML pages and data/*.json files."""
+    used = {}
+    for page in find_pages(directory, recursive):
+        for _, url in parse_file(os.path.join(directory, page))['references']:
+            if url.strip().startswith(('http://', 'https://')):
+                used.setdefault(url.strip(), []).append(page)
+
+    data_dir = os.path.join(directory, 'data')
+    if os.path.isdir(data_dir):
+        for name in sorted(os.listdir(data_dir)):
+            if not name.endswith('.json'):
+                continue
+            with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for url in json_urls(data):
+                used.setdefault(url, []).append(f'data/{name}')
+    return used
+
+
+def report(results, used):
+    """Print broken / unverified links; returns the number of broken ones."""
+    broken = 0
+    for url in sorted(results):
+        entry = results[url]
+        where = ', '.join(sorted(set(used.get(url, []))))
+        if entry is None:
+            print(f"  ? {url} (rate limited, retry later) [{where}]")
+        elif not entry['ok']:
+            broken += 1
+            reason = entry['error'] or f"HTTP {entry['status']}"
+            print(f"  ✗ {url}: {reason} [{where}]")
+    return broken
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check external http(s) links with a TTL cache.")
+    parser.add_argument('directory', nargs='?', default=PROJECT_ROOT)
+    parser.add_argument('-r', '--recursive', action='store_true')
+    parser.add_argument('--refresh', action='store_true', help="Ignore cached results")
+    parser.add_argument('--per-host', type=int, default=PER_HOST_CONCURRENCY)
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    used = collect_external_urls(args.directory, args.recursive)
+    print(f"Found {len(used)} external URLs.")
+    results, probed = check_urls(list(used), refresh=args.refresh,
+                                 per_host=args.per_host, timeout=args.timeout)
+    print(f"Probed {probed}, {len(used) - probed} answered from cache.\n")
+    broken = report(results, used)
+    print(f"\n  {broken} broken external links.")
+    return 1 if broken else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,37 +1,13 @@
-from PIL import Image
+from logo_tools import process_file
 import os
 
 def fix_logo_transparency(input_path, output_path):
     print(f"Processing: {input_path}")
     try:
-        img = Image.open(input_path).convert("RGBA")
-        datas = img.getdata()
-
-        newData = []
-        
-        # Thresholds
-        # White is (255, 255, 255)
-        # Greys in checkerboards are often around (204, 204, 204) to (240, 240, 240)
-        # We'll target anything that is neutral (r~=g~=b) and high brightness
-        
-        for item in datas:
-            r, g, b, a = item
-            
-            # Check for pure white or near white
-            if r > 240 and g > 240 and b > 240:
-                newData.append((255, 255, 255, 0))
-                continue
-                
-            # Check for grey checkerboard squares
-            # They are usually neutral grey
-            if (abs(r-g) < 15 and abs(g-b) < 15 and abs(r-b) < 15) and (r > 190 and g > 190 and b > 190):
-                 newData.append((255, 255, 255, 0))
-                 continue
-
-            newData.append(item)
-
-        img.putdata(newData)
-        img.save(output_path, "WEBP")
+        # Near white (r, g, b > 240) and neutral grey checkerboard squares
+        # (r, g, b > 190 and within 15 of each other) become transparent.
+        process_file('checkerboard', input_path, output_path, 'WEBP',
+                     white_threshold=240, grey_threshold=190, max_spread=15)
         print(f"Successfully saved transparent logo to {output_path}")
 
     except Exception as e:
@@ -1,24 +1,9 @@
-from PIL import Image
+from logo_tools import process_file
 
 def make_transparent(input_path, output_path):
     try:
-        img = Image.open(input_path).convert("RGBA")
-        datas = img.getdata()
-
-        newData = []
         # tolerance for "white-ish" or "light grey" background
-        threshold = 200
-
-        for item in datas:
-            # item is (R, G, B, A)
-            if item[0] > threshold and item[1] > threshold and item[2] > threshold:
-                # Make transparent
-                newData.append((255, 255, 255, 0))
-            else:
-                newData.append(item)
-
-        img.putdata(newData)
-        img.save(output_path, "PNG")
+        process_file('white', input_path, output_path, 'PNG', threshold=200)
         print(f"Saved transparent image to {output_path}")
 
     except Exception as e:
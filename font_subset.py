@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Font Subsetting
+The bundled Inter and Outfit woff2 files carry every glyph of their Google
+Fonts unicode-range slice, while the site only uses Latin text and a few
+symbols (₹, ▼, em dashes). This stage collects the characters the bundle can
+actually render, subsets every @font-face font in style.css down to them and
+rewrites the rules:
+
+  - src points at the subset file and unicode-range lists exactly the kept
+    characters, so the browser still knows which face to fetch for what
+  - faces none of whose characters are used are removed with their file
+  - faces that share a source file (the variable fonts are shipped once per
+    weight) and end up with the same characters share one subset file
+
+Characters come from the pages' text and rendered attributes (alt,
+placeholder, value), string literals in JS, every string in the JSON data and
+CSS content: values, in both upper and lower case (text-transform), plus
+printable ASCII so dynamic text never falls back to a system font. The set is
+computed over the whole site rather than per family and weight, because which
+face renders a text node depends on the cascade.
+
+Needs: pip install fonttools brotli (without them fonts are shipped in full).
+
+Usage:
+  python3 font_subset.py            # report what subsetting would save
+  python3 build_deploy.py           # runs this as part of the build
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+# fontTools is optional: pip install fonttools brotli (brotli writes woff2)
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+    import brotli  # noqa: F401
+except ImportError:
+    ft_subset = None
+
+from critical_css import JS_STRING_PATTERN, STYLESHEET
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Always kept: printable ASCII, no-break space, and the replacement glyph
+BASE_CODEPOINTS = set(range(0x20, 0x7F)) | {0xA0, 0xFFFD}
+TEXT_EXTENSIONS = {'.html', '.js', '.json'}
+RENDERED_ATTRIBUTES = {'alt', 'placeholder', 'value'}
+SKIPPED_TAGS = {'script', 'style'}
+EXCLUDED_DIRS = {'.git', 'node_modules', 'deploy_build', 'dist', 'admin', '__pycache__'}
+
+FONT_FACE_PATTERN = re.compile(r'@font-face\s*\{([^}]*)\}', re.IGNORECASE)
+URL_PATTERN = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+CONTENT_PATTERN = re.compile(r'''content\s*:\s*(['"])((?:\\.|(?!\1).)*)\1''')
+JS_ESCAPE_PATTERN = re.compile(r'\\u\{([0-9a-fA-F]+)\}|\\u([0-9a-fA-F]{4})|\\x([0-9a-fA-F]{2})')
+CSS_ESCAPE_PATTERN = re.compile(r'\\([0-9a-fA-F]{1,6})\s?')
+RANGE_PATTERN = re.compile(r'U\+([0-9A-F?]+)(?:-([0-9A-F]+))?', re.IGNORECASE)
+
+
+class TextCollector(HTMLParser):
+    """Characters a page can render: text outside <script>/<style> and rendered attributes."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chars = set()
+        self.scripts = []
+        self._skip = None
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if name in RENDERED_ATTRIBUTES and value:
+                self.chars.update(value)
+        if tag in SKIPPED_TAGS:
+            self._skip = tag
+
+    def handle_endtag(self, tag):
+        if tag == self._skip:
+            self._skip = None
+
+    def handle_data(self, data):
+        if self._skip == 'script':
+            self.scripts.append(data)
+        elif self._skip is None:
+            self.chars.update(data)
+
+
+def js_string_chars(text):
+    """Characters of the string literals in a script, with \\u escapes decoded."""
+    chars = set()
+    for match in JS_STRING_PATTERN.finditer(text):
+        if match.group(2) is None:
+            continue
+        literal = JS_ESCAPE_PATTERN.sub(
+            lambda m: chr(int(m.group(1) or m.group(2) or m.group(3), 16)), match.group(2))
+        chars.update(literal)
+    return chars
+
+
+def json_chars(value):
+    chars = set()
+    if isinstance(value, str):
+        chars.update(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            chars |= json_chars(item)
+    elif isinstance(value, list):
+        for item in value:
+            chars |= json_chars(item)
+    return chars
+
+
+def css_content_chars(css):
+    chars = set()
+    for match in CONTENT_PATTERN.finditer(css):
+        chars.update(CSS_ESCAPE_PATTERN.sub(lambda m: chr(int(m.group(1), 16)), match.group(2)))
+    return chars
+
+
+def text_files(root):
+    for dirpath, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS and not d.startswith('.'))
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() in TEXT_EXTENSIONS:
+                yield os.path.join(dirpath, name)
+
+
+def used_codepoints(root, css):
+    """Every codepoint the site under root can render, case variants included."""
+    chars = css_content_chars(css)
+    for path in text_files(root):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.html':
+            collector = TextCollector()
+            collector.feed(text)
+            chars |= collector.chars
+            for script in collector.scripts:
+                chars |= js_string_chars(script)
+        elif ext == '.js':
+            chars |= js_string_chars(text)
+        else:
+            try:
+                chars |= json_chars(json.loads(text))
+            except ValueError:
+                pass
+    codepoints = set(BASE_CODEPOINTS)
+    for char in chars:
+        for variant in {char, char.upper(), char.lower()}:
+            codepoints.update(ord(c) for c in variant)
+    return {cp for cp in codepoints if cp >= 0x20}
+
+
+def parse_unicode_range(value):
+    """'U+0000-00FF, U+0131, U+4??' -> set of codepoints (None = everything)."""
+    if not value:
+        return None
+    codepoints = set()
+    for match in RANGE_PATTERN.finditer(value):
+        start, end = match.group(1), match.group(2)
+        if '?' in start:
+            start, end = start.replace('?', '0'), start.replace('?', 'F')
+        codepoints.update(range(int(start, 16), int(end or start, 16) + 1))
+    return codepoints
+
+
+def format_unicode_range(codepoints):
+    """Sorted codepoints -> 'U+20-7E,U+A0,...' (compact ranges)."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ','.join(f'U+{a:X}' if a == b else f'U+{a:X}-{b:X}' for a, b in ranges)
+
+
+def parse_font_faces(css):
+    """[{'span', 'declarations': {name: value}, 'url'}] for each @font-face rule."""
+    faces = []
+    for match in FONT_FACE_PATTERN.finditer(css):
+        declarations = {}
+        for declaration in match.group(1).split(';'):
+            name, sep, value = declaration.partition(':')
+            if sep:
+                declarations[name.strip().lower()] = ' '.join(value.split())
+        urls = URL_PATTERN.findall(declarations.get('src', ''))
+        faces.append({'span': match.span(), 'declarations': declarations,
+                      'url': unquote(urls[0][1]).split('?')[0].split('#')[0] if urls else None})
+    return faces
+
+
+def subset_font(data, codepoints):
+    """woff2 bytes of the font in data, reduced to codepoints."""
+    font = TTFont(io.BytesIO(data))
+    options = ft_subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']  # keep kerning, ligatures, tabular figures
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    font.flavor = 'woff2'
+    font.save(buffer)
+    return buffer.getvalue()
+
+
+def font_face_rule(declarations):
+    return '@font-face{' + ';'.join(f'{name}:{value}' for name, value in declarations.items()) + '}'
+
+
+def plan_subsets(css, css_dir, used):
+    """
+    Work out every face's subset without writing anything. Returns a list of
+    rows: {'face', 'path', 'codepoints', 'original', 'subset', 'data',
+    'shared_with'} where data is None for dropped faces and shared_with names
+    the face path whose identical subset this one reuses.
+    """
+    rows = []
+    made = {}
+    for face in parse_font_faces(css):
+        if not face['url'] or '://' in face['url']:
+            continue
+        path = os.path.normpath(os.path.join(css_dir, face['url']))
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        cmap = set(TTFont(io.BytesIO(data)).getBestCmap())
+        declared = parse_unicode_range(face['declarations'].get('unicode-range'))
+        codepoints = used & cmap & (declared if declared is not None else cmap)
+        row = {'face': face, 'path': path, 'codepoints': codepoints,
+               'original': len(data), 'subset': 0, 'data': None, 'shared_with': None}
+        if codepoints:
+            key = (hashlib.sha256(data).hexdigest(), frozenset(codepoints))
+            if key in made:
+                row['shared_with'] = made[key]['path']
+            else:
+                row['data'] = subset_font(data, codepoints)
+                row['subset'] = len(row['data'])
+                made[key] = row
+        rows.append(row)
+    return rows
+
+
+def subset_stylesheet(out_dir, stylesheet=STYLESHEET):
+    """
+    Subset the fonts of out_dir/stylesheet in place and rewrite its
+    @font-face rules. Returns (rows, removed files as out_dir-relative posix
+    paths); rows is None when fontTools is not installed.
+    """
+    css_path = os.path.join(out_dir, stylesheet)
+    if ft_subset is None or not os.path.exists(css_path):
+        return None, []
+    with open(css_path, 'r', encoding='utf-8') as f:
+        css = f.read()
+    rows = plan_subsets(css, os.path.dirname(css_path), used_codepoints(out_dir, css))
+
+    removed = set()
+    by_span = {}
+    for row in rows:
+        face = row['face']
+        if row['data'] is not None:
+            with open(row['path'], 'wb') as f:
+                f.write(row['data'])
+        else:
+            removed.add(row['path'])
+        if not row['codepoints']:
+            by_span[face['span']] = ''
+            continue
+        declarations = dict(face['declarations'])
+        if row['shared_with']:
+            url = os.path.relpath(row['shared_with'], os.path.dirname(css_path)).replace(os.sep, '/')
+            declarations['src'] = f"url('{url}') format('woff2')"
+        declarations['unicode-range'] = format_unicode_range(row['codepoints'])
+        by_span[face['span']] = font_face_rule(declarations)
+
+    for (start, end), replacement in sorted(by_span.items(), reverse=True):
+        css = css[:start] + replacement + css[end:]
+    with open(css_path, 'w', encoding='utf-8') as f:
+        f.write(css)
+
+    # A file stays if any face still uses it directly
+    kept = {row['path'] for row in rows if row['data'] is not None}
+    removed -= kept
+    for path in removed:
+        os.remove(path)
+    return rows, sorted(os.path.relpath(p, out_dir).replace(os.sep, '/') for p in removed)
+
+
+def print_report(rows, root):
+    original = sum(row['original'] for row in rows)
+    shipped = sum(row['subset'] for row in rows)
+    for row in rows:
+        face = row['face']['declarations']
+        name = f"{face.get('font-family', '?').strip(chr(39) + chr(34))} {face.get('font-weight', '')}"
+        rel_path = os.path.relpath(row['path'], root)
+        if not row['codepoints']:
+            status = "dropped (no characters used)"
+        elif row['shared_with']:
+            status = f"shares {os.path.basename(row['shared_with'])}"
+        else:
+            status = f"{row['subset'] / 1024:.1f} KB"
+        print(f"  {name:<12} {rel_path:<40} {row['original'] / 1024:6.1f} KB -> {status}"
+              f" ({len(row['codepoints'])} chars)")
+    if original:
+        print(f"  Fonts: {original / 1024:.0f} KB -> {shipped / 1024:.0f} KB "
+              f"({(1 - shipped / original) * 100:.0f}% smaller)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the savings of subsetting the site fonts.")
+    parser.add_argument('--chars', action='store_true', help="Also print the characters kept")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(PROJECT_ROOT, STYLESHEET), 'r', encoding='utf-8') as f:
+        css = f.read()
+    used = used_codepoints(PROJECT_ROOT, css)
+    print(f"  {len(used)} distinct characters used across the site.")
+    if args.chars:
+        print('  ' + ''.join(chr(cp) for cp in sorted(used) if cp > 0x7E))
+    if ft_subset is None:
+        print("  ! fontTools not installed (pip install fonttools brotli)")
+        return 1
+    print_report(plan_subsets(css, PROJECT_ROOT, used), PROJECT_ROOT)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
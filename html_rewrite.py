@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - HTML Rewrite Engine
+Applies a chain of registered transforms to the site's HTML pages in a single
+pass: each page is read once, run through every transform in order, and
+written back atomically only when its content changed. CRLF pages keep their
+line endings. Pages are processed in parallel with -j.
+
+A chain is a list of (transform name, params) pairs, so it can be sent to
+worker processes; transforms are plain functions content -> content
+registered in TRANSFORMS.
+
+Transforms:
+  replace-text     literal text replacement
+  regex-replace    re.sub over the whole page
+  remove-dropdown  drop a nav <li> dropdown by the href of its toggle link
+  hoist-nav-item   move a nav link out of its dropdown, to just before it
+  webp-references  assets/... .jpg/.png references -> .webp, plus srcset
+                   (used by optimize_images.py)
+  img-attributes   width/height from an image dimension index, decoding,
+                   loading="lazy" below the fold, fetchpriority on the hero
+                   (used by image_dimensions.py)
+  lqip             blurred placeholder as the <img> background while it loads
+                   (used by build_deploy.py, see placeholders.py)
+
+Usage:
+  python3 html_rewrite.py --replace "Adventure Awaits" "Inside YOLO" --dry-run
+  python3 html_rewrite.py --remove-dropdown "#brands" -j 4
+  python3 html_rewrite.py about.html --hoist-nav-item blog.html Blogs
+"""
+
+import os
+import re
+import sys
+import glob
+import shutil
+import difflib
+import argparse
+import tempfile
+from urllib.parse import unquote
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+LI_TAG_PATTERN = re.compile(r'<li\b[^>]*>|</li\s*>', re.IGNORECASE)
+TOGGLE_PATTERN = re.compile(r'\s*<a\b[^>]*>([^<]*)', re.IGNORECASE)
+
+# Image reference rewriting (webp-references)
+WEBP_SOURCE_PATTERN = re.compile(
+    r'(assets/(?:images|icons)/[^"\'>\s]+?)\.(jpg|jpeg|png|JPG|JPEG|PNG)',
+    re.IGNORECASE
+)
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_SRC_PATTERN = re.compile(r'(\ssrc=(["\']))([^"\']+)\2', re.IGNORECASE)
+SRCSET_ATTR_PATTERN = re.compile(r'\ssrcset=', re.IGNORECASE)
+# <picture> elements are hand-authored art direction (or our own AVIF wrapper);
+# <img> tags inside them are left alone.
+PICTURE_PATTERN = re.compile(r'<picture\b.*?</picture>', re.IGNORECASE | re.DOTALL)
+DEFAULT_SIZES = '100vw'
+
+# img-attributes: images before this many <section>s have started are above
+# the fold (eager); on pages with fewer sections only the hero image is.
+FOLD_SECTIONS = 1
+SCRIPT_BLOCK_PATTERN = re.compile(r'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+SECTION_START_PATTERN = re.compile(r'<section\b', re.IGNORECASE)
+HERO_START_PATTERN = re.compile(r'<main\b|</header\s*>', re.IGNORECASE)
+
+
+# ─── Nav helpers ───
+
+def _li_spans(content):
+    """(start, end) of every <li>...</li> element, end just past </li>."""
+    spans, stack = [], []
+    for match in LI_TAG_PATTERN.finditer(content):
+        if match.group(0).startswith('</'):
+            if stack:
+                spans.append((stack.pop(), match.end()))
+        else:
+            stack.append(match.start())
+    return sorted(spans)
+
+
+def _line_bounds(content, start, end):
+    """
+    Widen [start, end) to whole lines when the element sits on its own lines,
+    so removing it leaves no blank line behind.
+    """
+    line_start = content.rfind('\n', 0, start) + 1
+    line_end = content.find('\n', end)
+    line_end = len(content) if line_end == -1 else line_end + 1
+    if content[line_start:start].strip() or content[end:line_end].strip():
+        return start, end
+    return line_start, line_end
+
+
+def _indent(content, start):
+    line_start = content.rfind('\n', 0, start) + 1
+    return content[line_start:start] if not content[line_start:start].strip() else ''
+
+
+# ─── Transforms ───
+
+def replace_text(content, old, new):
+    """Replace every occurrence of old with new."""
+    return content.replace(old, new)
+
+
+def regex_replace(content, pattern, repl, flags=0):
+    """re.sub(pattern, repl) over the whole page."""
+    return re.sub(pattern, repl, content, flags=flags)
+
+
+def remove_dropdown(content, href):
+    """Remove every <li> whose first child is the toggle link <a href="href">."""
+    toggle = re.compile(r'\s*<a\s+href="' + re.escape(href) + r'"', re.IGNORECASE)
+    for start, end in reversed(_li_spans(content)):
+        open_end = content.index('>', start) + 1
+        if toggle.match(content, open_end):
+            start, end = _line_bounds(content, start, end)
+            content = content[:start] + content[end:]
+    return content
+
+
+def _toggle_text(content, li_start):
+    """Text of the toggle link that opens the dropdown <li> at li_start."""
+    match = TOGGLE_PATTERN.match(content, content.index('>', li_start) + 1)
+    return match.group(1) if match else ''
+
+
+def hoist_nav_item(content, href, label=None, menu=None):
+    """
+    Move every <li><a href="href">...</a></li> that sits inside a dropdown
+    (desktop .dropdown-menu or mobile .mobile-sub-menu) out of it, to just
+    before the dropdown's <li>, optionally renaming the link text. With menu,
+    only dropdowns whose toggle text contains menu are touched.
+    """
+    item_pattern = re.compile(r'<li><a href="' + re.escape(href) + r'">([^<]*)</a></li>')
+    while True:
+        spans = _li_spans(content)
+        for item in item_pattern.finditer(content):
+            parents = [(s, e) for s, e in spans if s < item.start() and e >= item.end()]
+            if parents and (menu is None or menu in _toggle_text(content, max(parents)[0])):
+                break
+        else:
+            return content
+
+        parent_start = max(parents)[0]
+        text = label if label is not None else item.group(1)
+        indent = _indent(content, parent_start)
+        start, end = _line_bounds(content, item.start(), item.end())
+        content = content[:start] + content[end:]
+        moved = f'<li><a href="{href}">{text}</a></li>\n{indent}'
+        content = content[:parent_start] + moved + content[parent_start:]
+
+
+def add_srcset(content, srcset_index, default_sizes=DEFAULT_SIZES):
+    """
+    Add srcset/sizes to every <img> whose src has generated variants, and wrap
+    it in <picture> with an AVIF <source> when an AVIF copy exists. Images
+    already inside a <picture> are left to the author.
+    """
+    picture_spans = [m.span() for m in PICTURE_PATTERN.finditer(content)]
+
+    def replace_tag(match):
+        tag = match.group(0)
+        if any(start <= match.start() < end for start, end in picture_spans):
+            return tag
+        src_match = IMG_SRC_PATTERN.search(tag)
+        if not src_match:
+            return tag
+        src = src_match.group(3)
+        path = unquote(src.split('?')[0].split('#')[0])
+        sets = srcset_index.get(path.lstrip('/').removeprefix('./'))
+        if not sets:
+            return tag
+
+        def rooted(srcset):
+            if src.startswith('/'):
+                return ', '.join('/' + c for c in srcset.split(', '))
+            return srcset
+
+        quote = src_match.group(2)
+        sizes_match = re.search(r'\ssizes=(["\'])([^"\']*)\1', tag, re.IGNORECASE)
+        sizes = sizes_match.group(2) if sizes_match else default_sizes
+        if sets['srcset'] and not SRCSET_ATTR_PATTERN.search(tag):
+            attrs = f' srcset={quote}{rooted(sets["srcset"])}{quote}'
+            if not sizes_match:
+                attrs += f' sizes={quote}{sizes}{quote}'
+            tag = tag[:src_match.end()] + attrs + tag[src_match.end():]
+        if sets['avif_srcset']:
+            source = (f'<source type="image/avif" srcset="{rooted(sets["avif_srcset"])}"'
+                      f' sizes="{sizes}">')
+            tag = f'<picture>{source}{tag}</picture>'
+        return tag
+
+    return IMG_TAG_PATTERN.sub(replace_tag, content)
+
+
+def webp_references(content, skip_files=(), srcset_index=None):
+    """
+    Point assets/images and assets/icons JPG/PNG references at their .webp
+    conversions (except files named in skip_files), then add srcset.
+    """
+    def replace_ref(match):
+        full_path = match.group(1)
+        if os.path.basename(full_path) + '.' + match.group(2) in skip_files:
+            return match.group(0)
+        return full_path + '.webp'
+
+    content = WEBP_SOURCE_PATTERN.sub(replace_ref, content)
+    if srcset_index:
+        content = add_srcset(content, srcset_index)
+    return content
+
+
+def _has_attr(tag, name):
+    return re.search(r'\s' + name + r'\s*=', tag, re.IGNORECASE) is not None
+
+
+def _add_attrs(tag, attrs):
+    """Insert ' name="value"' pairs before the closing > or />."""
+    if not attrs:
+        return tag
+    close = '/>' if tag.endswith('/>') else '>'
+    head = tag[:-len(close)].rstrip()
+    gap = tag[len(head):-len(close)]
+    # Keep a closing /> or > that sits on its own line where it was
+    if '\n' not in gap:
+        gap = ' ' if close == '/>' else ''
+    return head + ''.join(f' {name}="{value}"' for name, value in attrs) + gap + close
+
+
+def img_attributes(content, dimensions):
+    """
+    Stamp every <img> outside <script> blocks with:
+      - width/height from dimensions ({site path: [w, h]}) when it has neither,
+      - decoding="async",
+      - loading="lazy" when it is below the fold,
+      - fetchpriority="high" on the hero image (the first image after the
+        header, above the fold) unless the page already has one.
+    Attributes the author already set are never changed, except that a
+    loading="lazy" on the hero image is removed.
+    """
+    scripts = [m.span() for m in SCRIPT_BLOCK_PATTERN.finditer(content)]
+    sections = [m.start() for m in SECTION_START_PATTERN.finditer(content)]
+    fold = sections[FOLD_SECTIONS] if len(sections) > FOLD_SECTIONS else None
+    hero_start = HERO_START_PATTERN.search(content)
+    hero_start = hero_start.start() if hero_start else 0
+    first_image = None
+    for match in IMG_TAG_PATTERN.finditer(content, hero_start):
+        if fold is not None and match.start() >= fold:
+            break
+        if not any(start <= match.start() < end for start, end in scripts):
+            first_image = match.start()
+            break
+    has_priority = re.search(r'fetchpriority\s*=\s*["\']?high', content, re.IGNORECASE)
+    hero = None if has_priority else first_image
+    # Without enough sections, everything after the first content image is
+    # treated as below the fold
+    if fold is None:
+        fold = first_image + 1 if first_image is not None else len(content)
+
+    def replace_tag(match):
+        tag = match.group(0)
+        if any(start <= match.start() < end for start, end in scripts):
+            return tag
+        attrs = []
+        src_match = IMG_SRC_PATTERN.search(tag)
+        if src_match and not _has_attr(tag, 'width') and not _has_attr(tag, 'height'):
+            path = unquote(src_match.group(3).split('?')[0].split('#')[0])
+            size = dimensions.get(path.lstrip('/').removeprefix('./'))
+            if size:
+                attrs += [('width', size[0]), ('height', size[1])]
+        if not _has_attr(tag, 'decoding'):
+            attrs.append(('decoding', 'async'))
+        if match.start() == hero:
+            tag = re.sub(r'\sloading\s*=\s*(["\']?)lazy\1', '', tag, flags=re.IGNORECASE)
+            attrs.append(('fetchpriority', 'high'))
+        elif match.start() >= fold and not _has_attr(tag, 'loading'):
+            attrs.append(('loading', 'lazy'))
+        return _add_attrs(tag, attrs)
+
+    return IMG_TAG_PATTERN.sub(replace_tag, content)
+
+
+def lqip_backgrounds(content, placeholders):
+    """
+    Give every <img> outside <script> blocks whose src has a placeholder
+    ({site path: data URI}) that placeholder as a covering background, so
+    colour shows until the image paints over it. Images that already set a
+    background in their style are left alone.
+    """
+    scripts = [m.span() for m in SCRIPT_BLOCK_PATTERN.finditer(content)]
+    style_pattern = re.compile(r'(\sstyle=)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+
+    def replace_tag(match):
+        tag = match.group(0)
+        if any(start <= match.start() < end for start, end in scripts):
+            return tag
+        src_match = IMG_SRC_PATTERN.search(tag)
+        if not src_match:
+            return tag
+        path = unquote(src_match.group(3).split('?')[0].split('#')[0])
+        lqip = placeholders.get(path.lstrip('/').removeprefix('./'))
+        if not lqip:
+            return tag
+        background = f"background:url({lqip}) center/cover no-repeat"
+        style_match = style_pattern.search(tag)
+        if not style_match:
+            return _add_attrs(tag, [('style', background)])
+        if 'background' in style_match.group(3).lower():
+            return tag
+        style = style_match.group(3).rstrip().rstrip(';')
+        style = f"{style}; {background}" if style else background
+        return (tag[:style_match.start()] + style_match.group(1) + style_match.group(2) + style +
+                style_match.group(2) + tag[style_match.end():])
+
+    return IMG_TAG_PATTERN.sub(replace_tag, content)
+
+
+TRANSFORMS = {
+    'replace-text': replace_text,
+    'regex-replace': regex_replace,
+    'remove-dropdown': remove_dropdown,
+    'hoist-nav-item': hoist_nav_item,
+    'webp-references': webp_references,
+    'img-attributes': img_attributes,
+    'lqip': lqip_backgrounds,
+}
+
+
+# ─── Engine ───
+
+def apply_chain(content, chain):
+    """Run content through every (name, params) transform in chain."""
+    for name, params in chain:
+        content = TRANSFORMS[name](content, **params)
+    return content
+
+
+def write_atomic(path, content):
+    """Replace path with content via a temp file in the same directory."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def rewrite_page(job):
+    """
+    Worker: (path, chain, dry_run) -> {'path', 'changed', 'diff', 'error'}.
+    Transforms always see '\\n' line endings; pure-CRLF pages are converted
+    back before writing.
+    """
+    path, chain, dry_run = job
+    result = {'path': path, 'changed': False, 'diff': None, 'error': None}
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            original = f.read()
+        crlf = '\r\n' in original and original.count('\r\n') == original.count('\n')
+        content = apply_chain(original.replace('\r\n', '\n') if crlf else original, chain)
+        if crlf:
+            content = content.replace('\n', '\r\n')
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    if content == original:
+        return result
+    result['changed'] = True
+    if dry_run:
+        result['diff'] = ''.join(difflib.unified_diff(
+            original.splitlines(keepends=True), content.splitlines(keepends=True),
+            fromfile=f'a/{os.path.basename(path)}', tofile=f'b/{os.path.basename(path)}'))
+    else:
+        write_atomic(path, content)
+    return result
+
+
+def rewrite_pages(paths, chain, dry_run=False, jobs=1):
+    """Apply chain to every page; returns the results in input order."""
+    work = [(path, chain, dry_run) for path in paths]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(rewrite_page, work, chunksize=4))
+    return [rewrite_page(job) for job in work]
+
+
+def find_pages(directory=PROJECT_ROOT):
+    """Top-level *.html pages of the site."""
+    return sorted(glob.glob(os.path.join(directory, '*.html')))
+
+
+# ─── CLI ───
+
+class ChainAction(argparse.Action):
+    """Append (transform, params) to args.chain, keeping command-line order."""
+
+    def __init__(self, option_strings, dest, transform=None, params=(), **kwargs):
+        self.transform = transform
+        self.params = params
+        super().__init__(option_strings, 'chain', **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        values = values if isinstance(values, list) else [values]
+        chain = getattr(namespace, 'chain', None) or []
+        chain.append((self.transform, dict(zip(self.params, values))))
+        namespace.chain = chain
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Apply a chain of transforms to the HTML pages.")
+    parser.add_argument('pages', nargs='*', help="Pages to rewrite (default: every *.html in the project)")
+    parser.add_argument('--replace', action=ChainAction, nargs=2, metavar=('OLD', 'NEW'),
+                        transform='replace-text', params=('old', 'new'))
+    parser.add_argument('--regex', action=ChainAction, nargs=2, metavar=('PATTERN', 'REPL'),
+                        transform='regex-replace', params=('pattern', 'repl'))
+    parser.add_argument('--remove-dropdown', action=ChainAction, metavar='HREF',
+                        transform='remove-dropdown', params=('href',))
+    parser.add_argument('--hoist-nav-item', action=ChainAction, nargs='+', metavar='HREF [LABEL [MENU]]',
+                        transform='hoist-nav-item', params=('href', 'label', 'menu'),
+                        help="Move a link out of its dropdown (only dropdowns titled MENU)")
+    parser.add_argument('--webp', action=ChainAction, nargs=0,
+                        transform='webp-references', params=(),
+                        help="Point JPG/PNG asset references at their .webp conversions")
+    parser.add_argument('--dry-run', action='store_true', help="Print unified diffs, write nothing")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Worker processes (0 = one per CPU core). Default: 1")
+    return parser
+
+
+def run(chain, pages=None, dry_run=False, jobs=1):
+    """Rewrite pages (default: all) with chain and print a summary; returns the exit code."""
+    pages = pages or find_pages()
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+    changed = failed = 0
+    for result in rewrite_pages(pages, chain, dry_run, workers):
+        name = os.path.relpath(result['path'], PROJECT_ROOT)
+        if result['error']:
+            failed += 1
+            print(f"  ✗ Error rewriting {name}: {result['error']}")
+        elif result['changed']:
+            changed += 1
+            if dry_run:
+                sys.stdout.write(result['diff'])
+            else:
+                print(f"  ✓ Updated {name}")
+
+    verb = "Would update" if dry_run else "Updated"
+    print(f"\n  {verb} {changed}/{len(pages)} pages.")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    chain = getattr(args, 'chain', None)
+    if not chain:
+        parser.error("no transforms given")
+    return run(chain, args.pages, args.dry_run, args.jobs)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Image Dimensions
+Builds a cached index of the pixel size of every image under assets/ (plus
+the logos at the site root) and stamps the site's <img> tags with it:
+width/height so the browser reserves space before the image arrives,
+decoding="async", loading="lazy" below the fold and fetchpriority="high" on
+each page's hero image (see html_rewrite.img_attributes).
+
+Sizes are read from the image headers only (Pillow opens lazily; SVGs from
+their width/height or viewBox) and cached in .image_dimensions.json by file
+size and mtime, so reruns only open new or changed files.
+
+Usage:
+  python3 image_dimensions.py --dry-run      # show the diff
+  python3 image_dimensions.py -j 4           # stamp every page
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import xml.etree.ElementTree as ET
+from PIL import Image
+
+from html_rewrite import run
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(PROJECT_ROOT, 'assets')
+INDEX_PATH = os.path.join(PROJECT_ROOT, '.image_dimensions.json')
+INDEX_VERSION = 1
+
+RASTER_EXTENSIONS = {'.webp', '.avif', '.png', '.jpg', '.jpeg', '.gif', '.ico'}
+SVG_EXTENSIONS = {'.svg'}
+
+# EXIF orientations that rotate the image by 90 degrees; browsers apply them,
+# so the rendered width and height are swapped
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+EXIF_ORIENTATION = 0x0112
+
+SVG_LENGTH_PATTERN = re.compile(r'^\s*([\d.]+)\s*(px)?\s*$')
+
+
+def svg_size(path):
+    """(width, height) of an SVG from its width/height attributes or viewBox."""
+    root = ET.parse(path).getroot()
+    width, height = root.get('width', ''), root.get('height', '')
+    w_match, h_match = SVG_LENGTH_PATTERN.match(width), SVG_LENGTH_PATTERN.match(height)
+    if w_match and h_match:
+        return round(float(w_match.group(1))), round(float(h_match.group(1)))
+    view_box = (root.get('viewBox') or '').replace(',', ' ').split()
+    if len(view_box) == 4:
+        return round(float(view_box[2])), round(float(view_box[3]))
+    return None
+
+
+def raster_size(path):
+    """(width, height) as rendered, i.e. after EXIF orientation."""
+    with Image.open(path) as img:
+        width, height = img.size
+        if img.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+    return width, height
+
+
+def image_size(path):
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        return svg_size(path) if ext in SVG_EXTENSIONS else raster_size(path)
+    except (OSError, ET.ParseError, ValueError):
+        return None
+
+
+def find_images(root=PROJECT_ROOT):
+    """Site-relative paths of the images under assets/ and at the site root."""
+    extensions = RASTER_EXTENSIONS | SVG_EXTENSIONS
+    paths = [name for name in os.listdir(root)
+             if os.path.splitext(name)[1].lower() in extensions]
+    for dirpath, dirs, names in os.walk(os.path.join(root, 'assets')):
+        dirs.sort()
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        paths.extend(f'{rel_dir}/{name}' for name in sorted(names)
+                     if os.path.splitext(name)[1].lower() in extensions)
+    return sorted(paths)
+
+
+def load_index(path=INDEX_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index.get('images', {}) if index.get('version') == INDEX_VERSION else {}
+
+
+def save_index(images, path=INDEX_PATH):
+    """Write the index atomically."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'images': images}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def build_dimension_index(root=PROJECT_ROOT, path=INDEX_PATH):
+    """
+    {site path: [width, height]} for every image, reusing cached entries whose
+    size and mtime still match. Returns (dimensions, number of files opened).
+    """
+    cached = load_index(path)
+    images = {}
+    opened = 0
+    for rel_path in find_images(root):
+        stat = os.stat(os.path.join(root, rel_path))
+        key = [stat.st_size, stat.st_mtime_ns]
+        entry = cached.get(rel_path)
+        if entry is None or entry['stat'] != key:
+            opened += 1
+            entry = {'stat': key, 'size': image_size(os.path.join(root, rel_path))}
+        images[rel_path] = entry
+    save_index(images, path)
+    return {p: e['size'] for p, e in images.items() if e['size']}, opened
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add width/height/loading/decoding/fetchpriority to <img> tags.")
+    parser.add_argument('pages', nargs='*', help="Pages to rewrite (default: every *.html in the project)")
+    parser.add_argument('--dry-run', action='store_true', help="Print unified diffs, write nothing")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Worker processes (0 = one per CPU core). Default: 1")
+    args = parser.parse_args(argv)
+
+    dimensions, opened = build_dimension_index()
+    print(f"Indexed {len(dimensions)} images ({opened} read, {len(dimensions) - opened} cached).\n")
+    return run([('img-attributes', {'dimensions': dimensions})], args.pages, args.dry_run, args.jobs)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,81 +1,447 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Link Checker
+Parses every HTML page once with an HTML tokenizer, collects all local
+references (a/link href, img/source/video/audio/script/iframe src, srcset,
+poster, inline and <style> CSS url()) and the url() references inside the
+site's CSS files, and resolves them against an in-memory index of the site
+tree built once up front, so checking a link never touches the filesystem.
+Pages are parsed in parallel. --external also verifies http(s) links
+(see external_links.py).
+
+--incremental keeps a page -> reference dependency graph (.link_graph.json)
+with each page's mtime and hash: reruns only re-parse pages that changed and
+only re-verify references whose targets were added, removed or renamed.
+--watch repeats that check as files change during an editing session.
+"""
+
 import os
 import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import posixpath
+from datetime import datetime
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import unquote
 
-def check_file_exists(base_dir, path):
-    # Remove query parameters and anchors
-    path = path.split('?')[0].split('#')[0]
-    
-    # Handle absolute paths (relative to site root) and relative paths
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Directories never indexed or scanned
+IGNORED_DIRS = {'.git', 'node_modules', 'deploy_build', '__pycache__'}
+
+# References that point off-site or nowhere
+SKIPPED_PREFIXES = ('http:', 'https:', '//', 'mailto:', 'tel:', 'data:', 'javascript:', '#')
+
+# <link rel> values whose href is not a file on this site
+NON_FILE_LINK_RELS = {'preconnect', 'dns-prefetch', 'canonical', 'alternate'}
+
+# Below this many pages the process pool costs more than it saves
+PARALLEL_MIN_PAGES = 16
+
+# Incremental mode
+GRAPH_PATH = os.path.join(PROJECT_ROOT, '.link_graph.json')
+GRAPH_VERSION = 1
+WATCH_INTERVAL = 2.0
+
+CSS_URL_PATTERN = re.compile(r'url\(\s*(["\']?)([^"\')]+)\1\s*\)', re.IGNORECASE)
+
+# (tag, attribute) -> report label
+REFERENCE_ATTRS = {
+    ('a', 'href'): 'Broken Link',
+    ('link', 'href'): 'Broken Stylesheet',
+    ('img', 'src'): 'Broken Image',
+    ('img', 'srcset'): 'Broken Image',
+    ('source', 'src'): 'Broken Source',
+    ('source', 'srcset'): 'Broken Source',
+    ('video', 'src'): 'Broken Video',
+    ('video', 'poster'): 'Broken Poster',
+    ('audio', 'src'): 'Broken Audio',
+    ('script', 'src'): 'Broken Script',
+    ('iframe', 'src'): 'Broken Frame',
+}
+
+
+def build_site_index(directory):
+    """Every file and directory under `directory`, as root-relative posix paths."""
+    index = {''}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        rel_root = os.path.relpath(root, directory).replace(os.sep, '/')
+        rel_root = '' if rel_root == '.' else rel_root
+        for name in dirs + files:
+            index.add(posixpath.join(rel_root, name))
+    return index
+
+
+def split_srcset(value):
+    """URLs from a srcset attribute ('a.webp 480w, b.webp 960w')."""
+    return [candidate.split()[0] for candidate in value.split(',') if candidate.strip()]
+
+
+class PageParser(HTMLParser):
+    """Collects (label, url) references and SEO facts from one HTML page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.references = []
+        self.has_title = False
+        self.has_description = False
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'title':
+            self.has_title = True
+        elif tag == 'meta' and (attrs.get('name') or '').lower() == 'description':
+            self.has_description = True
+        elif tag == 'style':
+            self._in_style = True
+
+        if tag == 'link':
+            rels = set((attrs.get('rel') or '').lower().split())
+            if rels & NON_FILE_LINK_RELS:
+                return
+
+        for (ref_tag, attr), label in REFERENCE_ATTRS.items():
+            if ref_tag != tag or not attrs.get(attr):
+                continue
+            urls = split_srcset(attrs[attr]) if attr == 'srcset' else [attrs[attr]]
+            if tag == 'link' and not attrs[attr].split('?')[0].endswith('.css'):
+                label = 'Broken Asset'
+            self.references.extend((label, url) for url in urls)
+
+        if attrs.get('style'):
+            self.references.extend(('Broken CSS url()', url)
+                                   for _, url in CSS_URL_PATTERN.findall(attrs['style']))
+
+    handle_startendtag = handle_starttag
+
+    def handle_endtag(self, tag):
+        if tag == 'style':
+            self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_style:
+            self.references.extend(('Broken CSS url()', url)
+                                   for _, url in CSS_URL_PATTERN.findall(data))
+
+
+def parse_file(path):
+    """
+    Parse one HTML or CSS file.
+    Returns {'references': [(label, url)], 'has_title', 'has_description'};
+    the SEO flags are None for CSS files.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if path.endswith('.css'):
+        return {'references': [('Broken CSS url()', url) for _, url in CSS_URL_PATTERN.findall(content)],
+                'has_title': None, 'has_description': None}
+    parser = PageParser()
+    parser.feed(content)
+    parser.close()
+    return {'references': parser.references,
+            'has_title': parser.has_title,
+            'has_description': parser.has_description}
+
+
+def resolve_reference(url, page_dir):
+    """
+    Root-relative posix path a local reference points at, or None if it is
+    off-site. Query strings and fragments are dropped.
+    """
+    url = url.strip()
+    if not url or url.lower().startswith(SKIPPED_PREFIXES):
+        return None
+    path = url.split('?')[0].split('#')[0]
+    if not path:
+        return None
     if path.startswith('/'):
-        full_path = os.path.join(base_dir, path.lstrip('/'))
+        path = path.lstrip('/')
     else:
-        full_path = os.path.join(base_dir, path)
-        
-    return os.path.exists(full_path) or os.path.exists(unquote(full_path))
+        path = posixpath.join(page_dir, path)
+    path = posixpath.normpath(path)
+    return '' if path == '.' else path
 
-def scan_html_files(directory):
-    html_files = [f for f in os.listdir(directory) if f.endswith('.html')]
-    report = []
-    
-    print(f"Scanning {len(html_files)} HTML files in {directory}...\n")
-    
-    for filename in html_files:
-        filepath = os.path.join(directory, filename)
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        print(f"Checking {filename}...")
-        errors = []
-        
-        # 1. Check Links (a href)
-        links = re.findall(r'<a\s+(?:[^>]*?\s+)?href=["\']([^"\']*)["\']', content)
-        for link in links:
-            if link.startswith(('http', 'https', 'mailto:', 'tel:', '#')):
-                continue
-            if not check_file_exists(directory, link):
-                errors.append(f"Broken Link: {link}")
 
-        # 2. Check Images (img src)
-        images = re.findall(r'<img\s+(?:[^>]*?\s+)?src=["\']([^"\']*)["\']', content)
-        for img in images:
-            if img.startswith(('http', 'https', 'data:')):
+def reference_exists(index, url, page_dir):
+    """True if url is off-site or resolves to an indexed file (raw or %-decoded)."""
+    target = resolve_reference(url, page_dir)
+    if target is None:
+        return True
+    return target in index or unquote(target) in index
+
+
+def find_pages(directory, recursive=False):
+    """HTML and CSS files to check, as root-relative posix paths."""
+    pages = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS and d != 'dist')
+        rel_root = os.path.relpath(root, directory).replace(os.sep, '/')
+        rel_root = '' if rel_root == '.' else rel_root
+        pages.extend(posixpath.join(rel_root, f) for f in sorted(files)
+                     if f.endswith(('.html', '.css')))
+        if not recursive:
+            break
+    return pages
+
+
+def parse_files(paths, jobs=0):
+    """parse_file() over every path, in a process pool when it pays off."""
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if workers > 1 and len(paths) >= PARALLEL_MIN_PAGES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(parse_file, paths, chunksize=4))
+    return [parse_file(path) for path in paths]
+
+
+def verify_page(page, info, index):
+    """
+    Resolve a parsed page's references against the site index.
+    Returns (errors, targets): report lines and every local path referenced.
+    """
+    page_dir = posixpath.dirname(page)
+    errors = []
+    targets = set()
+    seen = set()
+    for label, url in info['references']:
+        if (label, url) in seen:
+            continue
+        seen.add((label, url))
+        target = resolve_reference(url, page_dir)
+        if target is None:
+            continue
+        targets.update((target, unquote(target)))
+        if target not in index and unquote(target) not in index:
+            errors.append(f"{label}: {url}")
+    if info['has_description'] is False:
+        errors.append("Missing Meta Description")
+    if info['has_title'] is False:
+        errors.append("Missing Title Tag")
+    return errors, sorted(targets)
+
+
+def check_site(directory, recursive=False, jobs=0):
+    """
+    Check every page. Returns [(page, errors)] in page order, where errors is
+    a list of report lines ("Broken Image: assets/x.webp").
+    """
+    index = build_site_index(directory)
+    pages = find_pages(directory, recursive)
+    parsed = parse_files([os.path.join(directory, page) for page in pages], jobs)
+    return [(page, verify_page(page, info, index)[0]) for page, info in zip(pages, parsed)]
+
+
+# ─── Incremental mode ───
+
+def load_graph(path=GRAPH_PATH):
+    """Load the dependency graph, starting fresh if missing, corrupt or outdated."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            graph = json.load(f)
+        if graph.get('version') == GRAPH_VERSION:
+            return graph
+    except (OSError, ValueError):
+        pass
+    return {'version': GRAPH_VERSION, 'scope': None, 'index': [], 'pages': {}}
+
+
+def save_graph(graph, path=GRAPH_PATH):
+    """Write the graph atomically."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(graph, f)
+    os.replace(tmp_path, path)
+
+
+def _page_state(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _page_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def check_site_incremental(directory, graph, recursive=False, jobs=0, since=None):
+    """
+    Like check_site(), reusing and updating `graph`.
+
+    A page is re-parsed only if its size/mtime changed and its content hash
+    no longer matches (or it was modified after `since`, a timestamp). An
+    unchanged page is re-verified only if one of its targets appeared in or
+    disappeared from the site index since the last run.
+
+    Returns (results, stats) with stats = {'parsed', 'reverified', 'reused',
+    'changed_paths'}.
+    """
+    index = build_site_index(directory)
+    scope = [os.path.abspath(directory), recursive]
+    if graph.get('scope') == scope:
+        changed_paths = index.symmetric_difference(graph['index'])
+    else:
+        graph.update(scope=scope, index=[], pages={})
+        changed_paths = None
+    previous = graph['pages']
+
+    pages = find_pages(directory, recursive)
+    to_parse = []
+    for page in pages:
+        path = os.path.join(directory, page)
+        entry = previous.get(page)
+        state = _page_state(path)
+        forced = since is not None and state[1] / 1e9 >= since
+        if entry and not forced:
+            if entry['state'] == state:
                 continue
-            if not check_file_exists(directory, img):
-                errors.append(f"Broken Image: {img}")
-                
-        # 3. Check Scripts (script src)
-        scripts = re.findall(r'<script\s+(?:[^>]*?\s+)?src=["\']([^"\']*)["\']', content)
-        for script in scripts:
-            if script.startswith(('http', 'https')):
+            if entry['hash'] == _page_hash(path):
+                entry['state'] = state
                 continue
-            if not check_file_exists(directory, script):
-                errors.append(f"Broken Script: {script}")
+        to_parse.append(page)
+
+    parsed = parse_files([os.path.join(directory, page) for page in to_parse], jobs)
+    entries = {}
+    for page, info in zip(to_parse, parsed):
+        path = os.path.join(directory, page)
+        errors, targets = verify_page(page, info, index)
+        entries[page] = {'state': _page_state(path), 'hash': _page_hash(path),
+                         'info': info, 'targets': targets, 'errors': errors}
+
+    reverified = 0
+    results = []
+    for page in pages:
+        entry = entries.get(page) or previous[page]
+        if page not in entries and (changed_paths is None or
+                                    not changed_paths.isdisjoint(entry['targets'])):
+            entry['errors'], entry['targets'] = verify_page(page, entry['info'], index)
+            reverified += 1
+        entries[page] = entry
+        results.append((page, entry['errors']))
+
+    graph['pages'] = entries
+    graph['index'] = sorted(index)
+    stats = {'parsed': len(to_parse), 'reverified': reverified,
+             'reused': len(pages) - len(to_parse) - reverified,
+             'changed_paths': sorted(changed_paths or [])}
+    return results, stats
 
-        # 4. Check Styles (link href)
-        styles = re.findall(r'<link\s+(?:[^>]*?\s+)?href=["\']([^"\']*)["\']', content)
-        for style in styles:
-            if style.startswith(('http', 'https')):
-                continue
-            if "stylesheet" in content and not check_file_exists(directory, style) and style.endswith('.css'):
-                 # Simple check, might catch google fonts if not careful, but filtered by .css ext for local
-                 errors.append(f"Broken Stylesheet: {style}")
 
-        # 5. Check SEO Meta Tags
-        if '<meta name="description"' not in content:
-            errors.append("Missing Meta Description")
-        
-        if '<title>' not in content:
-            errors.append("Missing Title Tag")
+def parse_since(value):
+    """'90s', '15m', '2h', '1d' ago, or an ISO timestamp -> epoch seconds."""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if value and value[-1] in units and value[:-1].isdigit():
+        return time.time() - int(value[:-1]) * units[value[-1]]
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid --since value: {value}")
 
+
+def watch(directory, recursive=False, jobs=0, interval=WATCH_INTERVAL, graph_path=GRAPH_PATH):
+    """Re-run the incremental check every `interval` seconds, printing what changed."""
+    graph = load_graph(graph_path)
+    last = {}
+    print(f"Watching {directory} (Ctrl-C to stop)...")
+    try:
+        while True:
+            results, stats = check_site_incremental(directory, graph, recursive, jobs)
+            current = dict(results)
+            changed = [page for page in current if current[page] != last.get(page)]
+            for page in sorted(set(last) - set(current)):
+                print(f"  - {page} removed")
+            if changed and last:
+                print(time.strftime('[%H:%M:%S]') +
+                      f" parsed {stats['parsed']}, re-verified {stats['reverified']}")
+            for page in changed:
+                errors = current[page]
+                if errors:
+                    print(f"❌ {page}:\n  - " + "\n  - ".join(errors))
+                elif page in last:
+                    print(f"✅ {page}: fixed")
+            if changed or set(last) != set(current):
+                save_graph(graph, graph_path)
+            if not last:
+                broken = sum(1 for errors in current.values() if errors)
+                print(f"  {len(current)} pages, {broken} with problems. Waiting for changes...")
+            last = current
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        save_graph(graph, graph_path)
+
+
+def scan_html_files(directory, recursive=False, jobs=0, incremental=False, since=None):
+    if incremental:
+        graph = load_graph()
+        results, stats = check_site_incremental(directory, graph, recursive, jobs, since)
+        save_graph(graph)
+    else:
+        results = check_site(directory, recursive, jobs)
+    html_count = sum(1 for page, _ in results if page.endswith('.html'))
+    print(f"Scanned {html_count} HTML files and {len(results) - html_count} CSS files in {directory}.")
+    if incremental:
+        print(f"  Parsed {stats['parsed']}, re-verified {stats['reverified']}, "
+              f"reused {stats['reused']} ({len(stats['changed_paths'])} site paths added/removed).")
+    print()
+
+    if since is not None:
+        # Only report pages touched within the --since window
+        recent = {page for page in (p for p, _ in results)
+                  if os.path.getmtime(os.path.join(directory, page)) >= since}
+        results = [(page, errors) for page, errors in results if page in recent]
+
+    report = []
+    for page, errors in results:
         if errors:
-            report.append(f"❌ {filename}:\n  - " + "\n  - ".join(errors))
+            report.append(f"❌ {page}:\n  - " + "\n  - ".join(errors))
         else:
-            report.append(f"✅ {filename}: Passed")
-            
-    print("\n" + "="*40 + "\nCHECK COMPLETE\n" + "="*40)
+            report.append(f"✅ {page}: Passed")
+
+    print("=" * 40 + "\nCHECK COMPLETE\n" + "=" * 40)
     for line in report:
         print(line)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check local links, images, scripts and CSS url()s.")
+    parser.add_argument('directory', nargs='?', default=PROJECT_ROOT)
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help="Also check pages in sub-directories (e.g. admin/)")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Parser processes (0 = one per CPU core). Default: 0")
+    parser.add_argument('--external', action='store_true',
+                        help="Also verify http(s) links in pages and data/*.json (cached, see external_links.py)")
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help=f"Reuse the dependency graph in {os.path.basename(GRAPH_PATH)}")
+    parser.add_argument('--since', type=parse_since, metavar='WHEN',
+                        help="Re-parse and report only pages modified since WHEN "
+                             "(15m, 2h, 1d or an ISO timestamp). Implies --incremental")
+    parser.add_argument('--watch', nargs='?', type=float, const=WATCH_INTERVAL, metavar='SECONDS',
+                        help=f"Keep checking as files change (every {WATCH_INTERVAL:g}s by default)")
+    args = parser.parse_args(argv)
+    if args.watch:
+        watch(args.directory, args.recursive, args.jobs, args.watch)
+        return 0
+    results = scan_html_files(args.directory, args.recursive, args.jobs,
+                              incremental=args.incremental or args.since is not None,
+                              since=args.since)
+    failed = any(errors for _, errors in results)
+
+    if args.external:
+        # Imported here: external_links builds on this module
+        import external_links
+        used = external_links.collect_external_urls(args.directory, args.recursive)
+        print(f"\nChecking {len(used)} external URLs...")
+        external, probed = external_links.check_urls(list(used))
+        print(f"  ({probed} probed, {len(used) - probed} from cache)")
+        failed = external_links.report(external, used) > 0 or failed
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
-    scan_html_files("/Users/haneesh/yolowebsite26")
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Remote Image Localizer
+Blog cards point their 'image' at third-party URLs (pexels, sized by the
+query string), so every card load waits on someone else's CDN. This tool
+downloads each remote image once, runs it through the same WebP/variant
+pipeline as local assets (optimize_images.encode_webp) and rewrites the data
+file to the local copy, keeping the original URL as 'imageSource'.
+
+Downloads are content-addressed: .remote_image_cache/ holds one file per
+SHA-256 plus an index of URL -> hash, and the WebP outputs are named after
+the hash (assets/images/remote/<hash>.webp), so the same photo used twice
+is stored and encoded once, and reruns make no requests at all.
+
+Usage:
+  python3 localize_images.py                  # data/blogs.json, data/experiences.json
+  python3 localize_images.py --dry-run        # list what would be localized
+  python3 localize_images.py --refresh        # download again, ignore the cache
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+import urllib.request
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+from external_links import USER_AGENT
+from optimize_images import MAX_WIDTH, run_jobs, format_reduction
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DATA_FILES = [os.path.join(PROJECT_ROOT, 'data', 'blogs.json'),
+              os.path.join(PROJECT_ROOT, 'data', 'experiences.json')]
+REMOTE_DIR = 'assets/images/remote'
+CACHE_DIR = os.path.join(PROJECT_ROOT, '.remote_image_cache')
+CACHE_INDEX = 'index.json'
+
+IMAGE_FIELD = 'image'
+SOURCE_FIELD = 'imageSource'
+HASH_LENGTH = 16
+
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_WORKERS = 4
+MAX_DOWNLOAD_BYTES = 25 * 1024 * 1024
+
+# Hosts that size images through the query string: ask for our own maximum
+# width instead of theirs (None removes the parameter).
+SIZE_PARAMS = {
+    'images.pexels.com': {'w': str(MAX_WIDTH), 'h': None, 'dpr': None, 'fit': None},
+}
+
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp',
+    'image/gif': '.gif', 'image/avif': '.avif',
+}
+
+
+def source_url(url):
+    """The URL actually downloaded: url with the host's sizing rules applied."""
+    parts = urlsplit(url)
+    rules = SIZE_PARAMS.get(parts.hostname or '')
+    if not rules:
+        return url
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    for name, value in rules.items():
+        if value is None:
+            query.pop(name, None)
+        else:
+            query[name] = value
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def is_remote(value):
+    return isinstance(value, str) and value.startswith(('http://', 'https://'))
+
+
+def download(url, timeout=DOWNLOAD_TIMEOUT):
+    """(bytes, extension) of one image; raises ValueError for non-images."""
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT, 'Accept': 'image/*'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        content_type = response.headers.get_content_type()
+        data = response.read(MAX_DOWNLOAD_BYTES + 1)
+    if len(data) > MAX_DOWNLOAD_BYTES:
+        raise ValueError(f"larger than {MAX_DOWNLOAD_BYTES // (1024 * 1024)} MB")
+    ext = CONTENT_TYPE_EXTENSIONS.get(content_type)
+    if ext is None:
+        raise ValueError(f"not an image ({content_type})")
+    return data, ext
+
+
+def load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, CACHE_INDEX), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(cache_dir, index):
+    """Write the cache index atomically."""
+    path = os.path.join(cache_dir, CACHE_INDEX)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def cached_path(cache_dir, entry):
+    return os.path.join(cache_dir, entry['sha256'] + entry['ext'])
+
+
+def fetch_to_cache(url, cache_dir, timeout=DOWNLOAD_TIMEOUT):
+    """Download url into the content-addressed cache; returns its index entry."""
+    data, ext = download(source_url(url), timeout)
+    entry = {'sha256': hashlib.sha256(data).hexdigest(), 'ext': ext,
+             'source': source_url(url), 'bytes': len(data)}
+    path = cached_path(cache_dir, entry)
+    if not os.path.exists(path):
+        # A unique temp name: two URLs with the same bytes may be fetched at once
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=entry['sha256'] + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # Refuse anything Pillow can't decode before it enters the cache
+            with Image.open(tmp_path) as img:
+                img.verify()
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return entry
+
+
+def fetch_all(urls, cache_dir, refresh=False, workers=DOWNLOAD_WORKERS, timeout=DOWNLOAD_TIMEOUT):
+    """
+    Make sure every URL is in the cache. Returns ({url: entry}, {url: error},
+    number downloaded).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    index = load_index(cache_dir)
+    missing = sorted(url for url in set(urls)
+                     if refresh or url not in index or not os.path.exists(cached_path(cache_dir, index[url])))
+    errors = {}
+
+    def fetch(url):
+        try:
+            return url, fetch_to_cache(url, cache_dir, timeout), None
+        except Exception as e:
+            return url, None, f"{type(e).__name__}: {e}"
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for url, entry, error in executor.map(fetch, missing):
+            if error:
+                errors[url] = error
+            else:
+                index[url] = entry
+    save_index(cache_dir, index)
+    return {url: index[url] for url in urls if url in index}, errors, len(missing) - len(errors)
+
+
+def local_path(entry):
+    """Site path of the WebP for a cached download."""
+    return f"{REMOTE_DIR}/{entry['sha256'][:HASH_LENGTH]}.webp"
+
+
+def remote_items(data_files):
+    """{data file: items} for files that have at least one remote image."""
+    found = {}
+    for path in data_files:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        if any(is_remote(item.get(IMAGE_FIELD)) for item in items):
+            found[path] = items
+    return found
+
+
+def save_items(path, items):
+    """Write a data file the way server.js does (2-space JSON), atomically."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(items, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def localize(data_files=DATA_FILES, root=PROJECT_ROOT, cache_dir=CACHE_DIR, refresh=False,
+             workers=1, dry_run=False, timeout=DOWNLOAD_TIMEOUT):
+    """
+    Download, convert and rewrite every remote image in data_files.
+    Returns the number of images that could not be localized.
+    """
+    files = remote_items(data_files)
+    urls = sorted({item[IMAGE_FIELD] for items in files.values() for item in items
+                   if is_remote(item.get(IMAGE_FIELD))})
+    print(f"Found {len(urls)} remote images in {len(files)} data files.")
+    if dry_run:
+        for url in urls:
+            print(f"  - {url}")
+        return 0
+    if not urls:
+        return 0
+
+    entries, errors, downloaded = fetch_all(urls, cache_dir, refresh, timeout=timeout)
+    print(f"  Downloaded {downloaded}, {len(entries) - downloaded} already cached.")
+    for url, error in errors.items():
+        print(f"  ✗ {url}: {error}")
+
+    # Convert each distinct download once; outputs are named by content
+    os.makedirs(os.path.join(root, REMOTE_DIR), exist_ok=True)
+    jobs = {}
+    for entry in entries.values():
+        output = os.path.join(root, local_path(entry))
+        if (refresh or not os.path.exists(output)) and output not in jobs:
+            jobs[output] = (cached_path(cache_dir, entry), output, MAX_WIDTH, None)
+    failed_outputs = set()
+    for (input_path, output, _, _), original_size, new_size, error, _ in run_jobs(list(jobs.values()), workers):
+        if error is None:
+            print(format_reduction(input_path, original_size, new_size))
+        else:
+            failed_outputs.add(output)
+            print(f"  ✗ Error converting {input_path}: {error}")
+
+    localized = 0
+    for path, items in files.items():
+        changed = 0
+        for item in items:
+            url = item.get(IMAGE_FIELD)
+            entry = entries.get(url) if is_remote(url) else None
+            if entry is None or os.path.join(root, local_path(entry)) in failed_outputs:
+                continue
+            item[IMAGE_FIELD] = local_path(entry)
+            item[SOURCE_FIELD] = url
+            changed += 1
+        # Leave untouched files alone: server.js and the admin flow watch them
+        if changed:
+            save_items(path, items)
+            localized += changed
+    print(f"\n  Localized {localized} image references.")
+    return len(urls) - len(entries) + len(failed_outputs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download remote data-file images and serve them locally as WebP.")
+    parser.add_argument('data_files', nargs='*', default=DATA_FILES,
+                        help="Data files to rewrite (default: data/blogs.json, data/experiences.json)")
+    parser.add_argument('--refresh', action='store_true', help="Download and convert again")
+    parser.add_argument('--dry-run', action='store_true', help="Only list the remote images")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Conversion worker processes (0 = one per CPU core). Default: 1")
+    parser.add_argument('--timeout', type=float, default=DOWNLOAD_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    failed = localize(args.data_files, refresh=args.refresh, workers=workers,
+                      dry_run=args.dry_run, timeout=args.timeout)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Logo Tools
+Background clean-up for logo and icon exports, done as vectorized NumPy masks
+over the RGBA buffer instead of per-pixel Python loops.
+
+Operations (each also available as a function):
+  white         near-white pixels -> transparent            (fix_transparency.py, remove_bg.py)
+  checkerboard  white + neutral light-grey squares -> transparent
+                                                            (remove_checkerboard.py, fix_logo_final.py)
+  header-bg     background -> header colour rgba(255,255,255,0.8)   (apply_header_bg.py)
+  color-key     every pixel within a tolerance of a colour -> transparent
+  flood         background connected to the seed points (default: the four
+                corners) -> transparent  (fix_transparency_flood.py, remove_bg_flood.py)
+
+Usage:
+  python3 logo_tools.py white assets/icons/header_logo.png -o out.png
+  python3 logo_tools.py checkerboard assets/icons --out-dir cleaned/
+  python3 logo_tools.py header-bg assets/icons/header_logo.png --in-place
+  python3 logo_tools.py flood big_export.png -o out.png --tolerance 30 --seed 10,10
+"""
+
+import os
+import sys
+import argparse
+from bisect import bisect_left, bisect_right
+import numpy as np
+from PIL import Image
+
+# Header color: rgba(255, 255, 255, 0.8) -> (255, 255, 255, 204)
+HEADER_BG = (255, 255, 255, 204)
+TRANSPARENT_WHITE = (255, 255, 255, 0)
+
+# Files picked up when a directory is given on the command line
+BATCH_EXTENSIONS = {'.png', '.webp'}
+
+
+def load_rgba(path):
+    """
+    Open an image as an (H, W, 4) uint8 RGBA array, plus the info dict
+    (ICC profile etc.) Pillow would carry over when saving.
+    """
+    with Image.open(path) as img:
+        rgba = img.convert('RGBA')
+        return np.array(rgba), dict(rgba.info)
+
+
+def save_rgba(rgba, path, fmt=None, info=None):
+    """Save an RGBA array; fmt defaults to PNG, or WEBP for .webp paths."""
+    if fmt is None:
+        fmt = 'WEBP' if path.lower().endswith('.webp') else 'PNG'
+    img = Image.fromarray(rgba, 'RGBA')
+    img.info.update(info or {})
+    img.save(path, fmt)
+
+
+# ─── Masks ───
+
+def near_white_mask(rgba, threshold):
+    """Pixels whose R, G and B are all above threshold."""
+    return (rgba[..., :3] > threshold).all(axis=-1)
+
+
+def neutral_mask(rgba, threshold, max_spread):
+    """Light pixels whose channels differ pairwise by less than max_spread (greys)."""
+    rgb = rgba[..., :3].astype(np.int16)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    return ((rgb > threshold).all(axis=-1) &
+            (np.abs(r - g) < max_spread) &
+            (np.abs(g - b) < max_spread) &
+            (np.abs(r - b) < max_spread))
+
+
+def color_distance_mask(rgba, color, tolerance):
+    """
+    Pixels whose R, G and B are each within tolerance of color. tolerance is
+    one number for all channels or an (r, g, b) tuple.
+    """
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=np.int16), (3,))
+    diff = np.abs(rgba[..., :3].astype(np.int16) - np.array(color[:3], dtype=np.int16))
+    return (diff <= tolerance).all(axis=-1)
+
+
+def _row_runs(row):
+    """Start and end (inclusive) columns of each run of True in a 1-D mask."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], row, [False])).astype(np.int8)))
+    return edges[0::2].tolist(), (edges[1::2] - 1).tolist()
+
+
+def connected_mask(mask, seeds):
+    """
+    The 4-connected region of mask reachable from any of the (x, y) seeds.
+
+    Scanline fill over horizontal runs: each row of the mask is split into
+    runs of True, and the fill walks from run to overlapping runs in the rows
+    above and below. Visited state is one byte per run, so memory stays at the
+    mask itself plus the run table regardless of how large the filled area is.
+    """
+    height, width = mask.shape
+    starts, ends, offsets = [], [], []
+    total = 0
+    for y in range(height):
+        row_starts, row_ends = _row_runs(mask[y])
+        starts.append(row_starts)
+        ends.append(row_ends)
+        offsets.append(total)
+        total += len(row_starts)
+    visited = bytearray(total)
+
+    stack = []
+    for x, y in seeds:
+        if 0 <= x < width and 0 <= y < height:
+            i = bisect_right(starts[y], x) - 1
+            if i >= 0 and ends[y][i] >= x:
+                stack.append((y, i))
+
+    region = np.zeros_like(mask, dtype=bool)
+    while stack:
+        y, i = stack.pop()
+        if visited[offsets[y] + i]:
+            continue
+        visited[offsets[y] + i] = 1
+        start, end = starts[y][i], ends[y][i]
+        region[y, start:end + 1] = True
+
+        for ny in (y - 1, y + 1):
+            if not 0 <= ny < height:
+                continue
+            # Runs in row ny that overlap [start, end]
+            first = bisect_left(ends[ny], start)
+            last = bisect_right(starts[ny], end)
+            for j in range(first, last):
+                if not visited[offsets[ny] + j]:
+                    stack.append((ny, j))
+    return region
+
+
+def corner_seeds(rgba):
+    """The four corner pixels, the usual seeds for background removal."""
+    height, width = rgba.shape[:2]
+    return [(0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)]
+
+
+def fill(rgba, mask, color):
+    """Copy of rgba with every masked pixel set to color."""
+    out = rgba.copy()
+    out[mask] = color
+    return out
+
+
+# ─── Operations ───
+
+def remove_white(rgba, threshold=200):
+    """Make white-ish / light grey background transparent."""
+    return fill(rgba, near_white_mask(rgba, threshold), TRANSPARENT_WHITE)
+
+
+def remove_checkerboard(rgba, white_threshold=250, grey_threshold=200, max_spread=10):
+    """Make white and neutral light-grey (checkerboard) pixels transparent."""
+    mask = near_white_mask(rgba, white_threshold) | neutral_mask(rgba, grey_threshold, max_spread)
+    return fill(rgba, mask, TRANSPARENT_WHITE)
+
+
+def apply_background(rgba, color=HEADER_BG, threshold=200):
+    """Replace fully transparent and white / light grey pixels with color."""
+    mask = (rgba[..., 3] == 0) | near_white_mask(rgba, threshold)
+    return fill(rgba, mask, color)
+
+
+def color_key(rgba, color=None, tolerance=30):
+    """Make every pixel within tolerance of color (default: top-left pixel) transparent."""
+    if color is None:
+        color = tuple(rgba[0, 0])
+    return fill(rgba, color_distance_mask(rgba, color, tolerance), (0, 0, 0, 0))
+
+
+def flood_fill(rgba, seeds=None, color=None, tolerance=30, fill_color=(0, 0, 0, 0)):
+    """
+    Make the background connected to the seed points transparent.
+    color defaults to the top-left pixel, seeds to the four corners; a seed
+    that doesn't match color starts nothing.
+    """
+    if color is None:
+        color = tuple(rgba[0, 0])
+    if seeds is None:
+        seeds = corner_seeds(rgba)
+    region = connected_mask(color_distance_mask(rgba, color, tolerance), seeds)
+    return fill(rgba, region, fill_color)
+
+
+OPERATIONS = {
+    'white': remove_white,
+    'checkerboard': remove_checkerboard,
+    'header-bg': apply_background,
+    'color-key': color_key,
+    'flood': flood_fill,
+}
+
+
+def process_file(operation, input_path, output_path, fmt=None, **params):
+    """Load, transform and save one image."""
+    rgba, info = load_rgba(input_path)
+    save_rgba(OPERATIONS[operation](rgba, **params), output_path, fmt, info)
+
+
+# ─── CLI ───
+
+def parse_color(value):
+    """'255,255,255' or '255,255,255,204' -> tuple"""
+    parts = tuple(int(p) for p in value.split(','))
+    if len(parts) not in (3, 4) or not all(0 <= p <= 255 for p in parts):
+        raise argparse.ArgumentTypeError(f"invalid colour: {value}")
+    return parts if len(parts) == 4 else parts + (255,)
+
+
+def parse_tolerance(value):
+    """'30' or '30,30,40' (per channel)"""
+    parts = tuple(int(p) for p in value.split(','))
+    if len(parts) not in (1, 3) or not all(0 <= p <= 255 for p in parts):
+        raise argparse.ArgumentTypeError(f"invalid tolerance: {value}")
+    return parts[0] if len(parts) == 1 else parts
+
+
+def parse_seed(value):
+    """'x,y' -> (x, y)"""
+    try:
+        x, y = (int(p) for p in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seed: {value}")
+    return x, y
+
+
+def collect_inputs(paths, recursive):
+    """Expand directories into the image files inside them."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            files.extend(os.path.join(root, name) for name in sorted(names)
+                         if os.path.splitext(name)[1].lower() in BATCH_EXTENSIONS)
+            if not recursive:
+                break
+    return files
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Vectorized logo background clean-up.")
+    parser.add_argument('operation', choices=sorted(OPERATIONS))
+    parser.add_argument('inputs', nargs='+', help="Image files or directories")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('-o', '--output', help="Output file (single input only)")
+    target.add_argument('--out-dir', help="Write results into this directory")
+    target.add_argument('--in-place', action='store_true', help="Overwrite the inputs")
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help="Descend into sub-directories of directory inputs")
+    parser.add_argument('--format', choices=['PNG', 'WEBP'],
+                        help="Output format (default: from the output extension)")
+    parser.add_argument('--threshold', type=int,
+                        help="white/header-bg: channel threshold; checkerboard: white threshold")
+    parser.add_argument('--grey-threshold', type=int, help="checkerboard: grey threshold")
+    parser.add_argument('--max-spread', type=int, help="checkerboard: max channel spread for greys")
+    parser.add_argument('--tolerance', type=parse_tolerance,
+                        help="color-key/flood: tolerance, one value or R,G,B per channel")
+    parser.add_argument('--color', type=parse_color,
+                        help="header-bg: fill colour; color-key/flood: key colour (R,G,B[,A])")
+    parser.add_argument('--seed', type=parse_seed, action='append', dest='seeds',
+                        help="flood: seed point x,y (repeatable; default: the four corners)")
+    return parser
+
+
+def operation_params(args):
+    """Map the CLI flags onto the chosen operation's keyword arguments."""
+    names = {
+        'white': {'threshold': 'threshold'},
+        'checkerboard': {'threshold': 'white_threshold', 'grey_threshold': 'grey_threshold',
+                         'max_spread': 'max_spread'},
+        'header-bg': {'threshold': 'threshold', 'color': 'color'},
+        'color-key': {'tolerance': 'tolerance', 'color': 'color'},
+        'flood': {'tolerance': 'tolerance', 'color': 'color', 'seeds': 'seeds'},
+    }[args.operation]
+    return {param: getattr(args, flag) for flag, param in names.items()
+            if getattr(args, flag) is not None}
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    inputs = collect_inputs(args.inputs, args.recursive)
+    if args.output and len(inputs) != 1:
+        parser.error("-o/--output needs exactly one input image; use --out-dir for batches")
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    params = operation_params(args)
+    failures = 0
+    for input_path in inputs:
+        if args.output:
+            output_path = args.output
+        elif args.out_dir:
+            output_path = os.path.join(args.out_dir, os.path.basename(input_path))
+        else:
+            output_path = input_path
+        try:
+            process_file(args.operation, input_path, output_path, args.format, **params)
+            print(f"  ✓ {input_path} → {output_path}")
+        except Exception as e:
+            failures += 1
+            print(f"  ✗ Error processing {input_path}: {e}")
+
+    print(f"\n  Processed {len(inputs) - failures}/{len(inputs)} images.")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,127 +1,904 @@
 #!/usr/bin/env python3
 """
 YOLO Living - Image Optimizer
-Converts JPG/PNG images to WebP format and updates HTML references.
+Converts JPG/PNG (and HEIC, when pillow-heif is installed) images to WebP
+format and updates HTML references.
+Content images also get smaller srcset variants (name-480w.webp, ...) and
+their <img> tags are given matching srcset/sizes attributes.
 Preserves original files alongside the new WebP versions.
+
+With --target-ssim the quality is searched per image for the smallest file
+whose SSIM against the resized source stays above the target, and --avif
+writes an AVIF copy of every output (wrapped in <picture> in the HTML).
+
+A manifest (.optimize_manifest.json) records the source hash, encoder
+settings and output hash of every conversion, plus the state of every HTML
+file after the reference pass, so reruns only redo work that is stale.
+
+Finally data/placeholders.json (blurred previews, see placeholders.py) is
+brought up to date.
+
+--report FILE writes a JSON record of the run: per image the decode, resize
+and encode milliseconds, input/output bytes, pixel counts and peak memory
+(tracemalloc for Python allocations, the process RSS high-water mark for
+Pillow's pixel buffers), plus stage totals. --slowest N lists the N images
+that took longest.
 """
 
 import os
-import re
-import glob
-from PIL import Image
+import json
+import hashlib
+import io
+import sys
+import math
+import time
+import argparse
+import resource
+import tracemalloc
+from datetime import datetime, timezone
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from PIL import ExifTags, Image, ImageCms, ImageOps
+
+from html_rewrite import DEFAULT_SIZES, WEBP_SOURCE_PATTERN, find_pages, rewrite_pages
+from placeholders import PLACEHOLDERS_PATH, build_placeholders
+
+# HEIC/HEIF decoding is optional: pip install pillow-heif
+try:
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+    HEIC_SUPPORTED = True
+except ImportError:
+    HEIC_SUPPORTED = False
+
+# AVIF encoding needs Pillow >= 11.2 or: pip install pillow-avif-plugin
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+except ImportError:
+    pass
+
+# NumPy is only needed for --target-ssim
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Configuration
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(PROJECT_ROOT, 'assets')
 WEBP_QUALITY = 80
+WEBP_METHOD = 6
+AVIF_QUALITY = 60
+AVIF_SPEED = 4
 MAX_WIDTH = 1920  # Max width for content images
 ICON_MAX_WIDTH = 512  # Max width for icons (smaller)
 
+# Responsive variants: extra widths generated for content images, written next
+# to the main WebP as name-480w.webp etc. and referenced from <img srcset>.
+SRCSET_WIDTHS = (480, 960, 1440)
+
+# Large sources: JPEGs are decoded at a reduced DCT scale (1/2, 1/4, 1/8)
+# that still leaves DRAFT_REDUCING_GAP x the target width, and the final
+# LANCZOS resample first does a cheap integer reduce() down to
+# REDUCING_GAP x the target. Sources still above BAND_PIXELS after decoding
+# are resampled BAND_ROWS output rows at a time.
+DRAFT_REDUCING_GAP = 2.0
+REDUCING_GAP = 3.0
+BAND_PIXELS = 50_000_000
+BAND_ROWS = 256
+
+# Perceptual quality search (--target-ssim): binary search over this quality
+# range, measuring SSIM on the luma plane downscaled to SSIM_ANALYSIS_WIDTH
+# with SSIM_BLOCK x SSIM_BLOCK windows. Trial encodes use a faster method.
+QUALITY_SEARCH_RANGE = (30, 95)
+SSIM_ANALYSIS_WIDTH = 1024
+SSIM_BLOCK = 8
+SEARCH_WEBP_METHOD = 4
+SEARCH_AVIF_SPEED = 8
+
 # File extensions to convert
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+# Phone originals. Only used when no JPG/PNG export with the same name sits
+# next to them, since both would produce the same .webp.
+HEIC_EXTENSIONS = {'.heic', '.heif'}
 # Extensions to skip (keep as-is because they're small logos/icons that need transparency)
 SKIP_FILES = {'favicon.png'}
 
+# Parallel mode: how many conversions may be queued per worker, and how many
+# times an image is retried after its worker process died under it.
+QUEUE_DEPTH_PER_WORKER = 2
+MAX_CRASH_RETRIES = 2
 
-def convert_image(input_path, output_path, max_width):
-    """Convert a single image to WebP format with resizing."""
+# Incremental builds
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, '.optimize_manifest.json')
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+REPORT_VERSION = 2
+
+
+def variant_widths(max_width):
+    """srcset widths to generate below max_width (icons get none)."""
+    if max_width != MAX_WIDTH:
+        return ()
+    return tuple(w for w in SRCSET_WIDTHS if w < max_width)
+
+
+def variant_path(output_path, width):
+    """assets/images/foo.webp -> assets/images/foo-480w.webp"""
+    name, ext = os.path.splitext(output_path)
+    return f"{name}-{width}w{ext}"
+
+
+def normalize_image(img):
+    """
+    Apply EXIF orientation, convert embedded colour profiles (e.g. Display P3
+    from iPhone HEICs) to sRGB, and drop metadata such as GPS position so
+    none of it is carried into the encoded output.
+    """
+    img = ImageOps.exif_transpose(img)
+
+    icc_profile = img.info.get('icc_profile')
+    if icc_profile:
+        has_alpha = img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+        # Grey, CMYK and RGB data go through the profile in their own mode;
+        # palettes (RGB entries) and anything else are expanded to RGB(A) first
+        if img.mode not in ('RGB', 'RGBA', 'L', 'LA', 'CMYK'):
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        alpha = None
+        if img.mode == 'LA':
+            # LittleCMS has no grey + alpha input: transform the grey band alone
+            alpha = img.getchannel('A')
+            img = img.convert('L')
+        output_mode = 'RGBA' if img.mode == 'RGBA' else 'RGB'
+        try:
+            img = ImageCms.profileToProfile(
+                img, ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)),
+                ImageCms.createProfile('sRGB'), outputMode=output_mode)
+        except ImageCms.PyCMSError:
+            # The profile does not describe this kind of data; keep the pixels as they are
+            img = img.convert(output_mode)
+        if alpha is not None:
+            img.putalpha(alpha)
+
+    for key in ('exif', 'xmp', 'XML:com.adobe.xmp', 'icc_profile'):
+        img.info.pop(key, None)
+    return img
+
+
+def draft_for_width(img, max_width):
+    """
+    Ask the JPEG decoder for the smallest DCT scale that keeps the image at
+    least DRAFT_REDUCING_GAP x max_width wide once EXIF-rotated. No-op for
+    other formats and for images that don't need shrinking.
+    """
+    if img.format != 'JPEG':
+        return
+    width, height = img.size
+    # Stored sideways (EXIF orientation 5-8): the display width is the stored height
+    sideways = img.getexif().get(ExifTags.Base.Orientation, 1) in (5, 6, 7, 8)
+    if sideways:
+        width, height = height, width
+    target = max_width * DRAFT_REDUCING_GAP
+    if width <= target:
+        return
+    size = (math.ceil(target), math.ceil(height * target / width))
+    img.draft(None, size[::-1] if sideways else size)
+
+
+def resize_in_bands(img, size, band_rows=BAND_ROWS):
+    """
+    img.resize(size, LANCZOS) computed one band of output rows at a time.
+    A direct resize holds a (new width x full source height) intermediate
+    on top of the source; here only band-sized crops and intermediates
+    exist at once. Each band's crop includes the filter's support rows so
+    the result matches the direct resize.
+    """
+    width, height = size
+    scale = img.height / height
+    margin = math.ceil(3 * max(scale, 1)) + 1  # LANCZOS support in source rows
+    resized = Image.new(img.mode, size)
+    for top in range(0, height, band_rows):
+        bottom = min(height, top + band_rows)
+        src_top, src_bottom = top * scale, bottom * scale
+        crop_top = max(0, math.floor(src_top) - margin)
+        crop_bottom = min(img.height, math.ceil(src_bottom) + margin)
+        band = img.crop((0, crop_top, img.width, crop_bottom))
+        resized.paste(band.resize((width, bottom - top), Image.LANCZOS,
+                                  box=(0, src_top - crop_top, img.width, src_bottom - crop_top)),
+                      (0, top))
+    return resized
+
+
+def downscale(img, size):
+    """High-quality resize of a (possibly huge) decoded image to size."""
+    if img.width * img.height > BAND_PIXELS and img.mode in ('RGB', 'RGBA'):
+        return resize_in_bands(img, size)
+    return img.resize(size, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def avif_supported():
+    """True if Pillow can write AVIF (natively or through pillow-avif-plugin)."""
+    Image.init()
+    return 'AVIF' in Image.SAVE
+
+
+def save_encoded(img, path_or_buffer, fmt, quality, search=False):
+    """Encode img as WEBP or AVIF; search=True uses the faster trial settings."""
+    if fmt == 'WEBP':
+        method = SEARCH_WEBP_METHOD if search else WEBP_METHOD
+        img.save(path_or_buffer, 'WEBP', quality=quality, method=method)
+    else:
+        speed = SEARCH_AVIF_SPEED if search else AVIF_SPEED
+        img.save(path_or_buffer, 'AVIF', quality=quality, speed=speed)
+
+
+def luma_plane(img):
+    """Downscaled luma plane as a float array, for SSIM comparisons."""
+    img = img.convert('L')
+    if img.width > SSIM_ANALYSIS_WIDTH:
+        height = max(SSIM_BLOCK, round(img.height * SSIM_ANALYSIS_WIDTH / img.width))
+        img = img.resize((SSIM_ANALYSIS_WIDTH, height), Image.BILINEAR)
+    return np.asarray(img, dtype=np.float64)
+
+
+def ssim(reference, candidate):
+    """Mean SSIM over non-overlapping SSIM_BLOCK windows of two luma planes."""
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    h = reference.shape[0] // SSIM_BLOCK * SSIM_BLOCK
+    w = reference.shape[1] // SSIM_BLOCK * SSIM_BLOCK
+    if not h or not w:
+        return 1.0 if np.array_equal(reference, candidate) else 0.0
+
+    def blocks(plane):
+        return (plane[:h, :w]
+                .reshape(h // SSIM_BLOCK, SSIM_BLOCK, w // SSIM_BLOCK, SSIM_BLOCK)
+                .swapaxes(1, 2)
+                .reshape(-1, SSIM_BLOCK * SSIM_BLOCK))
+
+    x = blocks(reference)
+    y = blocks(candidate)
+    mu_x = x.mean(axis=1)
+    mu_y = y.mean(axis=1)
+    var_x = x.var(axis=1)
+    var_y = y.var(axis=1)
+    cov = ((x - mu_x[:, None]) * (y - mu_y[:, None])).mean(axis=1)
+    score = (((2 * mu_x * mu_y + c1) * (2 * cov + c2)) /
+             ((mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2)))
+    return float(score.mean())
+
+
+def search_quality(img, fmt, target):
+    """Lowest quality in QUALITY_SEARCH_RANGE whose encode scores >= target SSIM."""
+    reference = luma_plane(img)
+    low, high = QUALITY_SEARCH_RANGE
+    best = high
+    while low <= high:
+        quality = (low + high) // 2
+        buffer = io.BytesIO()
+        save_encoded(img, buffer, fmt, quality, search=True)
+        buffer.seek(0)
+        with Image.open(buffer) as decoded:
+            score = ssim(reference, luma_plane(decoded))
+        if score >= target:
+            best = quality
+            high = quality - 1
+        else:
+            low = quality + 1
+    return best
+
+
+def encode_format(img, output_path, max_width, fmt, quality):
+    """Write img and its srcset variants in one format; returns {width: path}."""
+    save_encoded(img, output_path, fmt, quality)
+
+    # Smaller srcset variants, resampled from the capped image
+    variants = {}
+    for width in variant_widths(max_width):
+        if width >= img.width:
+            continue
+        height = max(1, round(img.height * width / img.width))
+        path = variant_path(output_path, width)
+        save_encoded(img.resize((width, height), Image.LANCZOS), path, fmt, quality)
+        variants[width] = path
+    return variants
+
+
+def elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def max_rss_mb():
+    """RSS high-water mark of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def proc_status_mb(field):
+    """A memory field of /proc/self/status ('VmRSS', 'VmHWM') in MB; None off Linux."""
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """
+    Restart this process's RSS high-water mark at its current RSS (Linux
+    clear_refs). Returns False where that is not possible.
+    """
     try:
-        with Image.open(input_path) as img:
-            # Convert RGBA to RGB if needed (for JPG sources)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # Keep alpha for PNG files
-                if input_path.lower().endswith('.png'):
-                    pass  # Keep RGBA
-                else:
-                    img = img.convert('RGB')
-            elif img.mode != 'RGB':
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return proc_status_mb('VmHWM') is not None
+
+
+def encode_webp(input_path, output_path, max_width, options=None):
+    """
+    Resize and encode a single image to WebP, plus its srcset variants and,
+    with options['avif'], the same set as AVIF.
+    Returns {'width', 'height', 'quality', 'variants': {width: path}, 'avif',
+    'source_pixels', 'timings': {'decode_ms', 'resize_ms', 'encode_ms'}}.
+    Raises on failure.
+    """
+    options = options or {}
+    target = options.get('target_ssim')
+    timings = {}
+    start = time.perf_counter()
+    with Image.open(input_path) as img:
+        source_pixels = img.width * img.height
+        draft_for_width(img, max_width)
+        img = normalize_image(img)
+
+        # Convert RGBA to RGB if needed (for JPG sources)
+        if img.mode in ('RGBA', 'LA', 'P'):
+            # Keep alpha for PNG files
+            if input_path.lower().endswith('.png'):
+                pass  # Keep RGBA
+            else:
                 img = img.convert('RGB')
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+        img.load()
+        timings['decode_ms'] = elapsed_ms(start)
+
+        # Resize if wider than max_width
+        start = time.perf_counter()
+        if img.width > max_width:
+            ratio = max_width / img.width
+            new_height = int(img.height * ratio)
+            img = downscale(img, (max_width, new_height))
+        timings['resize_ms'] = elapsed_ms(start)
+
+        # Save as WebP (no EXIF/XMP/ICC: pixels are already upright and sRGB)
+        start = time.perf_counter()
+        quality = search_quality(img, 'WEBP', target) if target else WEBP_QUALITY
+        variants = encode_format(img, output_path, max_width, 'WEBP', quality)
+        info = {'width': img.width, 'height': img.height,
+                'quality': quality, 'variants': variants, 'avif': None,
+                'source_pixels': source_pixels, 'timings': timings}
+
+        if options.get('avif'):
+            avif_path = os.path.splitext(output_path)[0] + '.avif'
+            avif_quality = search_quality(img, 'AVIF', target) if target else AVIF_QUALITY
+            info['avif'] = {
+                'output': avif_path,
+                'quality': avif_quality,
+                'variants': encode_format(img, avif_path, max_width, 'AVIF', avif_quality),
+            }
+        timings['encode_ms'] = elapsed_ms(start)
+        return info
+
 
-            # Resize if wider than max_width
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), Image.LANCZOS)
-
-            # Save as WebP
-            img.save(output_path, 'WEBP', quality=WEBP_QUALITY, method=6)
-
-            # Report size reduction
-            original_size = os.path.getsize(input_path)
-            new_size = os.path.getsize(output_path)
-            reduction = (1 - new_size / original_size) * 100
-            print(f"  ✓ {os.path.basename(input_path)}: "
-                  f"{original_size / 1024:.0f}KB → {new_size / 1024:.0f}KB "
-                  f"({reduction:.0f}% smaller)")
-            return True
+def format_reduction(input_path, original_size, new_size):
+    """Format the per-image size-reduction line."""
+    reduction = (1 - new_size / original_size) * 100
+    return (f"  ✓ {os.path.basename(input_path)}: "
+            f"{original_size / 1024:.0f}KB → {new_size / 1024:.0f}KB "
+            f"({reduction:.0f}% smaller)")
+
+
+def convert_image(input_path, output_path, max_width, options=None):
+    """Convert a single image to WebP format with resizing."""
+    try:
+        encode_webp(input_path, output_path, max_width, options)
+
+        # Report size reduction
+        original_size = os.path.getsize(input_path)
+        new_size = os.path.getsize(output_path)
+        print(format_reduction(input_path, original_size, new_size))
+        return True
     except Exception as e:
         print(f"  ✗ Error converting {input_path}: {e}")
         return False
 
 
+def convert_job(job):
+    """
+    Worker entry point: convert one (input, output, max_width, options) job.
+    Returns (original_size, new_size, error, info) instead of printing, so
+    the parent process can report results in input order.
+
+    With options['profile'] info also gets 'memory': the tracemalloc peak
+    during this image and 'rss_growth_mb', how far the worker's RSS rose above
+    its level before the image (Pillow buffers included). Where the peak
+    cannot be reset (not Linux) the growth only shows for an image that
+    raised the worker's high-water mark.
+    """
+    input_path, output_path, max_width, options = job
+    original_size = os.path.getsize(input_path)
+    profile = bool(options and options.get('profile'))
+    if profile:
+        tracemalloc.start()
+        peak_reset = reset_peak_rss()
+        rss_before = proc_status_mb('VmRSS') if peak_reset else max_rss_mb()
+    start = time.perf_counter()
+    try:
+        info = encode_webp(input_path, output_path, max_width, options)
+        result = original_size, os.path.getsize(output_path), None, info
+    except Exception as e:
+        info = None
+        result = original_size, None, str(e), None
+    if profile:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_peak = proc_status_mb('VmHWM') if peak_reset else max_rss_mb()
+        if info is not None:
+            info['memory'] = {'tracemalloc_peak_mb': round(peak / (1024 * 1024), 2),
+                              'rss_growth_mb': round(max(0.0, rss_peak - rss_before), 1)}
+    if info is not None:
+        info['timings']['total_ms'] = elapsed_ms(start)
+    return result
+
+
+def run_isolated(job):
+    """
+    convert_job() in a worker of its own, retried up to MAX_CRASH_RETRIES times
+    if that worker dies. Returns convert_job()'s tuple, or a
+    'worker process crashed' failure.
+    """
+    for _ in range(MAX_CRASH_RETRIES + 1):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                return pool.submit(convert_job, job).result()
+            except BrokenProcessPool:
+                continue
+    return os.path.getsize(job[0]), None, 'worker process crashed', None
+
+
+def run_jobs(jobs, workers=1):
+    """
+    Convert every job, yielding (job, original_size, new_size, error, info)
+    in the same order as `jobs`.
+
+    With workers > 1 the jobs are spread over a process pool. At most
+    QUEUE_DEPTH_PER_WORKER jobs per worker are in flight at once. If a worker
+    dies (segfault, OOM kill) the jobs that were in flight are re-run one at a
+    time with run_isolated(), so only the image that kills its worker is
+    reported as failed; the jobs not yet submitted go to a fresh pool.
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield (job,) + convert_job(job)
+        return
+
+    results = {}
+    pending = list(range(len(jobs)))
+    next_to_report = 0
+    max_in_flight = workers * QUEUE_DEPTH_PER_WORKER
+
+    while pending:
+        queue = iter(pending)
+        pending = []
+        in_flight = {}
+        suspects = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                while True:
+                    while len(in_flight) < max_in_flight:
+                        index = next(queue, None)
+                        if index is None:
+                            break
+                        in_flight[pool.submit(convert_job, jobs[index])] = index
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        # result() raises BrokenProcessPool if the worker died;
+                        # the job then stays in in_flight and is re-run alone.
+                        results[in_flight[future]] = future.result()
+                        del in_flight[future]
+
+                    while next_to_report in results:
+                        yield (jobs[next_to_report],) + results.pop(next_to_report)
+                        next_to_report += 1
+            except BrokenProcessPool:
+                for future, index in in_flight.items():
+                    if future.done() and future.exception() is None:
+                        results[index] = future.result()
+                    else:
+                        suspects.append(index)
+                pending.extend(queue)
+                print(f"  ! Worker crashed, re-running {len(suspects)} in-flight images one at a time")
+
+        # Alone in a worker, a job can only be charged for its own crash
+        for index in sorted(suspects):
+            results[index] = run_isolated(jobs[index])
+
+        while next_to_report in results:
+            yield (jobs[next_to_report],) + results.pop(next_to_report)
+            next_to_report += 1
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_key(path):
+    """Cheap change detector: [size, mtime_ns]. Used to avoid rehashing."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def encoder_settings(max_width, options=None):
+    """Everything that affects the bytes of an encoded output."""
+    options = options or {}
+    settings = {'format': 'webp', 'quality': WEBP_QUALITY, 'method': WEBP_METHOD,
+                'orientation': 'exif', 'colorspace': 'srgb', 'metadata': 'stripped',
+                'downscale': {'draft_gap': DRAFT_REDUCING_GAP, 'reducing_gap': REDUCING_GAP},
+                'max_width': max_width, 'srcset_widths': list(variant_widths(max_width))}
+    if options.get('target_ssim'):
+        settings['quality'] = None
+        settings['target_ssim'] = options['target_ssim']
+        settings['quality_search_range'] = list(QUALITY_SEARCH_RANGE)
+        settings['ssim_analysis'] = [SSIM_ANALYSIS_WIDTH, SSIM_BLOCK]
+    if options.get('avif'):
+        settings['avif'] = {'quality': AVIF_QUALITY, 'speed': AVIF_SPEED}
+    return settings
+
+
+def _relative_outputs(info):
+    """Paths (relative to PROJECT_ROOT) of the variants and AVIF files in info."""
+    variants = {str(w): os.path.relpath(path, PROJECT_ROOT)
+                for w, path in sorted(info['variants'].items())}
+    avif = None
+    if info.get('avif'):
+        avif = {
+            'output': os.path.relpath(info['avif']['output'], PROJECT_ROOT),
+            'quality': info['avif']['quality'],
+            'variants': {str(w): os.path.relpath(path, PROJECT_ROOT)
+                         for w, path in sorted(info['avif']['variants'].items())},
+        }
+    return variants, avif
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the manifest, starting fresh if it is missing, corrupt or outdated."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            manifest.setdefault('images', {})
+            manifest.setdefault('html', {})
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'images': {}, 'html': {}}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest atomically so an interrupted run can't corrupt it."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _matches_recorded(entry, kind, path):
+    """
+    True if path still has the content recorded as entry[kind + '_hash']
+    (stat fast path, then hash). When only the stat changed (a checkout or
+    copy touches mtimes) the entry's stat is refreshed, so the next run takes
+    the fast path again once the manifest is saved.
+    """
+    stat = stat_key(path)
+    if stat == entry.get(kind + '_stat'):
+        return True
+    if file_digest(path) != entry.get(kind + '_hash'):
+        return False
+    entry[kind + '_stat'] = stat
+    return True
+
+
+def is_up_to_date(manifest, input_path, output_path, max_width, options=None):
+    """
+    True if output_path was produced from the current input bytes with current
+    settings. May refresh the entry's recorded stats (see _matches_recorded).
+    """
+    entry = manifest['images'].get(os.path.relpath(input_path, PROJECT_ROOT))
+    if not entry or entry.get('settings') != encoder_settings(max_width, options):
+        return False
+    if entry.get('output') != os.path.relpath(output_path, PROJECT_ROOT):
+        return False
+    if not os.path.exists(output_path):
+        return False
+    extra_outputs = list(entry.get('variants', {}).values())
+    if entry.get('avif'):
+        extra_outputs.append(entry['avif']['output'])
+        extra_outputs.extend(entry['avif']['variants'].values())
+    if not all(os.path.exists(os.path.join(PROJECT_ROOT, path)) for path in extra_outputs):
+        return False
+    return (_matches_recorded(entry, 'source', input_path) and
+            _matches_recorded(entry, 'output', output_path))
+
+
+def record_conversion(manifest, input_path, output_path, max_width, info, options=None):
+    """Store the source/settings/output fingerprint for a finished conversion."""
+    variants, avif = _relative_outputs(info)
+    manifest['images'][os.path.relpath(input_path, PROJECT_ROOT)] = {
+        'source_hash': file_digest(input_path),
+        'source_stat': stat_key(input_path),
+        'settings': encoder_settings(max_width, options),
+        'output': os.path.relpath(output_path, PROJECT_ROOT),
+        'output_hash': file_digest(output_path),
+        'output_stat': stat_key(output_path),
+        'width': info['width'],
+        'height': info['height'],
+        'quality': info['quality'],
+        'variants': variants,
+        'avif': avif,
+    }
+
+
 def find_images(directory):
     """Find all convertible images in the assets directory."""
     images = []
     for root, dirs, files in os.walk(directory):
+        exported = {os.path.splitext(file)[0] for file in files
+                    if os.path.splitext(file)[1].lower() in IMAGE_EXTENSIONS}
         for file in files:
             name, ext = os.path.splitext(file)
-            if ext.lower() in IMAGE_EXTENSIONS and file not in SKIP_FILES:
+            if file in SKIP_FILES:
+                continue
+            if ext.lower() in IMAGE_EXTENSIONS:
+                images.append(os.path.join(root, file))
+            elif ext.lower() in HEIC_EXTENSIONS and HEIC_SUPPORTED and name not in exported:
                 images.append(os.path.join(root, file))
     return images
 
 
-def update_html_references(project_root):
-    """Update all HTML files to reference .webp images instead of original formats."""
-    html_files = glob.glob(os.path.join(project_root, '*.html'))
-    # Pattern to match image references in src, poster attributes
-    # Matches: assets/images/IMG_3229.JPG or assets/icons/header_logo.png etc.
-    pattern = re.compile(
-        r'(assets/(?:images|icons)/[^"\'>\s]+?)\.(jpg|jpeg|png|JPG|JPEG|PNG)',
-        re.IGNORECASE
-    )
+def count_skipped_heic(directory):
+    """Number of HEIC files find_images() ignored because pillow-heif is missing."""
+    if HEIC_SUPPORTED:
+        return 0
+    return sum(1 for root, dirs, files in os.walk(directory) for file in files
+               if os.path.splitext(file)[1].lower() in HEIC_EXTENSIONS)
+
+
+def _srcset(output, width, variants):
+    """
+    'a-480w.webp 480w, ..., a.webp 1920w' from a manifest output + variants.
+    URLs are percent-encoded: a space or comma in a file name would otherwise
+    split the candidate.
+    """
+    def url(path):
+        return quote(path.replace(os.sep, '/'), safe='/')
+
+    candidates = [f"{url(path)} {w}w" for w, path in
+                  sorted(variants.items(), key=lambda item: int(item[0]))]
+    candidates.append(f"{url(output)} {width}w" if variants else url(output))
+    return ', '.join(candidates)
+
+
+def build_srcset_index(manifest):
+    """
+    Map each WebP output path to {'srcset', 'avif_srcset'} from the manifest.
+    Either value is None when there is nothing to add for that image.
+    """
+    index = {}
+    for entry in manifest['images'].values():
+        variants = entry.get('variants')
+        avif = entry.get('avif')
+        if not variants and not avif:
+            continue
+        index[entry['output'].replace(os.sep, '/')] = {
+            'srcset': _srcset(entry['output'], entry['width'], variants) if variants else None,
+            'avif_srcset': (_srcset(avif['output'], entry['width'], avif['variants'])
+                            if avif else None),
+        }
+    return index
 
+
+def html_rules_fingerprint(pattern, srcset_index):
+    """Identifies the rewrite rules; a change invalidates every recorded HTML file."""
+    rules = (pattern.pattern + '|' + ','.join(sorted(SKIP_FILES)) + '|' +
+             DEFAULT_SIZES + '|' + json.dumps(srcset_index, sort_keys=True))
+    return hashlib.sha256(rules.encode('utf-8')).hexdigest()
+
+
+def update_html_references(project_root, manifest=None, jobs=1):
+    """
+    Update all HTML files to reference .webp images instead of original formats,
+    and give <img> tags a srcset pointing at the generated width variants.
+    """
+    # HTML files whose size/mtime match the state recorded after the last pass
+    # have nothing left to rewrite and are not even opened.
+    html_state = {}
+    srcset_index = {}
+    if manifest is not None:
+        srcset_index = build_srcset_index(manifest)
+        rules = html_rules_fingerprint(WEBP_SOURCE_PATTERN, srcset_index)
+        if manifest.get('html_rules') != rules:
+            manifest['html'] = {}
+            manifest['html_rules'] = rules
+        html_state = manifest['html']
+
+    html_files = []
+    unchanged_count = 0
+    for html_file in find_pages(project_root):
+        if html_state.get(os.path.relpath(html_file, project_root)) == stat_key(html_file):
+            unchanged_count += 1
+        else:
+            html_files.append(html_file)
+
+    chain = [('webp-references', {'skip_files': sorted(SKIP_FILES), 'srcset_index': srcset_index})]
     updated_count = 0
-    for html_file in html_files:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        original_content = content
-
-        def replace_ref(match):
-            full_path = match.group(1)
-            ext = match.group(2)
-            basename = os.path.basename(full_path) + '.' + ext
-            # Skip favicon
-            if basename in SKIP_FILES:
-                return match.group(0)
-            return full_path + '.webp'
-
-        content = pattern.sub(replace_ref, content)
-
-        if content != original_content:
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+    for result in rewrite_pages(html_files, chain, jobs=jobs):
+        html_file = result['path']
+        if result['error']:
+            print(f"  ✗ Error updating {os.path.basename(html_file)}: {result['error']}")
+            continue
+        if result['changed']:
             updated_count += 1
             print(f"  ✓ Updated references in {os.path.basename(html_file)}")
+        if manifest is not None:
+            html_state[os.path.relpath(html_file, project_root)] = stat_key(html_file)
 
+    if unchanged_count:
+        print(f"  Skipped {unchanged_count} unchanged HTML files.")
     print(f"\n  Updated {updated_count} HTML files.")
 
 
+def report_row(job, original_size, new_size, error, info):
+    """One image's entry in the --report JSON."""
+    input_path, output_path, max_width, _ = job
+    row = {'input': os.path.relpath(input_path, PROJECT_ROOT),
+           'output': os.path.relpath(output_path, PROJECT_ROOT),
+           'max_width': max_width, 'input_bytes': original_size,
+           'output_bytes': new_size, 'error': error}
+    if info is not None:
+        row.update(info['timings'])
+        row['source_pixels'] = info['source_pixels']
+        row['output_pixels'] = info['width'] * info['height']
+        row['variant_bytes'] = sum(os.path.getsize(path) for path in info['variants'].values())
+        row.update(info.get('memory', {}))
+    return row
+
+
+def build_report(rows, stages, workers, options):
+    """The --report document: per-image rows, per-stage and summed totals."""
+    converted = [row for row in rows if row['error'] is None]
+    totals = {field: round(sum(row[field] for row in converted), 2)
+              for field in ('decode_ms', 'resize_ms', 'encode_ms', 'total_ms')}
+    totals.update({
+        'images': len(rows),
+        'failed': len(rows) - len(converted),
+        'input_bytes': sum(row['input_bytes'] for row in rows),
+        'output_bytes': sum(row['output_bytes'] for row in converted),
+        'variant_bytes': sum(row['variant_bytes'] for row in converted),
+        'source_pixels': sum(row['source_pixels'] for row in converted),
+    })
+    peaks = {field: max((row[field] for row in converted if field in row), default=None)
+             for field in ('tracemalloc_peak_mb', 'rss_growth_mb')}
+    peaks['main_process_rss_mb'] = max_rss_mb()
+    return {
+        'version': REPORT_VERSION,
+        'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'workers': workers,
+        'options': {key: value for key, value in options.items() if key != 'profile'},
+        'stages': stages,
+        'totals': totals,
+        'peak_memory': peaks,
+        'images': rows,
+    }
+
+
+def write_report(report, path):
+    """Write the run report atomically."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def print_slowest(rows, count):
+    """Print the count images that took longest to convert."""
+    timed = sorted((row for row in rows if 'total_ms' in row), key=lambda row: row['total_ms'], reverse=True)
+    if not timed:
+        return
+    print(f"\nSlowest {min(count, len(timed))} images:")
+    for row in timed[:count]:
+        megapixels = row['source_pixels'] / 1_000_000
+        print(f"  {row['total_ms'] / 1000:6.2f}s  {row['input']} ({megapixels:.1f} MP: "
+              f"decode {row['decode_ms']:.0f}ms, resize {row['resize_ms']:.0f}ms, "
+              f"encode {row['encode_ms']:.0f}ms"
+              + (f", RSS +{row['rss_growth_mb']:.0f} MB)" if 'rss_growth_mb' in row else ")"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Convert JPG/PNG assets to WebP and update HTML references.")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Number of worker processes (0 = one per CPU core). Default: 1")
+    parser.add_argument('--force', action='store_true',
+                        help="Ignore the manifest and re-encode / re-scan everything")
+    parser.add_argument('--target-ssim', type=float, default=None, metavar='SSIM',
+                        help="Pick the lowest quality per image whose SSIM stays above "
+                             "this value (e.g. 0.99) instead of a fixed quality. Needs NumPy")
+    parser.add_argument('--avif', action='store_true',
+                        help="Also write .avif copies and wrap <img> tags in <picture>")
+    parser.add_argument('--report', metavar='FILE',
+                        help="Write per-image timing and memory figures as JSON")
+    parser.add_argument('--slowest', type=int, default=0, metavar='N',
+                        help="List the N images that took longest to convert")
+    args = parser.parse_args()
+    if args.target_ssim is not None and not 0 < args.target_ssim < 1:
+        parser.error("--target-ssim must be between 0 and 1")
+    if args.target_ssim is not None and np is None:
+        parser.error("--target-ssim needs NumPy (pip install numpy)")
+    if args.avif and not avif_supported():
+        parser.error("--avif needs Pillow >= 11.2 or pillow-avif-plugin")
+    return args
+
+
 def main():
+    args = parse_args()
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    options = {'target_ssim': args.target_ssim, 'avif': args.avif, 'profile': bool(args.report)}
+    stages = {}
+    manifest = load_manifest()
+    if args.force:
+        manifest['images'] = {}
+        manifest['html'] = {}
+
     print("=" * 50)
     print("YOLO Living - Image Optimizer")
     print("=" * 50)
 
     # Step 1: Find all images
+    start = time.perf_counter()
     images = find_images(ASSETS_DIR)
-    print(f"\nFound {len(images)} images to convert.\n")
+    print(f"\nFound {len(images)} images to convert.")
+    skipped_heic = count_skipped_heic(ASSETS_DIR)
+    if skipped_heic:
+        print(f"  ! Ignoring {skipped_heic} HEIC files (pip install pillow-heif to convert them)")
+    print()
 
     # Step 2: Convert images
-    print("Converting images to WebP...")
+    if workers > 1:
+        print(f"Converting images to WebP ({workers} workers)...")
+    else:
+        print("Converting images to WebP...")
     total_original = 0
     total_new = 0
     converted = 0
+    up_to_date = 0
+    rows = []
 
+    jobs = []
     for img_path in images:
         name, ext = os.path.splitext(img_path)
         webp_path = name + '.webp'
@@ -132,22 +909,69 @@ def main():
         else:
             max_w = MAX_WIDTH
 
-        original_size = os.path.getsize(img_path)
+        if is_up_to_date(manifest, img_path, webp_path, max_w, options):
+            up_to_date += 1
+            continue
+
+        jobs.append((img_path, webp_path, max_w, options))
+
+    if up_to_date:
+        print(f"  Skipped {up_to_date} images already up to date.")
+    stages['scan_ms'] = elapsed_ms(start)
+    start = time.perf_counter()
+
+    # Forget sources that no longer exist
+    current = {os.path.relpath(p, PROJECT_ROOT) for p in images}
+    for rel_path in list(manifest['images']):
+        if rel_path not in current:
+            del manifest['images'][rel_path]
+
+    for job, original_size, new_size, error, info in run_jobs(jobs, workers):
+        img_path, webp_path, max_w, _ = job
         total_original += original_size
+        rows.append(report_row(job, original_size, new_size, error, info))
 
-        if convert_image(img_path, webp_path, max_w):
-            total_new += os.path.getsize(webp_path)
+        if error is None:
+            line = format_reduction(img_path, original_size, new_size)
+            if args.target_ssim:
+                line += f" [q{info['quality']}]"
+            print(line)
+            total_new += new_size
             converted += 1
+            record_conversion(manifest, img_path, webp_path, max_w, info, options)
+        else:
+            print(f"  ✗ Error converting {img_path}: {error}")
+    stages['convert_ms'] = elapsed_ms(start)
 
-    print(f"\n  Converted {converted}/{len(images)} images.")
+    print(f"\n  Converted {converted}/{len(jobs)} images.")
     print(f"  Total original: {total_original / (1024 * 1024):.1f} MB")
     print(f"  Total WebP:     {total_new / (1024 * 1024):.1f} MB")
-    print(f"  Saved:          {(total_original - total_new) / (1024 * 1024):.1f} MB "
-          f"({(1 - total_new / total_original) * 100:.0f}% reduction)\n")
+    if total_original:
+        print(f"  Saved:          {(total_original - total_new) / (1024 * 1024):.1f} MB "
+              f"({(1 - total_new / total_original) * 100:.0f}% reduction)")
+    print()
+
+    save_manifest(manifest)
 
     # Step 3: Update HTML references
     print("Updating HTML references...")
-    update_html_references(PROJECT_ROOT)
+    start = time.perf_counter()
+    update_html_references(PROJECT_ROOT, manifest, workers)
+    save_manifest(manifest)
+    stages['html_ms'] = elapsed_ms(start)
+
+    # Step 4: Refresh blurred placeholders for the new images
+    print("\nUpdating image placeholders...")
+    start = time.perf_counter()
+    placeholders, decoded = build_placeholders(PROJECT_ROOT, output_path=PLACEHOLDERS_PATH)
+    print(f"  {len(placeholders)} placeholders ({decoded} new or changed images).")
+    stages['placeholders_ms'] = elapsed_ms(start)
+
+    if args.slowest:
+        print_slowest(rows, args.slowest)
+    if args.report:
+        write_report(build_report(rows, stages, workers, options), args.report)
+        print(f"\n  Report written to {args.report}")
 
     print("\n" + "=" * 50)
     print("Optimization complete!")
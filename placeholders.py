@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Image Placeholders (LQIP)
+Computes a tiny blurred preview of every photo under assets/images so pages
+can paint colour immediately instead of blank boxes while the full image
+loads. Each entry in data/placeholders.json, keyed by site path, holds:
+  lqip   a ~20px blurred WebP as a data: URI (~200 bytes)
+  color  the average colour, for places where a data URI is too much
+
+Entries are cached in .placeholder_cache.json by file size and mtime, so
+reruns only decode new or changed images. optimize_images.py refreshes the
+placeholders after converting; build_deploy.py embeds them in the bundle's
+<img> tags and in data/blogs.json / data/experiences.json, and server.js adds
+them to /api/blogs and /api/experiences.
+
+Usage:
+  python3 placeholders.py
+"""
+
+import io
+import os
+import sys
+import json
+import base64
+import argparse
+from PIL import Image, ImageFilter, ImageOps
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(PROJECT_ROOT, 'assets', 'images')
+PLACEHOLDERS_PATH = os.path.join(PROJECT_ROOT, 'data', 'placeholders.json')
+CACHE_PATH = os.path.join(PROJECT_ROOT, '.placeholder_cache.json')
+
+PLACEHOLDER_SIZE = 20  # Longest side, in pixels
+PLACEHOLDER_BLUR = 0.6
+PLACEHOLDER_QUALITY = 40
+IMAGE_EXTENSIONS = {'.webp', '.avif', '.jpg', '.jpeg', '.png', '.gif'}
+
+# Bump when the placeholder settings change so cached entries are redone
+CACHE_VERSION = f"{PLACEHOLDER_SIZE}px-b{PLACEHOLDER_BLUR}-q{PLACEHOLDER_QUALITY}"
+
+
+def make_placeholder(path):
+    """
+    {'lqip': data URI, 'color': '#rrggbb'} for one image, or None for images
+    with transparency (a placeholder would show through them once loaded).
+    """
+    with Image.open(path) as img:
+        # JPEG: let the decoder downscale (DCT scaling) instead of decoding at full size
+        img.draft('RGB', (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info:
+            if img.convert('RGBA').getextrema()[3][0] < 255:
+                return None
+        img = img.convert('RGB')
+        img.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    img.filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR)).save(
+        buffer, 'WEBP', quality=PLACEHOLDER_QUALITY, method=6)
+    r, g, b = img.resize((1, 1), Image.BOX).getpixel((0, 0))
+    return {
+        'lqip': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii'),
+        'color': f'#{r:02x}{g:02x}{b:02x}',
+    }
+
+
+def find_images(root=PROJECT_ROOT):
+    """Site-relative paths of the photos under assets/images."""
+    paths = []
+    for dirpath, dirs, names in os.walk(os.path.join(root, 'assets', 'images')):
+        dirs.sort()
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        paths.extend(f'{rel_dir}/{name}' for name in sorted(names)
+                     if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS)
+    return paths
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('images', {}) if cache.get('version') == CACHE_VERSION else {}
+
+
+def save_json(data, path):
+    """Write JSON atomically."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def build_placeholders(root=PROJECT_ROOT, cache_path=CACHE_PATH, output_path=None):
+    """
+    {site path: {'lqip', 'color'}} for every photo, reusing cached entries
+    whose size and mtime still match. Written to output_path when given.
+    Returns (placeholders, number of images decoded).
+    """
+    cached = load_cache(cache_path)
+    images = {}
+    decoded = 0
+    for rel_path in find_images(root):
+        stat = os.stat(os.path.join(root, rel_path))
+        key = [stat.st_size, stat.st_mtime_ns]
+        entry = cached.get(rel_path)
+        if entry is None or entry['stat'] != key:
+            decoded += 1
+            try:
+                placeholder = make_placeholder(os.path.join(root, rel_path))
+            except OSError:
+                placeholder = None
+            entry = {'stat': key, 'placeholder': placeholder}
+        images[rel_path] = entry
+    save_json({'version': CACHE_VERSION, 'images': images}, cache_path)
+
+    placeholders = {p: e['placeholder'] for p, e in images.items() if e['placeholder']}
+    if output_path:
+        save_json(placeholders, output_path)
+    return placeholders, decoded
+
+
+def placeholder_for(placeholders, url):
+    """The placeholder for an image URL as used in HTML/JSON, or None."""
+    if not url or '://' in url or url.startswith('data:'):
+        return None
+    return placeholders.get(url.split('?')[0].split('#')[0].lstrip('/').removeprefix('./'))
+
+
+def embed_placeholders(items, placeholders, field='image'):
+    """
+    Copy of a list of data items (blogs, experiences) with 'placeholder' and
+    'placeholderColor' added wherever item[field] has a placeholder.
+    """
+    embedded = []
+    for item in items:
+        placeholder = placeholder_for(placeholders, item.get(field))
+        if placeholder:
+            item = dict(item, placeholder=placeholder['lqip'], placeholderColor=placeholder['color'])
+        embedded.append(item)
+    return embedded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate data/placeholders.json (blurred LQIP previews).")
+    parser.add_argument('--output', default=PLACEHOLDERS_PATH,
+                        help="Placeholder manifest (default: data/placeholders.json)")
+    args = parser.parse_args(argv)
+
+    placeholders, decoded = build_placeholders(output_path=args.output)
+    size = os.path.getsize(args.output)
+    print(f"  {len(placeholders)} placeholders ({decoded} images decoded), "
+          f"{os.path.relpath(args.output, PROJECT_ROOT)}: {size / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Precompression
+Writes maximum-level gzip (.gz) and Brotli (.br) siblings next to every
+compressible file of a built bundle, so the host can serve them as-is instead
+of compressing on the fly at a low level (or not at all).
+
+A sibling is only kept when it beats the original by MIN_SAVING. Compressed
+output is cached by content hash in .precompress_cache/, so files that did not
+change between builds are copied from the cache instead of recompressed.
+
+Brotli needs: pip install brotli (without it only .gz files are written).
+
+Usage:
+  python3 precompress.py deploy_build
+  python3 build_deploy.py              # runs this as part of the build
+"""
+
+import os
+import sys
+import json
+import gzip
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Brotli is optional: pip install brotli
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(PROJECT_ROOT, '.precompress_cache')
+CACHE_INDEX = 'index.json'
+
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.xml', '.txt', '.ico', '.map'}
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Skip tiny files, and siblings that are not at least 10% smaller
+MIN_SIZE = 256
+MIN_SAVING = 0.10
+
+# Bump when the compression settings change so cached output is redone
+CACHE_VERSION = f"gzip{GZIP_LEVEL}-br{BROTLI_QUALITY}"
+
+# Serve the siblings to clients that accept them (Apache / LiteSpeed)
+HTACCESS_RULES = """<IfModule mod_rewrite.c>
+    RewriteEngine On
+    RewriteCond %{HTTP:Accept-Encoding} br
+    RewriteCond %{REQUEST_FILENAME}.br -f
+    RewriteRule ^(.+)$ $1.br [L]
+    RewriteCond %{HTTP:Accept-Encoding} gzip
+    RewriteCond %{REQUEST_FILENAME}.gz -f
+    RewriteRule ^(.+)$ $1.gz [L]
+    RewriteRule \\.html\\.(br|gz)$ - [T=text/html,E=no-gzip:1]
+    RewriteRule \\.css\\.(br|gz)$ - [T=text/css,E=no-gzip:1]
+    RewriteRule \\.js\\.(br|gz)$ - [T=text/javascript,E=no-gzip:1]
+    RewriteRule \\.json\\.(br|gz)$ - [T=application/json,E=no-gzip:1]
+    RewriteRule \\.svg\\.(br|gz)$ - [T=image/svg+xml,E=no-gzip:1]
+    RewriteRule \\.xml\\.(br|gz)$ - [T=application/xml,E=no-gzip:1]
+    RewriteRule \\.txt\\.(br|gz)$ - [T=text/plain,E=no-gzip:1]
+</IfModule>
+<IfModule mod_headers.c>
+    <FilesMatch "\\.br$">
+        Header set Content-Encoding br
+        Header append Vary Accept-Encoding
+    </FilesMatch>
+    <FilesMatch "\\.gz$">
+        Header set Content-Encoding gzip
+        Header append Vary Accept-Encoding
+    </FilesMatch>
+</IfModule>
+"""
+
+
+def encodings():
+    """Sibling suffixes written in this environment."""
+    return ['.gz', '.br'] if brotli is not None else ['.gz']
+
+
+def compress(data, suffix):
+    if suffix == '.gz':
+        # mtime=0 keeps the output byte-identical between builds
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+def worth_keeping(original_size, compressed_size):
+    return compressed_size <= original_size * (1 - MIN_SAVING)
+
+
+def compress_job(job):
+    """Worker: (digest, path, suffixes) -> (digest, {suffix: bytes or None})."""
+    digest, path, suffixes = job
+    with open(path, 'rb') as f:
+        data = f.read()
+    results = {}
+    for suffix in suffixes:
+        compressed = compress(data, suffix)
+        results[suffix] = compressed if worth_keeping(len(data), len(compressed)) else None
+    return digest, results
+
+
+def find_compressible(directory):
+    """Paths of the files under directory that get siblings."""
+    paths = []
+    for root, dirs, names in os.walk(directory):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if (os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS
+                    and os.path.getsize(path) >= MIN_SIZE):
+                paths.append(path)
+    return paths
+
+
+def load_index(cache_dir):
+    """{digest: {suffix: compressed size or None}} for the current settings."""
+    try:
+        with open(os.path.join(cache_dir, CACHE_INDEX), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index.get('entries', {}) if index.get('version') == CACHE_VERSION else {}
+
+
+def save_index(cache_dir, entries):
+    """Write the cache index atomically."""
+    path = os.path.join(cache_dir, CACHE_INDEX)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'entries': entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def cached_blob(cache_dir, digest, suffix):
+    return os.path.join(cache_dir, digest[:2], digest + suffix)
+
+
+def precompress_dir(directory, cache_dir=CACHE_DIR, workers=None):
+    """
+    Write .gz/.br siblings for every compressible file under directory.
+    Returns stats: files, compressed (cache misses), siblings written,
+    original bytes and sibling bytes per suffix.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    entries = load_index(cache_dir)
+    suffixes = encodings()
+
+    files = {}
+    for path in find_compressible(directory):
+        with open(path, 'rb') as f:
+            files[path] = hashlib.sha256(f.read()).hexdigest()
+
+    # One job per distinct content still missing an encoding in the cache
+    jobs = {}
+    for path, digest in files.items():
+        entry = entries.get(digest, {})
+        missing = [s for s in suffixes
+                   if s not in entry or (entry[s] is not None
+                                         and not os.path.exists(cached_blob(cache_dir, digest, s)))]
+        if missing and digest not in jobs:
+            jobs[digest] = (digest, path, missing)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for digest, results in executor.map(compress_job, jobs.values()):
+                entry = entries.setdefault(digest, {})
+                for suffix, compressed in results.items():
+                    if compressed is None:
+                        entry[suffix] = None
+                        continue
+                    blob = cached_blob(cache_dir, digest, suffix)
+                    os.makedirs(os.path.dirname(blob), exist_ok=True)
+                    with open(blob, 'wb') as f:
+                        f.write(compressed)
+                    entry[suffix] = len(compressed)
+        save_index(cache_dir, entries)
+
+    stats = {'files': len(files), 'compressed': len(jobs), 'siblings': 0,
+             'original': {s: 0 for s in suffixes}, 'output': {s: 0 for s in suffixes}}
+    for path, digest in files.items():
+        size = os.path.getsize(path)
+        for suffix in suffixes:
+            compressed_size = entries[digest].get(suffix)
+            if compressed_size is None:
+                continue
+            with open(cached_blob(cache_dir, digest, suffix), 'rb') as src, \
+                    open(path + suffix, 'wb') as dst:
+                dst.write(src.read())
+            stats['siblings'] += 1
+            stats['original'][suffix] += size
+            stats['output'][suffix] += compressed_size
+    return stats
+
+
+def print_stats(stats):
+    print(f"  Precompressed {stats['files']} files "
+          f"({stats['compressed']} compressed, {stats['files'] - stats['compressed']} from cache)")
+    for suffix, original in stats['original'].items():
+        if original:
+            output = stats['output'][suffix]
+            print(f"    {suffix}: {original / 1024:.0f} KB -> {output / 1024:.0f} KB "
+                  f"({100 * (1 - output / original):.0f}% smaller)")
+    if brotli is None:
+        print("  ! brotli not installed, only .gz siblings written (pip install brotli)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write .gz/.br siblings for a built bundle.")
+    parser.add_argument('directory', help="Bundle directory, e.g. deploy_build")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Worker processes (default: all CPUs)")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.directory):
+        parser.error(f"not a directory: {args.directory}")
+
+    print_stats(precompress_dir(args.directory, workers=args.jobs or None))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
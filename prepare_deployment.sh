@@ -15,45 +15,10 @@ echo "Building minified assets..."
 mkdir -p dist
 npm run build
 
-# Copy files to deploy directory
-echo "Copying files to $DEPLOY_DIR..."
-mkdir "$DEPLOY_DIR"
-
-rsync -av --progress . "$DEPLOY_DIR" \
-    --exclude node_modules \
-    --exclude .git \
-    --exclude .DS_Store \
-    --exclude "$DEPLOY_DIR" \
-    --exclude "$ZIP_FILE" \
-    --exclude "*.py" \
-    --exclude "server.js" \
-    --exclude "package.json" \
-    --exclude "package-lock.json" \
-    --exclude "README.md" \
-    --exclude "LICENSE" \
-    --exclude ".vscode" \
-    --exclude ".idea" \
-    --exclude "admin" \
-    --exclude "prepare_deployment.sh" \
-    --exclude "eslint.config.mjs" \
-    --exclude ".prettierrc" \
-    --exclude ".gitignore" \
-    --exclude ".env" \
-    --exclude "dist" \
-    --exclude "Gemini.md" \
-    --exclude "brandguidelines.md" \
-    --exclude "*.JPG" \
-    --exclude "*.MOV"
-
-# Use minified CSS/JS in deploy
-cp dist/style.css "$DEPLOY_DIR/style.css"
-cp dist/script.js "$DEPLOY_DIR/script.js"
-
-# Create zip
-echo "Creating zip file $ZIP_FILE..."
-cd "$DEPLOY_DIR"
-zip -r "../$ZIP_FILE" .
-cd ..
+# Copy reachable files, swap in dist/ builds, fingerprint assets and zip
+# (see build_deploy.py)
+echo "Building $DEPLOY_DIR and $ZIP_FILE..."
+python3 build_deploy.py --out "$DEPLOY_DIR" --zip "$ZIP_FILE" || exit 1
 
 # Clean up deploy dir
 rm -rf "$DEPLOY_DIR"
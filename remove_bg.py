@@ -1,22 +1,9 @@
-from PIL import Image
-import os
+from logo_tools import process_file
 
 def remove_white_background(input_path, output_path):
     try:
-        img = Image.open(input_path).convert("RGBA")
-        datas = img.getdata()
-
-        newData = []
-        for item in datas:
-            # Change all white (also shades of whites)
-            # to transparent
-            if item[0] > 240 and item[1] > 240 and item[2] > 240:
-                newData.append((255, 255, 255, 0))
-            else:
-                newData.append(item)
-
-        img.putdata(newData)
-        img.save(output_path, "PNG")
+        # Change all white (also shades of whites) to transparent
+        process_file('white', input_path, output_path, 'PNG', threshold=240)
         print(f"Successfully saved transparent image to {output_path}")
     except Exception as e:
         print(f"Error processing image: {e}")
@@ -1,49 +1,10 @@
-from PIL import Image, ImageDraw
+from logo_tools import process_file
 
 def flood_fill_transparency(input_path, output_path, tolerance=30):
     try:
-        img = Image.open(input_path).convert("RGBA")
-        width, height = img.size
-        
-        # Get the background color from the top-left corner
-        bg_color = img.getpixel((0, 0))
-        
-        # Function to check if a pixel matches the background within tolerance
-        def match(pixel, target, tol):
-            return all(abs(p - t) <= tol for p, t in zip(pixel[:3], target[:3]))
-
-        # Flood fill algorithm
-        # We'll use a set of visited pixels and a stack for the fill
-        # Starting points: all 4 corners
-        stack = [(0, 0), (width-1, 0), (0, height-1), (width-1, height-1)]
-        visited = set()
-        
-        datas = img.load()
-        
-        while stack:
-            x, y = stack.pop()
-            
-            if (x, y) in visited:
-                continue
-            
-            visited.add((x, y))
-            
-            # If current pixel matches background, make it transparent
-            current_pixel = datas[x, y]
-            if match(current_pixel, bg_color, tolerance):
-                datas[x, y] = (0, 0, 0, 0) # Transparent
-                
-                # Check neighbors
-                neighbors = [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
-                for nx, ny in neighbors:
-                    if 0 <= nx < width and 0 <= ny < height:
-                        if (nx, ny) not in visited:
-                           stack.append((nx, ny))
-            else:
-                 # It's an edge or object, stop filling this branch
-                 pass
-
-        img.save(output_path, "PNG")
+        # Background colour is taken from the top-left corner and flood-filled
+        # (scanline, within tolerance) from all 4 corners to transparent.
+        process_file('flood', input_path, output_path, 'PNG', tolerance=tolerance)
         print(f"Successfully saved flood-filled transparent image to {output_path}")
 
     except Exception as e:
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Search Index
+Builds a compact inverted index over data/blogs.json, data/experiences.json
+and the experience-*.html pages for client-side search (site-search.js).
+
+data/search/index.json holds the document table, the tokenizer settings and
+a map of term prefix -> shard file. Each shard maps its terms to postings
+stored as one flat list [doc gap, weight, doc gap, weight, ...]: documents
+are sorted and every id after the first is the difference to the previous
+one, so long postings are mostly single digits. A query only fetches the
+shards for its own terms. Shards start at one character per prefix and are
+split further while larger than SHARD_BYTES; their names carry a content
+hash so they can be cached forever, and each gets .gz/.br siblings.
+
+build_deploy.py writes the index into the bundle (precompressed with the
+rest of it), so data/search/ in the tree is only for local testing.
+
+Usage:
+  python3 search_index.py              # write data/search/
+  python3 search_index.py --stats      # also print shard sizes
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import shutil
+import hashlib
+import argparse
+import unicodedata
+from html.parser import HTMLParser
+from collections import defaultdict
+
+from precompress import compress, encodings, worth_keeping
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'data', 'search')
+MANIFEST_NAME = 'index.json'
+INDEX_VERSION = 1
+
+BLOGS_FILE = 'data/blogs.json'
+EXPERIENCES_FILE = 'data/experiences.json'
+PAGE_PATTERN = 'experience-*.html'
+
+# Term weight per field: a title hit outranks a tag, which outranks body text
+FIELD_WEIGHTS = {'title': 8, 'tags': 4, 'excerpt': 2, 'body': 1}
+MIN_TERM_LENGTH = 2
+SNIPPET_LENGTH = 160
+SHARD_BYTES = 6 * 1024
+MAX_PREFIX_LENGTH = 3
+HASH_LENGTH = 8
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have how i in into is it its of on or our so
+than that the their them then there these they this to was we were what when where which
+who will with you your
+""".split())
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Page text that is the same on every page, or not text at all
+SKIPPED_TAGS = {'script', 'style', 'svg', 'noscript', 'header', 'nav', 'footer', 'form', 'template'}
+SKIPPED_CLASSES = {'mobile-nav-drawer', 'booking-overlay'}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+             'source', 'track', 'wbr'}
+
+
+def tokenize(text):
+    """Lowercase ASCII-folded terms (site-search.js does the same)."""
+    folded = unicodedata.normalize('NFKD', text.lower())
+    folded = ''.join(ch for ch in folded if not unicodedata.combining(ch))
+    return [term for term in TOKEN_PATTERN.findall(folded)
+            if len(term) >= MIN_TERM_LENGTH and term not in STOPWORDS]
+
+
+def snippet(text, length=SNIPPET_LENGTH):
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0] + '…'
+
+
+class PageText(HTMLParser):
+    """Title, description, headings and visible body text of one page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.description = ''
+        self.headings = []
+        self.body = []
+        self._skip_depth = 0
+        self._stack = []
+        self._in_title = False
+        self._heading = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta' and attrs.get('name') == 'description':
+            self.description = attrs.get('content') or ''
+        if tag in VOID_TAGS:
+            return
+        skip = tag in SKIPPED_TAGS or bool(SKIPPED_CLASSES & set((attrs.get('class') or '').split()))
+        self._stack.append((tag, skip))
+        self._skip_depth += skip
+        if tag == 'title':
+            self._in_title = True
+        elif tag in ('h1', 'h2', 'h3') and not self._skip_depth:
+            self._heading = []
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        # Pop up to the matching tag (closes anything left unclosed inside it)
+        while self._stack:
+            open_tag, skip = self._stack.pop()
+            self._skip_depth -= skip
+            if open_tag == tag:
+                break
+        if tag == 'title':
+            self._in_title = False
+        elif tag in ('h1', 'h2', 'h3') and self._heading is not None:
+            self.headings.append(' '.join(self._heading))
+            self._heading = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth and data.strip():
+            self.body.append(data.strip())
+            if self._heading is not None:
+                self._heading.append(data.strip())
+
+
+def blog_documents(items):
+    for item in items:
+        yield {
+            'type': 'blog',
+            'title': item.get('title', ''),
+            'url': f"blog.html#story-{item['id']}",
+            'excerpt': item.get('excerpt', ''),
+            'fields': {
+                'title': item.get('title', ''),
+                'tags': ' '.join(filter(None, [item.get('category'), item.get('tag')])),
+                'excerpt': item.get('excerpt', ''),
+                'body': ' '.join(item.get('body') or []),
+            },
+        }
+
+
+def experience_documents(items, page_texts):
+    """Experience cards; the detail page's text is merged into its card."""
+    for item in items:
+        page = page_texts.pop(item.get('link'), None)
+        tags = [item.get('category'), item.get('difficulty'), item.get('season'), item.get('meta')]
+        yield {
+            'type': 'experience',
+            'title': item.get('title', ''),
+            'url': item.get('link') or 'experience.html',
+            'excerpt': item.get('excerpt', ''),
+            'fields': {
+                'title': item.get('title', ''),
+                'tags': ' '.join(filter(None, tags + (page.headings if page else []))),
+                'excerpt': item.get('excerpt', ''),
+                'body': ' '.join(page.body) if page else '',
+            },
+        }
+
+
+def page_documents(page_texts):
+    """Experience pages without a card in data/experiences.json."""
+    for rel_path, page in sorted(page_texts.items()):
+        title = page.title.split('|')[0].strip()
+        yield {
+            'type': 'page',
+            'title': title,
+            'url': rel_path,
+            'excerpt': page.description,
+            'fields': {
+                'title': title,
+                'tags': ' '.join(page.headings),
+                'excerpt': page.description,
+                'body': ' '.join(page.body),
+            },
+        }
+
+
+def load_documents(root=PROJECT_ROOT):
+    """Every searchable document, in a stable order."""
+    def load_json(rel_path):
+        path = os.path.join(root, rel_path)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    page_texts = {}
+    for path in sorted(glob.glob(os.path.join(root, PAGE_PATTERN))):
+        parser = PageText()
+        with open(path, 'r', encoding='utf-8') as f:
+            parser.feed(f.read())
+        page_texts[os.path.relpath(path, root).replace(os.sep, '/')] = parser
+
+    documents = list(blog_documents(load_json(BLOGS_FILE)))
+    documents.extend(experience_documents(load_json(EXPERIENCES_FILE), page_texts))
+    documents.extend(page_documents(page_texts))
+    return documents
+
+
+def invert(documents):
+    """{term: [(doc id, weight), ...]} with doc ids ascending."""
+    postings = defaultdict(dict)
+    for doc_id, document in enumerate(documents):
+        for field, text in document['fields'].items():
+            for term in tokenize(text):
+                weights = postings[term]
+                weights[doc_id] = weights.get(doc_id, 0) + FIELD_WEIGHTS[field]
+    return {term: sorted(weights.items()) for term, weights in postings.items()}
+
+
+def encode_postings(postings):
+    """[(doc, weight), ...] -> [doc gap, weight, ...] (first gap is from 0)."""
+    flat = []
+    previous = 0
+    for doc_id, weight in postings:
+        flat.extend((doc_id - previous, weight))
+        previous = doc_id
+    return flat
+
+
+def shard_json(terms):
+    return json.dumps(terms, separators=(',', ':'), sort_keys=True)
+
+
+def shard_terms(encoded, prefix_length=1, max_bytes=SHARD_BYTES):
+    """
+    {prefix: {term: postings}}: terms grouped by their first prefix_length
+    characters, with oversized groups split on one more character.
+    """
+    groups = defaultdict(dict)
+    for term, postings in encoded.items():
+        groups[term[:prefix_length]][term] = postings
+    shards = {}
+    for prefix, terms in groups.items():
+        # Terms no longer than the prefix can't be split further
+        if len(shard_json(terms)) > max_bytes and prefix_length < MAX_PREFIX_LENGTH:
+            short = {t: p for t, p in terms.items() if len(t) <= prefix_length}
+            longer = {t: p for t, p in terms.items() if len(t) > prefix_length}
+            if longer:
+                if short:
+                    shards[prefix] = short
+                shards.update(shard_terms(longer, prefix_length + 1, max_bytes))
+                continue
+        shards[prefix] = terms
+    return shards
+
+
+def build_index(root=PROJECT_ROOT):
+    """(manifest, {filename: shard bytes}) for the site under root."""
+    documents = load_documents(root)
+    encoded = {term: encode_postings(postings) for term, postings in invert(documents).items()}
+
+    files = {}
+    shard_names = {}
+    for prefix, terms in sorted(shard_terms(encoded).items()):
+        data = shard_json(terms).encode('utf-8')
+        name = f"{prefix}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}.json"
+        files[name] = data
+        shard_names[prefix] = name
+
+    manifest = {
+        'version': INDEX_VERSION,
+        'fields': ['type', 'title', 'url', 'excerpt'],
+        'docs': [[d['type'], d['title'], d['url'], snippet(d['excerpt'])] for d in documents],
+        'minTermLength': MIN_TERM_LENGTH,
+        'stopwords': sorted(STOPWORDS),
+        'terms': len(encoded),
+        'shards': shard_names,
+    }
+    return manifest, files
+
+
+def write_index(out_dir=OUTPUT_DIR, root=PROJECT_ROOT, precompress=True):
+    """
+    Replace out_dir with a freshly built index. Returns {file name: size}
+    of everything written (manifest and shards, without siblings).
+    """
+    manifest, files = build_index(root)
+    files[MANIFEST_NAME] = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    # Build next to the old index and swap, so readers never see a half-written one
+    tmp_dir = out_dir.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, data in files.items():
+        with open(os.path.join(tmp_dir, name), 'wb') as f:
+            f.write(data)
+        if not precompress:
+            continue
+        for suffix in encodings():
+            compressed = compress(data, suffix)
+            if worth_keeping(len(data), len(compressed)):
+                with open(os.path.join(tmp_dir, name + suffix), 'wb') as f:
+                    f.write(compressed)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return {name: len(data) for name, data in files.items()}
+
+
+def print_stats(sizes, out_dir):
+    shards = {name: size for name, size in sizes.items() if name != MANIFEST_NAME}
+    print(f"  {MANIFEST_NAME}: {sizes[MANIFEST_NAME] / 1024:.1f} KB")
+    print(f"  {len(shards)} shards: {sum(shards.values()) / 1024:.1f} KB total, "
+          f"largest {max(shards.values(), default=0) / 1024:.1f} KB")
+    for name, size in sorted(shards.items(), key=lambda item: item[1], reverse=True)[:10]:
+        compressed = ''
+        for suffix in ('.br', '.gz'):
+            path = os.path.join(out_dir, name + suffix)
+            if os.path.exists(path):
+                compressed = f" ({suffix[1:]} {os.path.getsize(path) / 1024:.1f} KB)"
+                break
+        print(f"    {name:<22} {size / 1024:6.1f} KB{compressed}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the client-side search index.")
+    parser.add_argument('--out', default=OUTPUT_DIR, help="Output directory (default: data/search)")
+    parser.add_argument('--no-precompress', action='store_true', help="Don't write .gz/.br siblings")
+    parser.add_argument('--stats', action='store_true', help="Print the largest shards")
+    args = parser.parse_args(argv)
+
+    sizes = write_index(args.out, precompress=not args.no_precompress)
+    with open(os.path.join(args.out, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    print(f"  Indexed {len(manifest['docs'])} documents, {manifest['terms']} terms "
+          f"in {len(manifest['shards'])} shards ({sum(sizes.values()) / 1024:.0f} KB) "
+          f"-> {os.path.relpath(args.out, PROJECT_ROOT)}/")
+    if args.stats:
+        print_stats(sizes, args.out)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,8 @@ const PORT = process.env.PORT || 3000;
 const DATA_DIR = path.join(__dirname, 'data');
 const BLOGS_FILE = path.join(DATA_DIR, 'blogs.json');
 const EXPERIENCES_FILE = path.join(DATA_DIR, 'experiences.json');
+// Blurred LQIP previews keyed by image path, generated by placeholders.py
+const PLACEHOLDERS_FILE = path.join(DATA_DIR, 'placeholders.json');
 const IMAGES_DIR = path.join(__dirname, 'assets/images');
 
 // Ensure directories exist
@@ -76,6 +78,34 @@ function writeJSON(filePath, data) {
     fs.writeFileSync(filePath, JSON.stringify(data, null, 2), 'utf8');
 }
 
+function readPlaceholders() {
+    const placeholders = readJSON(PLACEHOLDERS_FILE);
+    return Array.isArray(placeholders) ? {} : placeholders;
+}
+
+// Add placeholder/placeholderColor to an item whose local image has a preview
+function withPlaceholder(item, placeholders) {
+    if (typeof item.image !== 'string' || item.image.includes('://')) return item;
+    const entry = placeholders[item.image.split(/[?#]/)[0].replace(/^\.?\//, '')];
+    return entry ? { ...item, placeholder: entry.lqip, placeholderColor: entry.color } : item;
+}
+
+// Same page shape as static_api.py writes for the static bundle
+const PAGE_SIZE = 12;
+function pageOf(items, name, page) {
+    const pages = Math.max(1, Math.ceil(items.length / PAGE_SIZE));
+    if (!(page >= 1 && page <= pages)) return null;
+    return {
+        page,
+        pages,
+        total: items.length,
+        perPage: PAGE_SIZE,
+        next: page < pages ? `/api/${name}/page/${page + 1}` : null,
+        prev: page > 1 ? `/api/${name}/page/${page - 1}` : null,
+        items: items.slice((page - 1) * PAGE_SIZE, page * PAGE_SIZE)
+    };
+}
+
 function getNextId(items) {
     if (items.length === 0) return 1;
     return Math.max(...items.map((i) => i.id)) + 1;
@@ -109,7 +139,17 @@ app.get('/api/admin/verify', adminAuth, (req, res) => {
 // GET all blogs (public)
 app.get('/api/blogs', (req, res) => {
     const blogs = readJSON(BLOGS_FILE);
-    res.json(blogs);
+    const placeholders = readPlaceholders();
+    res.json(blogs.map((b) => withPlaceholder(b, placeholders)));
+});
+
+// GET one page of blogs (public)
+app.get('/api/blogs/page/:page', (req, res) => {
+    const placeholders = readPlaceholders();
+    const blogs = readJSON(BLOGS_FILE).map((b) => withPlaceholder(b, placeholders));
+    const result = pageOf(blogs, 'blogs', parseInt(req.params.page));
+    if (!result) return res.status(404).json({ error: 'Page not found' });
+    res.json(result);
 });
 
 // GET single blog (public)
@@ -117,7 +157,7 @@ app.get('/api/blogs/:id', (req, res) => {
     const blogs = readJSON(BLOGS_FILE);
     const blog = blogs.find((b) => b.id === parseInt(req.params.id));
     if (!blog) return res.status(404).json({ error: 'Blog not found' });
-    res.json(blog);
+    res.json(withPlaceholder(blog, readPlaceholders()));
 });
 
 // POST create blog (admin)
@@ -208,7 +248,17 @@ app.delete('/api/blogs/:id', adminAuth, (req, res) => {
 // GET all experiences (public)
 app.get('/api/experiences', (req, res) => {
     const experiences = readJSON(EXPERIENCES_FILE);
-    res.json(experiences);
+    const placeholders = readPlaceholders();
+    res.json(experiences.map((e) => withPlaceholder(e, placeholders)));
+});
+
+// GET one page of experiences (public)
+app.get('/api/experiences/page/:page', (req, res) => {
+    const placeholders = readPlaceholders();
+    const experiences = readJSON(EXPERIENCES_FILE).map((e) => withPlaceholder(e, placeholders));
+    const result = pageOf(experiences, 'experiences', parseInt(req.params.page));
+    if (!result) return res.status(404).json({ error: 'Page not found' });
+    res.json(result);
 });
 
 // GET single experience (public)
@@ -216,7 +266,7 @@ app.get('/api/experiences/:id', (req, res) => {
     const experiences = readJSON(EXPERIENCES_FILE);
     const exp = experiences.find((e) => e.id === parseInt(req.params.id));
     if (!exp) return res.status(404).json({ error: 'Experience not found' });
-    res.json(exp);
+    res.json(withPlaceholder(exp, readPlaceholders()));
 });
 
 // POST create experience (admin)
@@ -0,0 +1,196 @@
+/**
+ * ============================================
+ *  YOLO Site Search
+ * ============================================
+ *  Vanilla JS — no dependencies
+ *  Queries the sharded index written by search_index.py (data/search/).
+ *  Only the manifest and the shards for the query's terms are fetched,
+ *  each at most once per page view.
+ *
+ *  YoloSearch.search('hampta trek').then((results) => ...)
+ *    -> [{ type, title, url, excerpt, score }, ...] best first
+ *  Every term must match; the last one also matches as a prefix, so
+ *  results can update while the visitor is still typing.
+ *
+ *  Markup wired up on load (blog.html, experience.html):
+ *    <form class="site-search" role="search" data-site-search>
+ *      <input class="site-search__input" type="search" ...>
+ *      <ul class="site-search__results" hidden></ul>
+ *    </form>
+ */
+
+(function () {
+    'use strict';
+
+    const INDEX_DIR = 'data/search/';
+    const shardCache = new Map();
+    let manifestPromise = null;
+
+    function loadManifest() {
+        if (!manifestPromise) {
+            manifestPromise = fetch(INDEX_DIR + 'index.json').then((r) => {
+                if (!r.ok) throw new Error('Search index unavailable');
+                return r.json();
+            });
+        }
+        return manifestPromise;
+    }
+
+    function loadShard(name) {
+        if (!shardCache.has(name)) {
+            shardCache.set(name, fetch(INDEX_DIR + name).then((r) => r.json()));
+        }
+        return shardCache.get(name);
+    }
+
+    // Same folding as search_index.tokenize()
+    function tokenize(text, manifest) {
+        const stopwords = new Set(manifest.stopwords);
+        const folded = text.toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '');
+        return (folded.match(/[a-z0-9]+/g) || [])
+            .filter((term) => term.length >= manifest.minTermLength && !stopwords.has(term));
+    }
+
+    // Postings are [doc gap, weight, doc gap, weight, ...]
+    function decodePostings(flat, into) {
+        let doc = 0;
+        for (let i = 0; i < flat.length; i += 2) {
+            doc += flat[i];
+            into.set(doc, Math.max(into.get(doc) || 0, flat[i + 1]));
+        }
+        return into;
+    }
+
+    // {doc: weight} for one query term, from every shard that can hold it
+    async function termMatches(term, isPrefix, manifest) {
+        const names = Object.keys(manifest.shards)
+            .filter((key) => term.startsWith(key) || (isPrefix && key.startsWith(term)))
+            .map((key) => manifest.shards[key]);
+        const shards = await Promise.all(names.map(loadShard));
+        const matches = new Map();
+        shards.forEach((shard) => {
+            Object.keys(shard).forEach((candidate) => {
+                if (candidate === term || (isPrefix && candidate.startsWith(term))) {
+                    decodePostings(shard[candidate], matches);
+                }
+            });
+        });
+        return matches;
+    }
+
+    async function search(query, limit = 10) {
+        const manifest = await loadManifest();
+        const terms = tokenize(query, manifest);
+        if (!terms.length) return [];
+
+        const perTerm = await Promise.all(
+            terms.map((term, i) => termMatches(term, i === terms.length - 1, manifest)));
+        const total = manifest.docs.length;
+        let scores = null;
+        perTerm.forEach((matches) => {
+            const idf = Math.log(1 + total / Math.max(1, matches.size));
+            const next = new Map();
+            matches.forEach((weight, doc) => {
+                if (scores === null || scores.has(doc)) {
+                    next.set(doc, (scores ? scores.get(doc) : 0) + weight * idf);
+                }
+            });
+            scores = next;
+        });
+
+        return Array.from(scores.entries())
+            .sort((a, b) => b[1] - a[1])
+            .slice(0, limit)
+            .map(([doc, score]) => {
+                const [type, title, url, excerpt] = manifest.docs[doc];
+                return { type, title, url, excerpt, score };
+            });
+    }
+
+    /* ─── Search box ─── */
+    const TYPE_LABELS = { blog: 'Story', experience: 'Experience', page: 'Experience' };
+
+    function renderResults(list, results, query) {
+        list.innerHTML = '';
+        if (!results.length) {
+            const empty = document.createElement('li');
+            empty.className = 'site-search__empty';
+            empty.textContent = 'Nothing found for “' + query + '”';
+            list.appendChild(empty);
+        }
+        results.forEach((result) => {
+            const item = document.createElement('li');
+            item.className = 'site-search__result';
+            const link = document.createElement('a');
+            link.href = result.url;
+            // Full class names, so critical_css.py can find them in this file
+            [['site-search__type', TYPE_LABELS[result.type] || result.type],
+             ['site-search__title', result.title],
+             ['site-search__excerpt', result.excerpt]].forEach(([className, text]) => {
+                if (!text) return;
+                const span = document.createElement('span');
+                span.className = className;
+                span.textContent = text;
+                link.appendChild(span);
+            });
+            item.appendChild(link);
+            list.appendChild(item);
+        });
+        list.hidden = false;
+    }
+
+    function attach(form) {
+        const input = form.querySelector('.site-search__input');
+        const list = form.querySelector('.site-search__results');
+        if (!input || !list) return;
+        let latest = 0;
+        let timer = null;
+
+        function run() {
+            const query = input.value.trim();
+            const ticket = ++latest;
+            if (!query) {
+                list.hidden = true;
+                return;
+            }
+            search(query, 8)
+                .then((results) => {
+                    // Answers can arrive out of order; only show the newest
+                    if (ticket === latest) renderResults(list, results, query);
+                })
+                .catch(() => { list.hidden = true; });
+        }
+
+        input.addEventListener('focus', () => { loadManifest().catch(() => {}); }, { once: true });
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(run, 120);
+        });
+        input.addEventListener('keydown', (e) => {
+            if (e.key === 'Escape') list.hidden = true;
+        });
+        form.addEventListener('submit', (e) => {
+            e.preventDefault();
+            const first = list.querySelector('a');
+            if (first) first.click();
+        });
+        list.addEventListener('click', (e) => {
+            if (e.target.closest('a')) list.hidden = true;
+        });
+        document.addEventListener('click', (e) => {
+            if (!form.contains(e.target)) list.hidden = true;
+        });
+    }
+
+    function attachAll() {
+        document.querySelectorAll('[data-site-search]').forEach(attach);
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', attachAll);
+    } else {
+        attachAll();
+    }
+
+    window.YoloSearch = { search, preload: loadManifest };
+})();
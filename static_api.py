@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+YOLO Living - Static API Export
+Pre-renders the public read-only routes of server.js into plain files, so the
+static Hostinger bundle answers them without a Node process:
+
+  /api/blogs              -> api/blogs/index.json     list without 'body'
+  /api/blogs/page/<n>     -> api/blogs/page/<n>.json  PAGE_SIZE items per page
+  /api/blogs/<id>         -> api/blogs/<id>.json      the full item
+  (the same for /api/experiences)
+
+Items get the same placeholder fields server.js adds. The .htaccess written
+by build_deploy.py maps the extensionless routes onto these files and makes
+Apache send content-digest ETags for them (FileETag Digest), so repeat
+visits revalidate with a 304 instead of downloading the list again.
+api/etags.json lists a strong ETag (SHA-256 of the bytes) for every route,
+for hosts or CDNs that take validators from a manifest.
+
+Usage:
+  python3 static_api.py deploy_build   # write deploy_build/api/
+  python3 build_deploy.py              # runs this as part of the build
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+
+from placeholders import PLACEHOLDERS_PATH, embed_placeholders
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+API_DIR = 'api'
+ETAGS_NAME = 'etags.json'
+PAGE_SIZE = 12
+ETAG_LENGTH = 32
+
+# Route name -> (data file, fields left out of the list views)
+COLLECTIONS = {
+    'blogs': ('data/blogs.json', ['body']),
+    'experiences': ('data/experiences.json', []),
+}
+
+# Rewrites from the public routes to the exported files (Apache / LiteSpeed)
+HTACCESS_RULES = """<IfModule mod_rewrite.c>
+    RewriteEngine On
+    RewriteRule ^api/(%(names)s)/?$ api/$1/index.json [L]
+    RewriteRule ^api/(%(names)s)/page/([0-9]+)$ api/$1/page/$2.json [L]
+    RewriteRule ^api/(%(names)s)/([0-9]+)$ api/$1/$2.json [L]
+</IfModule>
+""" % {'names': '|'.join(COLLECTIONS)}
+
+# api/.htaccess: validators from the file content, not inode/mtime, so every
+# deploy of unchanged data keeps the same ETag
+API_HTACCESS = "FileETag Digest\n"
+
+
+def render(value):
+    """Compact, stable JSON bytes (what the files and ETags are made of)."""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def etag(data):
+    return '"' + hashlib.sha256(data).hexdigest()[:ETAG_LENGTH] + '"'
+
+
+def list_item(item, heavy_fields):
+    return {key: value for key, value in item.items() if key not in heavy_fields}
+
+
+def collection_files(name, items, heavy_fields, page_size=PAGE_SIZE):
+    """{route: document} for one collection."""
+    summaries = [list_item(item, heavy_fields) for item in items]
+    pages = max(1, -(-len(summaries) // page_size))
+    files = {
+        f'/api/{name}': summaries,
+    }
+    for page in range(1, pages + 1):
+        files[f'/api/{name}/page/{page}'] = {
+            'page': page,
+            'pages': pages,
+            'total': len(summaries),
+            'perPage': page_size,
+            'next': f'/api/{name}/page/{page + 1}' if page < pages else None,
+            'prev': f'/api/{name}/page/{page - 1}' if page > 1 else None,
+            'items': summaries[(page - 1) * page_size:page * page_size],
+        }
+    for item in items:
+        files[f"/api/{name}/{item['id']}"] = item
+    return files
+
+
+def route_path(route):
+    """/api/blogs -> api/blogs/index.json, /api/blogs/3 -> api/blogs/3.json"""
+    parts = route.strip('/').split('/')
+    if len(parts) == 2:
+        return '/'.join(parts + ['index.json'])
+    return '/'.join(parts) + '.json'
+
+
+def export_api(out_dir, root=PROJECT_ROOT, placeholders=None, page_size=PAGE_SIZE):
+    """
+    Replace out_dir/api with the exported routes. Returns the written files
+    as out_dir-relative posix paths.
+    """
+    if placeholders is None:
+        try:
+            with open(os.path.join(root, 'data', os.path.basename(PLACEHOLDERS_PATH)),
+                      'r', encoding='utf-8') as f:
+                placeholders = json.load(f)
+        except (OSError, ValueError):
+            placeholders = {}
+
+    api_dir = os.path.join(out_dir, API_DIR)
+    shutil.rmtree(api_dir, ignore_errors=True)
+    written = []
+    for name, (data_file, heavy_fields) in COLLECTIONS.items():
+        try:
+            with open(os.path.join(root, data_file), 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            items = []
+        items = embed_placeholders(items, placeholders)
+        for route, document in collection_files(name, items, heavy_fields, page_size).items():
+            rel_path = route_path(route)
+            path = os.path.join(out_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(render(document))
+            written.append(rel_path)
+
+    with open(os.path.join(api_dir, '.htaccess'), 'w', encoding='utf-8') as f:
+        f.write(API_HTACCESS)
+    return written
+
+
+def write_etags(out_dir, files):
+    """
+    Write api/etags.json ({route: ETag}) for the exported files as they are
+    now, i.e. after any later rewrite such as fingerprinting. Returns it.
+    """
+    etags = {}
+    for rel_path in sorted(files):
+        with open(os.path.join(out_dir, rel_path), 'rb') as f:
+            data = f.read()
+        route = '/' + rel_path[:-len('.json')]
+        etags[route[:-len('/index')] if route.endswith('/index') else route] = etag(data)
+    with open(os.path.join(out_dir, API_DIR, ETAGS_NAME), 'w', encoding='utf-8') as f:
+        json.dump(etags, f, indent=2, sort_keys=True)
+    return etags
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render the public JSON API into static files.")
+    parser.add_argument('out_dir', help="Bundle directory to write api/ into")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    args = parser.parse_args(argv)
+
+    files = export_api(args.out_dir, page_size=args.page_size)
+    write_etags(args.out_dir, files)
+    size = sum(os.path.getsize(os.path.join(args.out_dir, f)) for f in files)
+    print(f"  Exported {len(files)} API files ({size / 1024:.0f} KB) to "
+          f"{os.path.join(args.out_dir, API_DIR)}/")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())